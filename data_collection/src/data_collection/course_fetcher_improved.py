@@ -6,6 +6,7 @@ Scrapes individual course detail pages for complete data
 import os
 import json
 import re
+import sys
 from typing import List, Dict
 
 try:
@@ -14,6 +15,10 @@ except ImportError:
     print("Warning: firecrawl not installed. Install with: pip install firecrawl-py")
     FirecrawlApp = None
 
+# Add project root to path (shared data file writer)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+
+from src.records import write_records
 from models import Course
 
 
@@ -579,14 +584,10 @@ class CMUCourseFetcherImproved:
         )
 
     def save_courses(self, courses: List[Course], path: str = "data/courses.json"):
-        """Save courses to JSON file"""
-        import os
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-
-        with open(path, 'w', encoding='utf-8') as f:
-            json.dump([course.to_dict() for course in courses], f, indent=2, ensure_ascii=False)
-
-        print(f"✓ Saved {len(courses)} courses to {path}")
+        """Save courses as JSON Lines next to path (see src/records.py); returns the file written"""
+        written = write_records(path, (course.to_dict() for course in courses))
+        print(f"✓ Saved {len(courses)} courses to {written}")
+        return written
 
 
 if __name__ == "__main__":
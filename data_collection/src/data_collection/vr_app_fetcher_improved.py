@@ -5,6 +5,7 @@ Uses Tavily's direct answers to extract curated VR app names
 import os
 import json
 import re
+import sys
 from typing import List, Dict
 
 try:
@@ -13,6 +14,10 @@ except ImportError:
     print("Warning: tavily not installed. Install with: pip install tavily-python")
     TavilyClient = None
 
+# Add project root to path (shared data file writer)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+
+from src.records import write_records
 from models import VRApp
 
 
@@ -331,14 +336,10 @@ class VRAppFetcherImproved:
         return unique
 
     def save_apps(self, apps: List[VRApp], path: str = "data/vr_apps.json"):
-        """Save apps to JSON file"""
-        import os
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-
-        with open(path, 'w', encoding='utf-8') as f:
-            json.dump([app.to_dict() for app in apps], f, indent=2, ensure_ascii=False)
-
-        print(f"✓ Saved {len(apps)} apps to {path}")
+        """Save apps as JSON Lines next to path (see src/records.py); returns the file written"""
+        written = write_records(path, (app.to_dict() for app in apps))
+        print(f"✓ Saved {len(apps)} apps to {written}")
+        return written
 
 
 if __name__ == "__main__":
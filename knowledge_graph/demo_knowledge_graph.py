@@ -6,10 +6,15 @@ This script demonstrates the knowledge graph functionality
 without requiring a running Neo4j instance.
 """
 
-import json
 import os
+import sys
 from typing import Dict, List
 
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.records import file_info
+
 
 def demo_data_summary():
     """Show summary of input data"""
@@ -18,7 +23,7 @@ def demo_data_summary():
     print("="*60)
 
     # Check data files
-    data_dir = "stage1/data"
+    data_dir = "data_collection/data"
     files = {
         "courses": f"{data_dir}/courses.json",
         "vr_apps": f"{data_dir}/vr_apps.json",
@@ -31,10 +36,10 @@ def demo_data_summary():
     print("-" * 60)
 
     for name, path in files.items():
-        if os.path.exists(path):
-            with open(path, 'r') as f:
-                data = json.load(f)
-            print(f"  ✓ {name:20s}: {len(data):4d} records - {path}")
+        # Reads whichever format of the dataset was written last (.json, .jsonl or .npz)
+        info = file_info(path)
+        if info["exists"]:
+            print(f"  ✓ {name:20s}: {info['count']:4d} records - {os.path.join(data_dir, info['file'])}")
         else:
             print(f"  ✗ {name:20s}: NOT FOUND - {path}")
 
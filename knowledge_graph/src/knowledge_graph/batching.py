@@ -0,0 +1,131 @@
+"""Chunked, optionally parallel UNWIND writes"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional
+
+
+DEFAULT_BATCH_SIZE = int(os.getenv("KG_BATCH_SIZE", "2000"))
+DEFAULT_WRITE_WORKERS = int(os.getenv("KG_WRITE_WORKERS", "4"))
+
+
+def chunk_rows(rows: List[Dict], batch_size: int) -> List[List[Dict]]:
+    """Split rows into consecutive chunks of at most batch_size"""
+    return [rows[i:i + batch_size] for i in range(0, len(rows), batch_size)]
+
+
+def chunk_by_key(
+    rows: List[Dict],
+    batch_size: int,
+    partition_key: Callable[[Dict], str],
+    order_key: Callable[[Dict], str]
+) -> List[List[Dict]]:
+    """
+    Chunk relationship rows so parallel transactions do not contend
+
+    Rows sharing a partition_key value (e.g. the Skill end node) always land
+    in the same chunk, so no two chunks lock the same node on that side.
+    Within a chunk rows are sorted by order_key (the other end node), so
+    every transaction acquires those shared locks in the same order and
+    cannot deadlock against another.
+
+    A single key with more than batch_size rows becomes one oversized chunk.
+    """
+    groups: Dict[str, List[Dict]] = {}
+    for row in rows:
+        groups.setdefault(partition_key(row), []).append(row)
+
+    chunks, current = [], []
+    for key in sorted(groups):
+        group = groups[key]
+        if current and len(current) + len(group) > batch_size:
+            chunks.append(current)
+            current = []
+        current.extend(group)
+    if current:
+        chunks.append(current)
+
+    return [sorted(chunk, key=order_key) for chunk in chunks]
+
+
+def write_batched(
+    conn,
+    cypher: str,
+    param: str,
+    rows: List[Dict],
+    label: str,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    workers: int = DEFAULT_WRITE_WORKERS,
+    chunks: Optional[List[List[Dict]]] = None,
+    logger: Callable[[str], None] = print,
+    params: Optional[Dict] = None
+) -> Dict:
+    """
+    Run an UNWIND $param write in chunks, one transaction per chunk
+
+    Each chunk is a managed write transaction (retried on transient errors
+    such as deadlocks). Chunks are independent: a failure leaves earlier
+    chunks committed, which is safe to re-run because the writes are MERGEs.
+
+    Args:
+        conn: Neo4jConnection
+        cypher: Query starting with UNWIND $<param>
+        param: Parameter name the rows are passed as
+        rows: Rows to write
+        label: Name used in progress messages and stats (e.g. "Course nodes")
+        batch_size: Rows per transaction
+        workers: Concurrent transactions
+        chunks: Precomputed chunks (e.g. from chunk_by_key); overrides batch_size
+        logger: Progress output
+        params: Extra query parameters sent with every chunk (e.g. build)
+
+    Returns:
+        Throughput stats: label, rows, batches, seconds, rows_per_sec
+    """
+    chunks = chunks if chunks is not None else chunk_rows(rows, batch_size)
+    params = params or {}
+    total = len(rows)
+    start = time.perf_counter()
+    done = 0
+
+    def report(written: int):
+        elapsed = time.perf_counter() - start
+        rate = written / elapsed if elapsed > 0 else 0.0
+        logger(f"  ... {label}: {written}/{total} rows ({rate:,.0f} rows/s)")
+
+    if workers <= 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            conn.execute(cypher, dict(params, **{param: chunk}))
+            done += len(chunk)
+            if len(chunks) > 1:
+                report(done)
+    else:
+        with ThreadPoolExecutor(max_workers=min(workers, len(chunks)), thread_name_prefix="kg-write") as executor:
+            futures = {executor.submit(conn.execute, cypher, dict(params, **{param: chunk})): len(chunk) for chunk in chunks}
+            for future in as_completed(futures):
+                future.result()
+                done += futures[future]
+                report(done)
+
+    seconds = time.perf_counter() - start
+    return {
+        "label": label,
+        "rows": total,
+        "batches": len(chunks),
+        "seconds": round(seconds, 3),
+        "rows_per_sec": round(total / seconds, 1) if seconds > 0 else 0.0,
+    }
+
+
+def combine_stats(label: str, parts: List[Dict]) -> Dict:
+    """Throughput stats of several write_batched calls (e.g. one per streamed chunk) as one"""
+    rows = sum(p["rows"] for p in parts)
+    seconds = sum(p["seconds"] for p in parts)
+    return {
+        "label": label,
+        "rows": rows,
+        "batches": sum(p["batches"] for p in parts),
+        "seconds": round(seconds, 3),
+        "rows_per_sec": round(rows / seconds, 1) if seconds > 0 else 0.0,
+    }
@@ -6,10 +6,14 @@ import os
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..'))
 
+from src.records import load_records
+
 from .connection import Neo4jConnection
 from .schema import KnowledgeGraphSchema
 from .nodes import NodeCreator
 from .relationships import RelationshipCreator
+from .delta import GraphDelta
+from .stats import GraphStats
 
 # Try to import Repositories (fails if dependencies not installed)
 try:
@@ -39,8 +43,10 @@ class KnowledgeGraphBuilder:
         try:
             self.conn = Neo4jConnection()
             self.schema = KnowledgeGraphSchema(self.conn)
-            self.nodes = NodeCreator(self.conn)
-            self.relations = RelationshipCreator(self.conn)
+            self.nodes = NodeCreator(self.conn, logger=self.logger)
+            self.relations = RelationshipCreator(self.conn, logger=self.logger)
+            self.stats = GraphStats(self.conn)
+            self.load_stats = []
         except Exception as e:
             self.logger(f"\n✗ Failed to initialize: {e}")
             raise
@@ -62,29 +68,37 @@ class KnowledgeGraphBuilder:
             sanitized.append(new_item)
         return sanitized
 
-    def build(self, data_dir: str = "stage1/data", clear: bool = False, min_shared_skills: int = 1):
+    def build(self, data_dir: str = "stage1/data", clear: bool = False, min_shared_skills: int = 1,
+              delta: bool = False):
         """
         Build the complete knowledge graph
 
+        A full build writes a new staging build alongside the live one and
+        cuts readers over atomically when it is complete; the replaced
+        build is kept for rollback_build() (see schema.py).
+
         Args:
             data_dir: Directory containing JSON data files (fallback)
-            clear: Whether to clear existing data
+            clear: Force a full build even if delta is set (the live graph
+                is no longer cleared; superseded builds are garbage-collected)
             min_shared_skills: Minimum shared skills for recommendations
+            delta: Only write what changed since the last build, in place on
+                the active build (see delta.py). Ignored when clear is set.
+                Nodes, relationships and recommendations are written in
+                separate transactions, so readers can briefly see a partly
+                applied delta; use a full build when that matters.
         """
+        delta = delta and not clear
         self.logger("\n" + "="*60)
         self.logger("BUILDING KNOWLEDGE GRAPH")
         self.logger("="*60)
 
         try:
-            # Clear database if requested
-            if clear:
-                self.logger("[WARN] Clearing database...")
-                self.schema.clear_database()
-
             # 1. Initialize schema (constraints and indexes)
             self.logger("\n[1/4] Initializing schema...")
             self.schema.init_constraints()
             self.schema.init_indexes()
+            active_build = self.schema.init_build_meta()
 
             # Load Data Strategy: Try MongoDB first, then JSON
             courses, apps, skills = [], [], []
@@ -133,20 +147,64 @@ class KnowledgeGraphBuilder:
                 course_skills = f"{data_dir}/course_skills.json"
                 app_skills = f"{data_dir}/app_skills.json"
 
-            # 2. Create nodes
+                # The delta diff needs the rows themselves, not paths
+                if delta:
+                    courses, apps, skills, course_skills, app_skills = (
+                        load_records(path)
+                        for path in (courses, apps, skills, course_skills, app_skills)
+                    )
+
+            if delta:
+                self.logger("\n[2/4] Syncing changed nodes and relationships...")
+                delta_sync = GraphDelta(
+                    self.conn, self.nodes, self.relations, build=active_build, logger=self.logger
+                )
+                summary = delta_sync.apply(courses, apps, skills, course_skills, app_skills)
+                changed = sum(c["upserted"] + c["deleted"] for c in summary.values())
+                if delta_sync.touched_courses or delta_sync.touched_skills:
+                    self.load_stats = [self.relations.compute_recommendations(
+                        min_shared_skills, build=active_build,
+                        courses=sorted(delta_sync.touched_courses), skills=sorted(delta_sync.touched_skills)
+                    )]
+                if changed:
+                    self.schema.mark_build_version()
+                    self.stats.record(active_build)
+                    self.logger(f"✓ Delta sync applied {changed} changes")
+                else:
+                    self.logger("✓ Graph already up to date, nothing to write")
+
+                self._print_stats()
+                self.logger("\n" + "="*60)
+                self.logger("DELTA SYNC COMPLETE")
+                self.logger("="*60)
+                return
+
+            # Readers keep querying the active build while this one is written
+            build = self.schema.begin_build()
+
+            # 2. Create nodes (chunked; see batching.py)
             self.logger("\n[2/4] Creating nodes...")
-            self.nodes.create_courses(courses)
-            self.nodes.create_apps(apps)
-            self.nodes.create_skills(skills)
+            self.load_stats = [
+                self.nodes.create_courses(courses, build=build),
+                self.nodes.create_apps(apps, build=build),
+                self.nodes.create_skills(skills, build=build),
+            ]
 
             # 3. Create relationships
             self.logger("\n[3/4] Creating relationships...")
-            self.relations.create_course_skill_relations(course_skills)
-            self.relations.create_app_skill_relations(app_skills)
+            self.load_stats += [
+                self.relations.create_course_skill_relations(course_skills, build=build),
+                self.relations.create_app_skill_relations(app_skills, build=build),
+            ]
 
             # 4. Compute recommendations
             self.logger(f"\n[4/4] Computing recommendations (min_shared_skills={min_shared_skills})...")
-            self.relations.compute_recommendations(min_shared_skills)
+            self.load_stats.append(self.relations.compute_recommendations(min_shared_skills, build=build))
+
+            # Atomic cutover, then drop builds older than the rollback target
+            self.schema.activate_build(build)
+            self.schema.collect_garbage()
+            self.stats.record(build)
 
             # 5. Print statistics
             self._print_stats()
@@ -167,84 +225,83 @@ class KnowledgeGraphBuilder:
         self.logger("KNOWLEDGE GRAPH STATISTICS")
         self.logger("="*60)
 
+        # Counts and insights come from one cached lookup (see stats.py)
+        try:
+            stats = self.stats.get()
+        except Exception as e:
+            self.logger(f"\n⚠ Failed to load graph statistics: {e}")
+            stats = {}
+
         # Node counts
-        node_counts = self.nodes.get_node_counts()
-        self.logger("\n📊 Nodes:")
-        self.logger(f"   Courses: {node_counts.get('courses', 0)}")
-        self.logger(f"   VR Apps: {node_counts.get('apps', 0)}")
-        self.logger(f"   Skills: {node_counts.get('skills', 0)}")
-        total_nodes = sum(node_counts.values())
+        self.logger(f"\n📊 Nodes (build {stats.get('build')}):")
+        self.logger(f"   Courses: {stats.get('courses', 0)}")
+        self.logger(f"   VR Apps: {stats.get('apps', 0)}")
+        self.logger(f"   Skills: {stats.get('skills', 0)}")
+        total_nodes = sum(stats.get(k, 0) for k in ("courses", "apps", "skills"))
         self.logger(f"   Total: {total_nodes}")
 
         # Relationship counts
-        rel_counts = self.relations.get_relationship_counts()
         self.logger("\n🔗 Relationships:")
-        self.logger(f"   TEACHES: {rel_counts.get('teaches', 0)}")
-        self.logger(f"   DEVELOPS: {rel_counts.get('develops', 0)}")
-        self.logger(f"   RECOMMENDS: {rel_counts.get('recommends', 0)}")
-        total_rels = sum(rel_counts.values())
+        self.logger(f"   TEACHES: {stats.get('teaches', 0)}")
+        self.logger(f"   DEVELOPS: {stats.get('develops', 0)}")
+        self.logger(f"   RECOMMENDS: {stats.get('recommends', 0)}")
+        total_rels = sum(stats.get(k, 0) for k in ("teaches", "develops", "recommends"))
         self.logger(f"   Total: {total_rels}")
 
+        # Load throughput
+        load_stats = [st for st in getattr(self, "load_stats", []) if isinstance(st, dict)]
+        if load_stats:
+            self.logger("\n⏱ Load throughput:")
+            for st in load_stats:
+                self.logger(f"   {st['label']}: {st['rows']} rows in {st['batches']} batches, "
+                            f"{st['seconds']:.2f}s ({st['rows_per_sec']:,.0f} rows/s)")
+
         # Additional insights
         self.logger("\n💡 Insights:")
 
+        if stats.get("top_skills"):
+            self.logger("   Top 5 skills by mentions:")
+            for i, record in enumerate(stats["top_skills"], 1):
+                self.logger(f"      {i}. {record['name']} ({record['category']}): {record['count']} mentions")
+
+        if stats.get("top_courses"):
+            self.logger("\n   Courses teaching most skills:")
+            for i, record in enumerate(stats["top_courses"], 1):
+                self.logger(f"      {i}. {record['title']}: {record['skill_count']} skills")
+
+        if stats.get("top_apps"):
+            self.logger("\n   VR apps developing most skills:")
+            for i, record in enumerate(stats["top_apps"], 1):
+                self.logger(f"      {i}. {record['name']}: {record['skill_count']} skills")
+
+        if stats.get("recommends"):
+            self.logger(f"\n   Total course-app recommendations: {stats['recommends']}")
+            self.logger(f"   Average shared skills per recommendation: {stats['avg_shared_skills']:.1f}")
+            self.logger(f"   Maximum shared skills: {stats['max_shared_skills']}")
+
+    def migrate(self) -> int:
+        """
+        Adopt a graph built before builds were versioned, without building
+
+        Returns:
+            The active build
+        """
         try:
-            # Top skills by source count
-            result = self.conn.query("""
-                MATCH (s:Skill)
-                RETURN s.name as name, s.source_count as count, s.category as category
-                ORDER BY s.source_count DESC
-                LIMIT 5
-            """ 
-            )
-            if result:
-                self.logger("   Top 5 skills by mentions:")
-                for i, record in enumerate(result, 1):
-                    self.logger(f"      {i}. {record['name']} ({record['category']}): {record['count']} mentions")
-
-            # Courses with most skills
-            result = self.conn.query("""
-                MATCH (c:Course)-[r:TEACHES]->(s:Skill)
-                WITH c, count(s) as skill_count
-                RETURN c.title as title, skill_count
-                ORDER BY skill_count DESC
-                LIMIT 5
-            """ 
-            )
-            if result:
-                self.logger("\n   Courses teaching most skills:")
-                for i, record in enumerate(result, 1):
-                    self.logger(f"      {i}. {record['title']}: {record['skill_count']} skills")
-
-            # Top VR apps by skills
-            result = self.conn.query("""
-                MATCH (a:VRApp)-[r:DEVELOPS]->(s:Skill)
-                WITH a, count(s) as skill_count
-                RETURN a.name as name, skill_count
-                ORDER BY skill_count DESC
-                LIMIT 5
-            """ 
-            )
-            if result:
-                self.logger("\n   VR apps developing most skills:")
-                for i, record in enumerate(result, 1):
-                    self.logger(f"      {i}. {record['name']}: {record['skill_count']} skills")
-
-            # Course-VR app recommendations
-            result = self.conn.query("""
-                MATCH (c:Course)-[r:RECOMMENDS]->(a:VRApp)
-                RETURN count(*) as total_recommendations,
-                       avg(r.skill_count) as avg_shared_skills,
-                       max(r.skill_count) as max_shared_skills
-            """ 
-            )
-            if result and result[0]['total_recommendations'] > 0:
-                r = result[0]
-                self.logger(f"\n   Total course-app recommendations: {r['total_recommendations']}")
-                self.logger(f"   Average shared skills per recommendation: {r['avg_shared_skills']:.1f}")
-                self.logger(f"   Maximum shared skills: {r['max_shared_skills']}")
-        except Exception as e:
-            self.logger(f"\n⚠ Failed to generate some insights: {e}")
+            return self.schema.init_build_meta()
+        finally:
+            self.cleanup()
+
+    def rollback(self) -> int:
+        """
+        Point readers back at the previous build
+
+        Returns:
+            The build now active
+        """
+        try:
+            return self.schema.rollback_build()
+        finally:
+            self.cleanup()
 
     def cleanup(self):
         """Clean up resources"""
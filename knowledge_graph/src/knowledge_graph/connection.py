@@ -1,24 +1,108 @@
 """Neo4j database connection management"""
 
+from collections import deque
 from neo4j import GraphDatabase
 import os
+import threading
+import time
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
+class ConnectionMetrics:
+    """Thread-safe counters for pool usage and query latency."""
+
+    def __init__(self, window: int = 1000):
+        """
+        Args:
+            window: Number of recent queries kept for latency percentiles
+        """
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=window)
+        self._acquire_waits = deque(maxlen=window)
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.queries = 0
+        self.errors = 0
+
+    def checkout(self):
+        with self._lock:
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+
+    def checkin(self, latency_ms: float, acquire_ms: float, ok: bool):
+        with self._lock:
+            self.in_use -= 1
+            self.queries += 1
+            if not ok:
+                self.errors += 1
+            self._latencies.append(latency_ms)
+            if acquire_ms is not None:
+                self._acquire_waits.append(acquire_ms)
+
+    @staticmethod
+    def _percentile(values, pct: float) -> float:
+        if not values:
+            return 0.0
+        ordered = sorted(values)
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * pct))], 2)
+
+    def snapshot(self) -> dict:
+        """Return current metrics (latencies in ms over the recent window)."""
+        with self._lock:
+            latencies = list(self._latencies)
+            waits = list(self._acquire_waits)
+            return {
+                "in_use": self.in_use,
+                "peak_in_use": self.peak_in_use,
+                "queries": self.queries,
+                "errors": self.errors,
+                "latency_p50_ms": self._percentile(latencies, 0.50),
+                "latency_p95_ms": self._percentile(latencies, 0.95),
+                "latency_max_ms": round(max(latencies), 2) if latencies else 0.0,
+                "acquire_p50_ms": self._percentile(waits, 0.50),
+                "acquire_p95_ms": self._percentile(waits, 0.95),
+                "acquire_max_ms": round(max(waits), 2) if waits else 0.0,
+            }
 
 
 class Neo4jConnection:
     """Manages Neo4j database connection and queries"""
 
     def __init__(self):
-        """Initialize Neo4j connection with environment variables"""
+        """
+        Initialize Neo4j connection with environment variables
+
+        Pool settings (optional):
+            NEO4J_MAX_POOL_SIZE: Max connections per host (default 50)
+            NEO4J_ACQUISITION_TIMEOUT: Seconds to wait for a pooled connection (default 10)
+            NEO4J_CONNECTION_TIMEOUT: Seconds to establish a new connection (default 5)
+            NEO4J_MAX_RETRY_TIME: Seconds to retry transient errors (default 15)
+            NEO4J_DATABASE: Target database (default: server default)
+        """
         self.uri = os.getenv("NEO4J_URI", "bolt://localhost:7687")
         self.user = os.getenv("NEO4J_USER", "neo4j")
         self.password = os.getenv("NEO4J_PASSWORD", "password")
+        self.database = os.getenv("NEO4J_DATABASE") or None
+
+        self.pool_size = int(os.getenv("NEO4J_MAX_POOL_SIZE", "50"))
+        self.acquisition_timeout = _env_float("NEO4J_ACQUISITION_TIMEOUT", 10.0)
+        self.metrics = ConnectionMetrics()
 
         try:
             self.driver = GraphDatabase.driver(
                 self.uri,
-                auth=(self.user, self.password)
+                auth=(self.user, self.password),
+                max_connection_pool_size=self.pool_size,
+                connection_acquisition_timeout=self.acquisition_timeout,
+                connection_timeout=_env_float("NEO4J_CONNECTION_TIMEOUT", 5.0),
+                max_transaction_retry_time=_env_float("NEO4J_MAX_RETRY_TIME", 15.0)
             )
-            print(f"✓ Connected to Neo4j at {self.uri}")
+            print(f"✓ Connected to Neo4j at {self.uri} "
+                  f"(pool={self.pool_size}, acquire timeout={self.acquisition_timeout}s)")
         except Exception as e:
             print(f"✗ Failed to connect to Neo4j: {e}")
             raise
@@ -29,21 +113,53 @@ class Neo4jConnection:
             self.driver.close()
             print("✓ Disconnected from Neo4j")
 
-    def query(self, cypher: str, params: dict = None):
+    def _run(self, cypher: str, params: dict, write: bool):
+        """
+        Run cypher in a managed transaction and return its records.
+
+        Managed transactions are retried by the driver on transient errors,
+        and read transactions are routed to read replicas on neo4j:// URIs.
+        """
+        start = time.perf_counter()
+        acquired = []
+
+        def work(tx):
+            # First call marks when a pooled connection was handed to us
+            if not acquired:
+                acquired.append((time.perf_counter() - start) * 1000)
+            return tx.run(cypher, params or {}).data()
+
+        self.metrics.checkout()
+        ok = False
+        try:
+            with self.driver.session(database=self.database) as session:
+                if write:
+                    records = session.execute_write(work)
+                else:
+                    records = session.execute_read(work)
+            ok = True
+            return records
+        finally:
+            self.metrics.checkin(
+                (time.perf_counter() - start) * 1000,
+                acquired[0] if acquired else None,
+                ok
+            )
+
+    def query(self, cypher: str, params: dict = None, write: bool = False):
         """
         Execute a Cypher query and return results
 
         Args:
             cypher: Cypher query string
             params: Query parameters
+            write: Run in a write transaction (for queries that modify the graph)
 
         Returns:
             List of dictionaries containing query results
         """
         try:
-            with self.driver.session() as session:
-                result = session.run(cypher, params or {})
-                return [record.data() for record in result]
+            return self._run(cypher, params, write)
         except Exception as e:
             print(f"Query error: {e}")
             print(f"Cypher: {cypher}")
@@ -58,13 +174,24 @@ class Neo4jConnection:
             params: Query parameters
         """
         try:
-            with self.driver.session() as session:
-                session.run(cypher, params or {})
+            self._run(cypher, params, write=True)
         except Exception as e:
             print(f"Execute error: {e}")
             print(f"Cypher: {cypher}")
             raise
 
+    def get_metrics(self) -> dict:
+        """
+        Connection pool and query latency metrics
+
+        Returns:
+            Dictionary with in-flight sessions, acquisition wait and
+            per-query latency percentiles
+        """
+        stats = self.metrics.snapshot()
+        stats["pool_size"] = self.pool_size
+        return stats
+
     def test_connection(self):
         """Test if the connection is working"""
         try:
@@ -0,0 +1,208 @@
+"""Delta (incremental) graph sync based on content hashes
+
+Every Course/VRApp/Skill node and TEACHES/DEVELOPS relationship carries a
+content_hash of the source fields it was written from. A delta sync reads
+the keys and hashes currently in the graph, diffs them against the source
+data, and only writes what changed:
+
+1. upsert inserted/updated nodes
+2. upsert inserted/updated relationships
+3. delete relationships no longer in the source
+4. delete nodes no longer in the source
+
+The graph stays fully populated throughout, unlike clear + full reload.
+Changes are applied in place to one build (normally the active one), so
+readers may see a partly applied delta; full rebuilds go through a staging
+build instead (see schema.py).
+"""
+
+import hashlib
+import json
+from typing import Dict, List, Tuple
+
+from .batching import DEFAULT_BATCH_SIZE, DEFAULT_WRITE_WORKERS, chunk_rows, write_batched
+from .schema import UNVERSIONED_BUILD
+
+
+# Source fields that make up each entity's content hash
+COURSE_FIELDS = ("course_id", "title", "department", "description", "units")
+APP_FIELDS = ("app_id", "name", "category", "description", "rating", "price", "features")
+SKILL_FIELDS = ("name", "category", "aliases", "source_count", "weight")
+MAPPING_FIELDS = ("weight",)
+
+
+def content_hash(row: Dict, fields: Tuple[str, ...]) -> str:
+    """Stable hash of the given fields of a source row"""
+    payload = json.dumps([row.get(f) for f in fields], sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def with_content_hash(rows: List[Dict], fields: Tuple[str, ...]) -> List[Dict]:
+    """Copies of rows with a content_hash field added"""
+    return [dict(row, content_hash=content_hash(row, fields)) for row in rows]
+
+
+def mapping_source_id(mapping: Dict, id_field: str):
+    """Mappings use 'source_id' (JSON) or 'course_id'/'app_id' (MongoDB)"""
+    return mapping.get("source_id") or mapping.get(id_field)
+
+
+class GraphDelta:
+    """Applies the difference between source data and the current graph"""
+
+    def __init__(self, connection, nodes, relations, build: int = UNVERSIONED_BUILD, logger=None,
+                 batch_size: int = None, workers: int = None):
+        """
+        Args:
+            connection: Neo4jConnection instance
+            nodes: NodeCreator used for node upserts
+            relations: RelationshipCreator used for relationship upserts
+            build: Build to sync (see schema.py)
+            logger: Progress output (default: print)
+            batch_size: Keys per delete transaction (default: KG_BATCH_SIZE)
+            workers: Concurrent delete transactions (default: KG_WRITE_WORKERS)
+        """
+        self.conn = connection
+        self.nodes = nodes
+        self.relations = relations
+        self.build = build
+        # Filled by apply(): what a recommendation refresh has to revisit
+        self.touched_courses = set()
+        self.touched_skills = set()
+        self.logger = logger if logger else print
+        self.batch_size = batch_size or DEFAULT_BATCH_SIZE
+        self.workers = workers or DEFAULT_WRITE_WORKERS
+
+    def _graph_hashes(self, cypher: str) -> Dict:
+        return {
+            (r["key"] if "dst" not in r else (r["key"], r["dst"])): r["hash"]
+            for r in self.conn.query(cypher, {"build": self.build})
+        }
+
+    @staticmethod
+    def _diff(source: Dict, graph: Dict) -> Tuple[List, List]:
+        """Return (keys to upsert, keys to delete)"""
+        upserts = [k for k, h in source.items() if graph.get(k) != h]
+        deletes = [k for k in graph if k not in source]
+        return upserts, deletes
+
+    def _delete(self, cypher: str, keys: List, label: str) -> Dict:
+        rows = [{"key": k} if not isinstance(k, tuple) else {"src": k[0], "dst": k[1]} for k in keys]
+        return write_batched(
+            self.conn, cypher, "rows", rows, label,
+            workers=self.workers, chunks=chunk_rows(rows, self.batch_size), logger=self.logger,
+            params={"build": self.build}
+        )
+
+    def apply(self, courses: List[Dict], apps: List[Dict], skills: List[Dict],
+              course_skills: List[Dict], app_skills: List[Dict]) -> Dict[str, Dict[str, int]]:
+        """
+        Sync the graph to the given source rows
+
+        Returns:
+            Per entity type: {"upserted": n, "deleted": n}
+        """
+        courses = [
+            c for c in courses
+            if c.get('description', '').strip() and 'not available' not in c.get('description', '')
+        ]
+
+        # --- Source keys and hashes ---
+        src_courses = {c["course_id"]: content_hash(c, COURSE_FIELDS) for c in courses}
+        src_apps = {a["app_id"]: content_hash(a, APP_FIELDS) for a in apps}
+        src_skills = {s["name"]: content_hash(s, SKILL_FIELDS) for s in skills}
+
+        # Mappings whose endpoints are missing are never written (MATCH fails),
+        # so leave them out of the diff instead of re-sending them every run
+        src_teaches, teaches_rows = {}, {}
+        for m in course_skills:
+            key = (mapping_source_id(m, "course_id"), m.get("skill_name"))
+            if key[0] in src_courses and key[1] in src_skills:
+                src_teaches[key] = content_hash(m, MAPPING_FIELDS)
+                teaches_rows[key] = m
+        src_develops, develops_rows = {}, {}
+        for m in app_skills:
+            key = (mapping_source_id(m, "app_id"), m.get("skill_name"))
+            if key[0] in src_apps and key[1] in src_skills:
+                src_develops[key] = content_hash(m, MAPPING_FIELDS)
+                develops_rows[key] = m
+
+        # --- Current graph keys and hashes ---
+        self.logger("\n[Delta] Reading current graph state...")
+        graph_courses = self._graph_hashes(
+            "MATCH (c:Course {build: $build}) RETURN c.course_id AS key, c.content_hash AS hash")
+        graph_apps = self._graph_hashes(
+            "MATCH (a:VRApp {build: $build}) RETURN a.app_id AS key, a.content_hash AS hash")
+        graph_skills = self._graph_hashes(
+            "MATCH (s:Skill {build: $build}) RETURN s.name AS key, s.content_hash AS hash")
+        graph_teaches = self._graph_hashes(
+            "MATCH (c:Course {build: $build})-[r:TEACHES]->(s:Skill) "
+            "RETURN c.course_id AS key, s.name AS dst, r.content_hash AS hash")
+        graph_develops = self._graph_hashes(
+            "MATCH (a:VRApp {build: $build})-[r:DEVELOPS]->(s:Skill) "
+            "RETURN a.app_id AS key, s.name AS dst, r.content_hash AS hash")
+
+        course_up, course_del = self._diff(src_courses, graph_courses)
+        app_up, app_del = self._diff(src_apps, graph_apps)
+        skill_up, skill_del = self._diff(src_skills, graph_skills)
+        teaches_up, teaches_del = self._diff(src_teaches, graph_teaches)
+        develops_up, develops_del = self._diff(src_develops, graph_develops)
+
+        summary = {
+            "courses": {"upserted": len(course_up), "deleted": len(course_del)},
+            "apps": {"upserted": len(app_up), "deleted": len(app_del)},
+            "skills": {"upserted": len(skill_up), "deleted": len(skill_del)},
+            "teaches": {"upserted": len(teaches_up), "deleted": len(teaches_del)},
+            "develops": {"upserted": len(develops_up), "deleted": len(develops_del)},
+        }
+        for name, counts in summary.items():
+            self.logger(f"  {name}: {counts['upserted']} to upsert, {counts['deleted']} to delete")
+
+        # Course scores depend on its TEACHES edges and on the DEVELOPS edges
+        # of the skills it teaches (deleted nodes' edges show up as deletions)
+        self.touched_courses = set(course_up) | set(course_del) | {k[0] for k in teaches_up + teaches_del}
+        self.touched_skills = {k[1] for k in develops_up + develops_del}
+
+        # --- 1. Upsert nodes ---
+        by_course = {c["course_id"]: c for c in courses}
+        by_app = {a["app_id"]: a for a in apps}
+        by_skill = {s["name"]: s for s in skills}
+        if course_up:
+            self.nodes.create_courses([by_course[k] for k in course_up], build=self.build)
+        if app_up:
+            self.nodes.create_apps([by_app[k] for k in app_up], build=self.build)
+        if skill_up:
+            self.nodes.create_skills([by_skill[k] for k in skill_up], build=self.build)
+
+        # --- 2. Upsert relationships ---
+        if teaches_up:
+            self.relations.create_course_skill_relations([teaches_rows[k] for k in teaches_up], build=self.build)
+        if develops_up:
+            self.relations.create_app_skill_relations([develops_rows[k] for k in develops_up], build=self.build)
+
+        # --- 3. Delete stale relationships ---
+        if teaches_del:
+            self._delete("""
+                UNWIND $rows AS row
+                MATCH (:Course {course_id: row.src, build: $build})-[r:TEACHES]->(:Skill {name: row.dst, build: $build})
+                DELETE r
+            """, teaches_del, "stale TEACHES relationships")
+        if develops_del:
+            self._delete("""
+                UNWIND $rows AS row
+                MATCH (:VRApp {app_id: row.src, build: $build})-[r:DEVELOPS]->(:Skill {name: row.dst, build: $build})
+                DELETE r
+            """, develops_del, "stale DEVELOPS relationships")
+
+        # --- 4. Delete stale nodes ---
+        if course_del:
+            self._delete("UNWIND $rows AS row MATCH (c:Course {course_id: row.key, build: $build}) DETACH DELETE c",
+                         course_del, "stale Course nodes")
+        if app_del:
+            self._delete("UNWIND $rows AS row MATCH (a:VRApp {app_id: row.key, build: $build}) DETACH DELETE a",
+                         app_del, "stale VRApp nodes")
+        if skill_del:
+            self._delete("UNWIND $rows AS row MATCH (s:Skill {name: row.key, build: $build}) DETACH DELETE s",
+                         skill_del, "stale Skill nodes")
+
+        return summary
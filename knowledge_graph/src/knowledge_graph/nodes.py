@@ -1,163 +1,176 @@
 """Node creation for Course, VRApp, and Skill entities"""
 
-import json
 import os
-from typing import List, Dict, Union
+from typing import Callable, Dict, Iterable, List, Union
+
+from src.records import artifact_path, iter_chunks
+
+from .batching import DEFAULT_BATCH_SIZE, DEFAULT_WRITE_WORKERS, combine_stats, write_batched
+from .delta import APP_FIELDS, COURSE_FIELDS, SKILL_FIELDS, with_content_hash
+from .schema import UNVERSIONED_BUILD
+from .stats import GraphStats
 
 
 class NodeCreator:
     """Creates nodes in the knowledge graph"""
 
-    def __init__(self, connection):
+    def __init__(self, connection, logger=None, batch_size: int = None, workers: int = None):
         """
         Initialize node creator
 
         Args:
             connection: Neo4jConnection instance
+            logger: Progress output (default: print)
+            batch_size: Rows per write transaction (default: KG_BATCH_SIZE env var or 2000)
+            workers: Concurrent write transactions (default: KG_WRITE_WORKERS env var or 4)
         """
         self.conn = connection
+        self.logger = logger if logger else print
+        self.batch_size = batch_size or DEFAULT_BATCH_SIZE
+        self.workers = workers or DEFAULT_WRITE_WORKERS
 
-    def create_courses(self, courses_source: Union[str, List[Dict]]):
+    def _read(self, source: Union[str, List[Dict]], what: str, kind: str) -> Iterable[List[Dict]]:
+        """
+        Rows of a node source in chunks
+
+        A file is streamed (see src/records.py) one chunk per round of
+        parallel writes, so large files are never held in memory at once.
+        """
+        if isinstance(source, str):
+            self.logger(f"\n[Nodes] Loading {what} from {source}...")
+            if not os.path.exists(artifact_path(source)):
+                raise FileNotFoundError(f"{kind} file not found: {source}")
+            return iter_chunks(source, self.batch_size * self.workers)
+        self.logger(f"\n[Nodes] Loading {what} from memory/DB...")
+        return [source]
+
+    def _write(self, cypher: str, param: str, chunks: Iterable[List[Dict]], label: str,
+               fields, build: int, keep: Callable[[Dict], bool] = None) -> Dict:
+        """write_batched over each chunk; returns the combined stats"""
+        parts = []
+        for rows in chunks:
+            if keep:
+                rows = [r for r in rows if keep(r)]
+            parts.append(write_batched(
+                self.conn, cypher, param, with_content_hash(rows, fields), label,
+                batch_size=self.batch_size, workers=self.workers, logger=self.logger,
+                params={"build": build}
+            ))
+        return combine_stats(label, parts)
+
+    def create_courses(self, courses_source: Union[str, List[Dict]], build: int = UNVERSIONED_BUILD):
         """
         Create Course nodes from JSON file or List of dicts
 
         Args:
             courses_source: Path to courses JSON file OR List of course dictionaries
-        """
-        courses = []
-        if isinstance(courses_source, str):
-            print(f"\n[Nodes] Loading courses from {courses_source}...")
-
-            if not os.path.exists(courses_source):
-                raise FileNotFoundError(f"Courses file not found: {courses_source}")
-
-            with open(courses_source, 'r', encoding='utf-8') as f:
-                courses = json.load(f)
-        else:
-            print(f"\n[Nodes] Loading courses from memory/DB...")
-            courses = courses_source
+            build: Build the nodes are written into (see schema.py)
 
-        # Filter out placeholder courses
-        courses = [
-            c for c in courses
-            if c.get('description', '').strip() and 'not available' not in c.get('description', '')
-        ]
-
-        print(f"  Processing {len(courses)} courses...")
+        Returns:
+            Write throughput stats (see batching.write_batched)
+        """
+        chunks = self._read(courses_source, "courses", "Courses")
 
         cypher = """
         UNWIND $courses AS course
-        MERGE (c:Course {course_id: course.course_id})
+        MERGE (c:Course {course_id: course.course_id, build: $build})
         SET c.title = course.title,
             c.department = course.department,
             c.description = course.description,
             c.units = course.units,
+            c.content_hash = course.content_hash,
             c.created_at = timestamp()
         """
 
         try:
-            self.conn.execute(cypher, {"courses": courses})
-            print(f"✓ Created {len(courses)} Course nodes")
+            # Placeholder courses (no real description) are skipped
+            stats = self._write(
+                cypher, "courses", chunks, "Course nodes", COURSE_FIELDS, build,
+                keep=lambda c: c.get('description', '').strip() and 'not available' not in c.get('description', '')
+            )
+            self.logger(f"✓ Created {stats['rows']} Course nodes ({stats['rows_per_sec']:,.0f} rows/s)")
+            return stats
         except Exception as e:
-            print(f"✗ Failed to create Course nodes: {e}")
+            self.logger(f"✗ Failed to create Course nodes: {e}")
             raise
 
-    def create_apps(self, apps_source: Union[str, List[Dict]]):
+    def create_apps(self, apps_source: Union[str, List[Dict]], build: int = UNVERSIONED_BUILD):
         """
         Create VRApp nodes from JSON file or List of dicts
 
         Args:
             apps_source: Path to VR apps JSON file OR List of app dictionaries
+            build: Build the nodes are written into (see schema.py)
+
+        Returns:
+            Write throughput stats (see batching.write_batched)
         """
-        apps = []
-        if isinstance(apps_source, str):
-            print(f"\n[Nodes] Loading VR apps from {apps_source}...")
-            if not os.path.exists(apps_source):
-                raise FileNotFoundError(f"VR apps file not found: {apps_source}")
-            with open(apps_source, 'r', encoding='utf-8') as f:
-                apps = json.load(f)
-        else:
-            print(f"\n[Nodes] Loading VR apps from memory/DB...")
-            apps = apps_source
-
-        print(f"  Processing {len(apps)} VR apps...")
+        chunks = self._read(apps_source, "VR apps", "VR apps")
 
         cypher = """
         UNWIND $apps AS app
-        MERGE (a:VRApp {app_id: app.app_id})
+        MERGE (a:VRApp {app_id: app.app_id, build: $build})
         SET a.name = app.name,
             a.category = app.category,
             a.description = app.description,
             a.rating = app.rating,
             a.price = app.price,
             a.features = app.features,
+            a.content_hash = app.content_hash,
             a.created_at = timestamp()
         """
 
         try:
-            self.conn.execute(cypher, {"apps": apps})
-            print(f"✓ Created {len(apps)} VRApp nodes")
+            stats = self._write(cypher, "apps", chunks, "VRApp nodes", APP_FIELDS, build)
+            self.logger(f"✓ Created {stats['rows']} VRApp nodes ({stats['rows_per_sec']:,.0f} rows/s)")
+            return stats
         except Exception as e:
-            print(f"✗ Failed to create VRApp nodes: {e}")
+            self.logger(f"✗ Failed to create VRApp nodes: {e}")
             raise
 
-    def create_skills(self, skills_source: Union[str, List[Dict]]):
+    def create_skills(self, skills_source: Union[str, List[Dict]], build: int = UNVERSIONED_BUILD):
         """
         Create Skill nodes from JSON file or List of dicts
 
         Args:
             skills_source: Path to skills JSON file OR List of skill dictionaries
+            build: Build the nodes are written into (see schema.py)
+
+        Returns:
+            Write throughput stats (see batching.write_batched)
         """
-        skills = []
-        if isinstance(skills_source, str):
-            print(f"\n[Nodes] Loading skills from {skills_source}...")
-            if not os.path.exists(skills_source):
-                raise FileNotFoundError(f"Skills file not found: {skills_source}")
-            with open(skills_source, 'r', encoding='utf-8') as f:
-                skills = json.load(f)
-        else:
-            print(f"\n[Nodes] Loading skills from memory/DB...")
-            skills = skills_source
-
-        print(f"  Processing {len(skills)} skills...")
+        chunks = self._read(skills_source, "skills", "Skills")
 
         cypher = """
         UNWIND $skills AS skill
-        MERGE (s:Skill {name: skill.name})
+        MERGE (s:Skill {name: skill.name, build: $build})
         SET s.category = skill.category,
             s.aliases = skill.aliases,
+            s.aliases_text = reduce(t = '', alias IN coalesce(skill.aliases, []) | t + alias + ' '),
             s.source_count = skill.source_count,
             s.weight = skill.weight,
+            s.content_hash = skill.content_hash,
             s.created_at = timestamp()
         """
 
         try:
-            self.conn.execute(cypher, {"skills": skills})
-            print(f"✓ Created {len(skills)} Skill nodes")
+            stats = self._write(cypher, "skills", chunks, "Skill nodes", SKILL_FIELDS, build)
+            self.logger(f"✓ Created {stats['rows']} Skill nodes ({stats['rows_per_sec']:,.0f} rows/s)")
+            return stats
         except Exception as e:
-            print(f"✗ Failed to create Skill nodes: {e}")
+            self.logger(f"✗ Failed to create Skill nodes: {e}")
             raise
 
     def get_node_counts(self) -> Dict[str, int]:
         """
-        Get counts of all node types
+        Get counts of all node types in the active build
 
         Returns:
             Dictionary with node type counts
         """
-        counts = {}
-
         try:
-            result = self.conn.query("MATCH (c:Course) RETURN count(c) as count")
-            counts['courses'] = result[0]['count'] if result else 0
-
-            result = self.conn.query("MATCH (a:VRApp) RETURN count(a) as count")
-            counts['apps'] = result[0]['count'] if result else 0
-
-            result = self.conn.query("MATCH (s:Skill) RETURN count(s) as count")
-            counts['skills'] = result[0]['count'] if result else 0
-
-            return counts
+            stats = GraphStats(self.conn).get()
+            return {key: stats.get(key, 0) for key in ("courses", "apps", "skills")}
         except Exception as e:
-            print(f"Error getting node counts: {e}")
-            return {}
\ No newline at end of file
+            self.logger(f"Error getting node counts: {e}")
+            return {}
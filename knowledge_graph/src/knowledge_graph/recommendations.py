@@ -0,0 +1,134 @@
+"""Materialized Course -> VRApp recommendations
+
+    score(c, a)       = sum over shared skills s of TEACHES(c, s).weight * DEVELOPS(a, s).weight
+    skill_count(c, a) = number of shared skills
+
+Scores for all pairs are computed in bulk by SkillOverlapScorer (sparse
+matrix products, see scoring.py) over the build's TEACHES/DEVELOPS edges,
+and the top_k apps per course are written back as RECOMMENDS edges in chunks.
+
+A delta only changes the scores of courses whose TEACHES edges changed and
+of courses teaching a skill whose DEVELOPS edges changed, so materialize()
+can be given those courses/skills to recompute and rewrite just their rows.
+"""
+
+from typing import Dict, Iterable, Optional
+
+from .batching import DEFAULT_BATCH_SIZE, DEFAULT_WRITE_WORKERS, chunk_by_key, chunk_rows, write_batched
+from .scoring import DEFAULT_TOP_K, SkillOverlapScorer
+
+
+class RecommendationMaterializer:
+    """Computes RECOMMENDS edges from TEACHES/DEVELOPS weights"""
+
+    def __init__(self, connection, logger=None, top_k: int = None,
+                 batch_size: int = None, workers: int = None):
+        """
+        Args:
+            connection: Neo4jConnection instance
+            logger: Progress output (default: print)
+            top_k: Apps recommended per course (default: KG_RECOMMEND_TOP_K env var or 20)
+            batch_size: Rows per write transaction (default: KG_BATCH_SIZE)
+            workers: Concurrent write transactions (default: KG_WRITE_WORKERS)
+        """
+        self.conn = connection
+        self.logger = logger if logger else print
+        self.top_k = top_k or DEFAULT_TOP_K
+        self.batch_size = batch_size or DEFAULT_BATCH_SIZE
+        self.workers = workers or DEFAULT_WRITE_WORKERS
+
+    def _load(self, build: int) -> SkillOverlapScorer:
+        teaches = self.conn.query("""
+            MATCH (c:Course {build: $build})-[r:TEACHES]->(s:Skill)
+            RETURN c.course_id AS course_id, s.name AS skill_name, r.weight AS weight
+        """, {"build": build})
+        develops = self.conn.query("""
+            MATCH (a:VRApp {build: $build})-[r:DEVELOPS]->(s:Skill)
+            RETURN a.app_id AS app_id, s.name AS skill_name, r.weight AS weight
+        """, {"build": build})
+        return SkillOverlapScorer(teaches, develops)
+
+    def materialize(
+        self,
+        build: int,
+        min_shared_skills: int = 1,
+        courses: Optional[Iterable[str]] = None,
+        skills: Optional[Iterable[str]] = None
+    ) -> Dict:
+        """
+        Compute and write RECOMMENDS edges for a build
+
+        With neither courses nor skills given, every course is recomputed.
+        Otherwise only the given courses and the courses teaching any of the
+        given skills are (their old RECOMMENDS edges are replaced).
+
+        Args:
+            build: Build to materialize (see schema.py)
+            min_shared_skills: Minimum shared skills for a recommendation
+            courses: Course ids whose TEACHES edges changed
+            skills: Skill names whose DEVELOPS edges changed
+
+        Returns:
+            Write throughput stats (see batching.write_batched) plus
+            "courses": number of courses refreshed
+        """
+        full = courses is None and skills is None
+        scorer = self._load(build)
+
+        if full:
+            targets = None
+            stale = None
+        else:
+            touched = set(courses or ()) | set(scorer.courses_teaching(skills or ()))
+            targets = stale = sorted(touched)
+
+        records = scorer.top_k(self.top_k, min_shared_skills, courses=targets)
+        n_courses = len(scorer.course_ids) if full else len(stale)
+        self.logger(f"  Scored {n_courses} courses x {len(scorer.app_ids)} apps "
+                    f"over {len(scorer.skills)} skills -> {len(records)} recommendations")
+
+        # Replace the refreshed courses' edges
+        if full:
+            while True:
+                result = self.conn.query("""
+                    MATCH (:Course {build: $build})-[r:RECOMMENDS]->()
+                    WITH r LIMIT $limit
+                    DELETE r
+                    RETURN count(*) AS count
+                """, {"build": build, "limit": self.batch_size}, write=True)
+                if not result or result[0]["count"] < self.batch_size:
+                    break
+        elif stale:
+            stale_rows = [{"course_id": c} for c in stale]
+            write_batched(
+                self.conn, """
+                UNWIND $rows AS row
+                MATCH (:Course {course_id: row.course_id, build: $build})-[r:RECOMMENDS]->()
+                DELETE r
+                """, "rows", stale_rows, "stale RECOMMENDS",
+                workers=self.workers, chunks=chunk_rows(stale_rows, self.batch_size),
+                logger=self.logger, params={"build": build}
+            )
+
+        cypher = """
+        UNWIND $recommendations AS row
+        MATCH (c:Course {course_id: row.course_id, build: $build})
+        MATCH (a:VRApp {app_id: row.app_id, build: $build})
+        MERGE (c)-[r:RECOMMENDS]->(a)
+        SET r.score = row.score,
+            r.skill_count = row.skill_count,
+            r.shared_skills = row.shared_skills
+        """
+        # Partition by course and order by app so parallel chunks never
+        # lock the same Course node and take shared app locks in order
+        chunks = chunk_by_key(
+            records, self.batch_size,
+            partition_key=lambda r: r["course_id"],
+            order_key=lambda r: r["app_id"]
+        )
+        stats = write_batched(
+            self.conn, cypher, "recommendations", records, "RECOMMENDS relationships",
+            workers=self.workers, chunks=chunks, logger=self.logger, params={"build": build}
+        )
+        stats["courses"] = n_courses
+        return stats
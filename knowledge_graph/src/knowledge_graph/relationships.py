@@ -1,142 +1,181 @@
 """Relationship creation for knowledge graph"""
 
-import json
 import os
-from typing import List, Dict, Union
+from typing import Dict, Iterable, List, Union
+
+from src.records import artifact_path, iter_chunks
+
+from .batching import DEFAULT_BATCH_SIZE, DEFAULT_WRITE_WORKERS, chunk_by_key, combine_stats, write_batched
+from .delta import MAPPING_FIELDS, with_content_hash
+from .recommendations import RecommendationMaterializer
+from .schema import UNVERSIONED_BUILD
+from .stats import GraphStats
 
 
 class RelationshipCreator:
     """Creates relationships between nodes"""
 
-    def __init__(self, connection):
+    def __init__(self, connection, logger=None, batch_size: int = None, workers: int = None):
         """
         Initialize relationship creator
 
         Args:
             connection: Neo4jConnection instance
+            logger: Progress output (default: print)
+            batch_size: Rows per write transaction (default: KG_BATCH_SIZE env var or 2000)
+            workers: Concurrent write transactions (default: KG_WRITE_WORKERS env var or 4)
         """
         self.conn = connection
+        self.logger = logger if logger else print
+        self.batch_size = batch_size or DEFAULT_BATCH_SIZE
+        self.workers = workers or DEFAULT_WRITE_WORKERS
+
+    def _read(self, source: Union[str, List[Dict]], what: str, kind: str) -> Iterable[List[Dict]]:
+        """Mappings from a file (streamed in chunks, see src/records.py) or an in-memory list"""
+        if isinstance(source, str):
+            self.logger(f"\n[Relations] Loading {what} mappings from {source}...")
+            if not os.path.exists(artifact_path(source)):
+                raise FileNotFoundError(f"{kind} mapping file not found: {source}")
+            return iter_chunks(source, self.batch_size * self.workers)
+        self.logger(f"\n[Relations] Loading {what} mappings from memory/DB...")
+        return [source]
+
+    def _write(self, cypher: str, chunks: Iterable[List[Dict]], label: str, source_field: str,
+               build: int) -> Dict:
+        """
+        Write mapping chunks; each is split with chunk_by_key and written in parallel
 
-    def create_course_skill_relations(self, mappings_source: Union[str, List[Dict]]):
+        Partitioned by skill and ordered by source so parallel transactions
+        never lock the same Skill node and take shared source-node locks in
+        order. Streamed chunks are written one after another.
+        """
+        parts = []
+        for mappings in chunks:
+            mappings = with_content_hash(mappings, MAPPING_FIELDS)
+            parts.append(write_batched(
+                self.conn, cypher, "mappings", mappings, label,
+                workers=self.workers, logger=self.logger, params={"build": build},
+                chunks=chunk_by_key(
+                    mappings, self.batch_size,
+                    partition_key=lambda m: str(m.get("skill_name")),
+                    order_key=lambda m: str(m.get("source_id") or m.get(source_field))
+                )
+            ))
+        return combine_stats(label, parts)
+
+    def create_course_skill_relations(self, mappings_source: Union[str, List[Dict]],
+                                      build: int = UNVERSIONED_BUILD):
         """
         Create TEACHES relationships between Course and Skill nodes
 
         Args:
             mappings_source: Path to course-skills mapping JSON file OR List of mappings
+            build: Build whose nodes are linked (see schema.py)
+
+        Returns:
+            Write throughput stats (see batching.write_batched)
         """
-        mappings = []
-        if isinstance(mappings_source, str):
-            print(f"\n[Relations] Loading course-skill mappings from {mappings_source}...")
-            if not os.path.exists(mappings_source):
-                raise FileNotFoundError(f"Course-skills mapping file not found: {mappings_source}")
-            with open(mappings_source, 'r', encoding='utf-8') as f:
-                mappings = json.load(f)
-        else:
-            print(f"\n[Relations] Loading course-skill mappings from memory/DB...")
-            mappings = mappings_source
-
-        print(f"  Processing {len(mappings)} course-skill mappings...")
+        chunks = self._read(mappings_source, "course-skill", "Course-skills")
 
         # Supports 'source_id' (JSON) or 'course_id' (MongoDB)
         cypher = """
         UNWIND $mappings AS m
-        MATCH (c:Course {course_id: coalesce(m.source_id, m.course_id)})
-        MATCH (s:Skill {name: m.skill_name})
+        MATCH (c:Course {course_id: coalesce(m.source_id, m.course_id), build: $build})
+        MATCH (s:Skill {name: m.skill_name, build: $build})
         MERGE (c)-[r:TEACHES]->(s)
         SET r.weight = m.weight,
+            r.content_hash = m.content_hash,
             r.created_at = timestamp()
         """
 
         try:
-            self.conn.execute(cypher, {"mappings": mappings})
-
-            # Count relationships created
-            result = self.conn.query("MATCH ()-[r:TEACHES]->() RETURN count(r) as count")
-            count = result[0]['count'] if result else 0
-            print(f"✓ Created {count} TEACHES relationships")
+            stats = self._write(cypher, chunks, "TEACHES relationships", "course_id", build)
+            self.logger(f"✓ Wrote {stats['rows']} TEACHES mappings ({stats['rows_per_sec']:,.0f} rows/s)")
+            return stats
         except Exception as e:
-            print(f"✗ Failed to create TEACHES relationships: {e}")
+            self.logger(f"✗ Failed to create TEACHES relationships: {e}")
             raise
 
-    def create_app_skill_relations(self, mappings_source: Union[str, List[Dict]]):
+    def create_app_skill_relations(self, mappings_source: Union[str, List[Dict]],
+                                   build: int = UNVERSIONED_BUILD):
         """
         Create DEVELOPS relationships between VRApp and Skill nodes
 
         Args:
             mappings_source: Path to app-skills mapping JSON file OR List of mappings
+            build: Build whose nodes are linked (see schema.py)
+
+        Returns:
+            Write throughput stats (see batching.write_batched)
         """
-        mappings = []
-        if isinstance(mappings_source, str):
-            print(f"\n[Relations] Loading app-skill mappings from {mappings_source}...")
-            if not os.path.exists(mappings_source):
-                raise FileNotFoundError(f"App-skills mapping file not found: {mappings_source}")
-            with open(mappings_source, 'r', encoding='utf-8') as f:
-                mappings = json.load(f)
-        else:
-            print(f"\n[Relations] Loading app-skill mappings from memory/DB...")
-            mappings = mappings_source
-
-        print(f"  Processing {len(mappings)} app-skill mappings...")
+        chunks = self._read(mappings_source, "app-skill", "App-skills")
 
         # Supports 'source_id' (JSON) or 'app_id' (MongoDB)
         cypher = """
         UNWIND $mappings AS m
-        MATCH (a:VRApp {app_id: coalesce(m.source_id, m.app_id)})
-        MATCH (s:Skill {name: m.skill_name})
+        MATCH (a:VRApp {app_id: coalesce(m.source_id, m.app_id), build: $build})
+        MATCH (s:Skill {name: m.skill_name, build: $build})
         MERGE (a)-[r:DEVELOPS]->(s)
         SET r.weight = m.weight,
+            r.content_hash = m.content_hash,
             r.created_at = timestamp()
         """
 
         try:
-            self.conn.execute(cypher, {"mappings": mappings})
-
-            # Count relationships created
-            result = self.conn.query("MATCH ()-[r:DEVELOPS]->() RETURN count(r) as count")
-            count = result[0]['count'] if result else 0
-            print(f"✓ Created {count} DEVELOPS relationships")
+            stats = self._write(cypher, chunks, "DEVELOPS relationships", "app_id", build)
+            self.logger(f"✓ Wrote {stats['rows']} DEVELOPS mappings ({stats['rows_per_sec']:,.0f} rows/s)")
+            return stats
         except Exception as e:
-            print(f"✗ Failed to create DEVELOPS relationships: {e}")
+            self.logger(f"✗ Failed to create DEVELOPS relationships: {e}")
             raise
 
-    def compute_recommendations(self, min_shared_skills: int = 1):
+    def compute_recommendations(self, min_shared_skills: int = 1, build: int = UNVERSIONED_BUILD,
+                                courses: List[str] = None, skills: List[str] = None):
         """
         Compute RECOMMENDS relationships between Course and VRApp
-        based on shared skills and their weights.
+        based on shared skills and their weights (see recommendations.py).
+
+        Args:
+            min_shared_skills: Minimum shared skills for a recommendation
+            build: Build to materialize
+            courses: Only refresh these courses (plus those teaching `skills`)
+            skills: Skills whose DEVELOPS edges changed
+
+        Returns:
+            Write throughput stats (see batching.write_batched)
         """
-        print(f"\n[Relations] Skipping direct RECOMMENDATION creation (Architecture Fix).")
-        print(f"  System will rely on indirect (Course)->(Skill)<-(App) paths.")
+        self.logger(f"\n[Relations] Materializing RECOMMENDS relationships...")
+        try:
+            stats = RecommendationMaterializer(
+                self.conn, logger=self.logger, batch_size=self.batch_size, workers=self.workers
+            ).materialize(build, min_shared_skills, courses=courses, skills=skills)
+            self.logger(f"✓ Wrote {stats['rows']} RECOMMENDS relationships for {stats['courses']} courses "
+                        f"({stats['rows_per_sec']:,.0f} rows/s)")
+            return stats
+        except Exception as e:
+            self.logger(f"✗ Failed to create RECOMMENDS relationships: {e}")
+            raise
 
     def get_relationship_counts(self) -> dict:
         """
-        Get counts of all relationship types
+        Get counts of all relationship types in the active build
 
         Returns:
             Dictionary with relationship type counts
         """
-        counts = {}
-
         try:
-            result = self.conn.query("MATCH ()-[r:TEACHES]->() RETURN count(r) as count")
-            counts['teaches'] = result[0]['count'] if result else 0
-
-            result = self.conn.query("MATCH ()-[r:DEVELOPS]->() RETURN count(r) as count")
-            counts['develops'] = result[0]['count'] if result else 0
-
-            result = self.conn.query("MATCH ()-[r:RECOMMENDS]->() RETURN count(r) as count")
-            counts['recommends'] = result[0]['count'] if result else 0
-
-            return counts
+            stats = GraphStats(self.conn).get()
+            return {key: stats.get(key, 0) for key in ("teaches", "develops", "recommends")}
         except Exception as e:
-            print(f"Error getting relationship counts: {e}")
+            self.logger(f"Error getting relationship counts: {e}")
             return {}
 
     def clear_relationships(self):
         """Clear all relationships (keep nodes)"""
-        print("\n[Relations] Clearing all relationships...")
+        self.logger("\n[Relations] Clearing all relationships...")
         try:
             self.conn.execute("MATCH ()-[r]->() DELETE r")
-            print("✓ All relationships cleared")
+            self.logger("✓ All relationships cleared")
         except Exception as e:
-            print(f"✗ Failed to clear relationships: {e}")
+            self.logger(f"✗ Failed to clear relationships: {e}")
             raise
@@ -1,4 +1,59 @@
-"""Knowledge graph schema initialization (constraints and indexes)"""
+"""Knowledge graph schema initialization (constraints, indexes, build versions)
+
+Course/VRApp/Skill nodes carry a `build` property. A full build writes a new
+build next to the live one; readers only see the build named by
+GraphMeta.active_build, so switching builds is a single-property write:
+
+    (:GraphMeta {key: 'build'})
+        active_build    build readers query
+        previous_build  build kept for rollback
+        staging_build   build being written (if any)
+        version         change marker polled by live readers
+"""
+
+import re
+from typing import Dict
+
+# Prefix for read queries: binds `build` to the active build, e.g.
+#   f"{ACTIVE_BUILD} MATCH (s:Skill {{build: build}}) RETURN s.name"
+ACTIVE_BUILD = "MATCH (meta:GraphMeta {key: 'build'}) WITH meta.active_build AS build"
+
+# Build id given to nodes written before builds were versioned
+UNVERSIONED_BUILD = 0
+
+# Nodes deleted per transaction when migrating or garbage-collecting builds
+GC_BATCH_SIZE = 10000
+
+VERSIONED_LABELS = ("Course", "VRApp", "Skill")
+
+# One GraphMeta node per key, even when several processes MERGE it at once
+GRAPH_META_CONSTRAINT = "CREATE CONSTRAINT graph_meta_key IF NOT EXISTS FOR (m:GraphMeta) REQUIRE m.key IS UNIQUE"
+
+# Full-text (Lucene) indexes; maintained by Neo4j on every write
+COURSE_TEXT_INDEX = "course_text"
+SKILL_TEXT_INDEX = "skill_text"
+
+_LUCENE_SPECIAL = re.compile(r'([+\-&|!(){}\[\]^"~*?:\\/])')
+
+
+def fulltext_query(text: str, boosts: Dict[str, float] = None) -> str:
+    """
+    Build a Lucene query matching any word of free text
+
+    Words are lowercased (so AND/OR/NOT are not operators) and escaped.
+
+    Args:
+        text: User input
+        boosts: Optional per-property boosts, e.g. {"title": 2, "description": 1}
+
+    Returns:
+        Query string for db.index.fulltext.queryNodes, or "" if text has no words
+    """
+    terms = " ".join(_LUCENE_SPECIAL.sub(r"\\\1", word.lower()) for word in text.split())
+    if not terms or not boosts:
+        return terms
+    return " ".join(f"{field}:({terms})^{boost}" for field, boost in boosts.items())
+
 
 class KnowledgeGraphSchema:
     """Manages Neo4j schema constraints and indexes"""
@@ -14,10 +69,15 @@ class KnowledgeGraphSchema:
 
     def init_constraints(self):
         """Create unique constraints for primary keys"""
+        # Keys are unique per build; several builds coexist during a rebuild
         constraints = [
-            "CREATE CONSTRAINT course_id IF NOT EXISTS FOR (c:Course) REQUIRE c.course_id IS UNIQUE",
-            "CREATE CONSTRAINT app_id IF NOT EXISTS FOR (a:VRApp) REQUIRE a.app_id IS UNIQUE",
-            "CREATE CONSTRAINT skill_name IF NOT EXISTS FOR (s:Skill) REQUIRE s.name IS UNIQUE",
+            "DROP CONSTRAINT course_id IF EXISTS",
+            "DROP CONSTRAINT app_id IF EXISTS",
+            "DROP CONSTRAINT skill_name IF EXISTS",
+            "CREATE CONSTRAINT course_build_id IF NOT EXISTS FOR (c:Course) REQUIRE (c.course_id, c.build) IS UNIQUE",
+            "CREATE CONSTRAINT app_build_id IF NOT EXISTS FOR (a:VRApp) REQUIRE (a.app_id, a.build) IS UNIQUE",
+            "CREATE CONSTRAINT skill_build_name IF NOT EXISTS FOR (s:Skill) REQUIRE (s.name, s.build) IS UNIQUE",
+            GRAPH_META_CONSTRAINT,
         ]
 
         print("\n[Schema] Creating constraints...")
@@ -38,6 +98,17 @@ class KnowledgeGraphSchema:
             "CREATE INDEX app_category IF NOT EXISTS FOR (a:VRApp) ON (a.category)",
             "CREATE INDEX skill_category IF NOT EXISTS FOR (s:Skill) ON (s.category)",
             "CREATE INDEX skill_source_count IF NOT EXISTS FOR (s:Skill) ON (s.source_count)",
+            # Key lookups (the composite constraints need both properties)
+            "CREATE INDEX course_id_lookup IF NOT EXISTS FOR (c:Course) ON (c.course_id)",
+            "CREATE INDEX app_id_lookup IF NOT EXISTS FOR (a:VRApp) ON (a.app_id)",
+            "CREATE INDEX skill_name_lookup IF NOT EXISTS FOR (s:Skill) ON (s.name)",
+            # Build scans (counts, garbage collection)
+            "CREATE INDEX course_build IF NOT EXISTS FOR (c:Course) ON (c.build)",
+            "CREATE INDEX app_build IF NOT EXISTS FOR (a:VRApp) ON (a.build)",
+            "CREATE INDEX skill_build IF NOT EXISTS FOR (s:Skill) ON (s.build)",
+            # Free-text lookups (course search, skill name/alias matching)
+            f"CREATE FULLTEXT INDEX {COURSE_TEXT_INDEX} IF NOT EXISTS FOR (c:Course) ON EACH [c.title, c.description]",
+            f"CREATE FULLTEXT INDEX {SKILL_TEXT_INDEX} IF NOT EXISTS FOR (s:Skill) ON EACH [s.name, s.aliases_text]",
         ]
 
         print("\n[Schema] Creating indexes...")
@@ -51,6 +122,192 @@ class KnowledgeGraphSchema:
 
         print("✓ Indexes initialized")
 
+    def _in_batches(self, cypher: str, params: dict = None) -> int:
+        """Repeat a `... LIMIT $limit ... RETURN count(*) AS count` write until it touches nothing"""
+        total = 0
+        while True:
+            result = self.conn.query(cypher, dict(params or {}, limit=GC_BATCH_SIZE), write=True)
+            count = result[0]["count"] if result else 0
+            total += count
+            if count < GC_BATCH_SIZE:
+                return total
+
+    def get_build_info(self) -> dict:
+        """
+        Current build pointers
+
+        Returns:
+            Dictionary with active, previous, staging and version
+            (None where unset)
+        """
+        result = self.conn.query("""
+            MATCH (m:GraphMeta {key: 'build'})
+            RETURN m.active_build AS active, m.previous_build AS previous,
+                   m.staging_build AS staging, m.version AS version
+        """)
+        if not result:
+            return {"active": None, "previous": None, "staging": None, "version": None}
+        return result[0]
+
+    def adopt_unversioned_nodes(self) -> int:
+        """
+        Migrate a graph built before builds were versioned
+
+        Nodes without a build property join UNVERSIONED_BUILD, which becomes
+        the active build if none is set yet.
+
+        Returns:
+            The active build
+        """
+        adopted = 0
+        for label in VERSIONED_LABELS:
+            adopted += self._in_batches(f"""
+                MATCH (n:{label}) WHERE n.build IS NULL
+                WITH n LIMIT $limit
+                SET n.build = {UNVERSIONED_BUILD}
+                RETURN count(n) AS count
+            """)
+        result = self.conn.query(f"""
+            MERGE (m:GraphMeta {{key: 'build'}})
+            SET m.active_build = coalesce(m.active_build, {UNVERSIONED_BUILD})
+            RETURN m.active_build AS active
+        """, write=True)
+        if adopted:
+            print(f"✓ Adopted {adopted} unversioned nodes into build {UNVERSIONED_BUILD}")
+        return result[0]["active"]
+
+    def init_build_meta(self) -> int:
+        """
+        Make sure readers have an active build to query
+
+        Run by the builder, and once after deploying over a graph built
+        before builds were versioned (scripts/build_graph.py --migrate), so
+        it is served before the next build. Readers never run it.
+
+        Returns:
+            The active build
+        """
+        self.conn.execute(GRAPH_META_CONSTRAINT)
+        return self.adopt_unversioned_nodes()
+
+    def begin_build(self) -> int:
+        """
+        Allocate a staging build id (epoch millis)
+
+        Returns:
+            The staging build to write nodes into
+        """
+        result = self.conn.query("""
+            MERGE (m:GraphMeta {key: 'build'})
+            SET m.staging_build = timestamp()
+            RETURN m.staging_build AS build
+        """, write=True)
+        build = result[0]["build"]
+        print(f"✓ Staging build: {build}")
+        return build
+
+    def activate_build(self, build: int) -> int:
+        """
+        Atomically make a build the one readers query
+
+        The old active build becomes the rollback target, and the version
+        marker is bumped so live readers reload.
+
+        Args:
+            build: Fully written staging build
+
+        Returns:
+            The new version (epoch millis)
+        """
+        result = self.conn.query("""
+            MATCH (m:GraphMeta {key: 'build'})
+            WITH m, m.active_build AS current
+            SET m.previous_build = current,
+                m.active_build = $build,
+                m.staging_build = null,
+                m.version = timestamp()
+            RETURN m.version AS version, current AS previous
+        """, {"build": build}, write=True)
+        version = result[0]["version"] if result else None
+        previous = result[0]["previous"] if result else None
+        print(f"✓ Cut over to build {build} (previous: {previous}, version: {version})")
+        return version
+
+    def rollback_build(self) -> int:
+        """
+        Swap the active and previous builds
+
+        Rolling back twice returns to the original build.
+
+        Returns:
+            The build now active
+        """
+        result = self.conn.query("""
+            MATCH (m:GraphMeta {key: 'build'})
+            WHERE m.previous_build IS NOT NULL
+            WITH m, m.active_build AS current
+            SET m.active_build = m.previous_build,
+                m.previous_build = current,
+                m.version = timestamp()
+            RETURN m.active_build AS active
+        """, write=True)
+        if not result:
+            raise RuntimeError("No previous build to roll back to")
+        active = result[0]["active"]
+        print(f"✓ Rolled back to build {active}")
+        return active
+
+    def collect_garbage(self) -> int:
+        """
+        Delete builds other than the active, previous and staging ones
+
+        Removes superseded builds and leftovers of failed builds.
+
+        Returns:
+            Number of nodes deleted
+        """
+        info = self.get_build_info()
+        keep = [b for b in (info["active"], info["previous"], info["staging"]) if b is not None]
+        deleted = 0
+        for label in VERSIONED_LABELS:
+            result = self.conn.query(
+                f"MATCH (n:{label}) WHERE NOT n.build IN $keep RETURN DISTINCT n.build AS build",
+                {"keep": keep}
+            )
+            for build in [r["build"] for r in result]:
+                deleted += self._in_batches(f"""
+                    MATCH (n:{label} {{build: $build}})
+                    WITH n LIMIT $limit
+                    DETACH DELETE n
+                    RETURN count(*) AS count
+                """, {"build": build})
+        self.conn.query(
+            "MATCH (g:GraphStats) WHERE NOT g.build IN $keep DELETE g RETURN count(g) AS count",
+            {"keep": keep}, write=True
+        )
+        print(f"✓ Garbage-collected {deleted} nodes (kept builds {keep})")
+        return deleted
+
+    def mark_build_version(self) -> int:
+        """
+        Record a new graph build version
+
+        Live readers (e.g. the RAG skill index) poll this marker to know
+        when to reload their in-memory copies of the graph. Used after
+        in-place (delta) changes to the active build.
+
+        Returns:
+            The new version (epoch millis)
+        """
+        result = self.conn.query("""
+            MERGE (m:GraphMeta {key: 'build'})
+            SET m.version = timestamp()
+            RETURN m.version AS version
+        """, write=True)
+        version = result[0]["version"] if result else None
+        print(f"✓ Graph build version: {version}")
+        return version
+
     def clear_database(self):
         """Clear all data from the database (USE WITH CAUTION)"""
         print("\n[WARN] Clearing entire database...")
@@ -0,0 +1,197 @@
+"""Vectorized weighted-overlap scoring of courses against VR apps
+
+    score(c, a)       = sum over shared skills s of weight(c, s) * weight(a, s)
+    skill_count(c, a) = number of shared skills
+
+Both are sparse products of a (courses x skills) and an (apps x skills)
+matrix, computed a block of courses at a time. Top-k selection per course
+is a partial sort (np.partition) over the dense score block, so Python only
+touches the selected pairs.
+
+Input is the course/app skill mappings as written by skill extraction:
+{source_id | course_id | app_id, skill_name, weight}.
+"""
+
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from src.records import load_records
+
+
+DEFAULT_TOP_K = int(os.getenv("KG_RECOMMEND_TOP_K", "20"))
+
+# Course rows scored per sparse product (bounds the dense score block)
+SCORE_BLOCK = 1024
+
+
+def _mapping_matrix(mappings: List[Dict], id_field: str, skill_ids: Dict[str, int]) -> Tuple[List[str], csr_matrix]:
+    """(source ids, sources x skills weight matrix); duplicate pairs keep the last weight"""
+    pairs = {}
+    for m in mappings:
+        source = m.get("source_id") or m.get(id_field)
+        if source is not None and m.get("skill_name") in skill_ids:
+            # A missing weight scores like sum() in Cypher: as zero
+            pairs[(source, m["skill_name"])] = m.get("weight") or 0.0
+
+    ids = sorted({source for source, _ in pairs})
+    row_ids = {source: i for i, source in enumerate(ids)}
+    matrix = csr_matrix(
+        (
+            np.fromiter(pairs.values(), dtype=np.float64, count=len(pairs)),
+            (
+                np.fromiter((row_ids[s] for s, _ in pairs), dtype=np.int64, count=len(pairs)),
+                np.fromiter((skill_ids[k] for _, k in pairs), dtype=np.int64, count=len(pairs)),
+            ),
+        ),
+        shape=(len(ids), len(skill_ids)),
+    )
+    matrix.sort_indices()
+    return ids, matrix
+
+
+def _row_sets(matrix: csr_matrix) -> List[frozenset]:
+    """Column indices of each row as a set; set intersection per pair is far cheaper than np.intersect1d"""
+    indptr = matrix.indptr.tolist()
+    indices = matrix.indices.tolist()
+    return [frozenset(indices[indptr[i]:indptr[i + 1]]) for i in range(matrix.shape[0])]
+
+
+def _binary(matrix: csr_matrix) -> csr_matrix:
+    """Same sparsity pattern with every stored entry set to 1 (zero weights still count)"""
+    pattern = matrix.copy()
+    pattern.data = np.ones_like(pattern.data)
+    return pattern
+
+
+class SkillOverlapScorer:
+    """Sparse course x app scoring over shared skills"""
+
+    def __init__(self, course_skills: List[Dict], app_skills: List[Dict]):
+        """
+        Args:
+            course_skills: Course-skill mappings (source_id or course_id, skill_name, weight)
+            app_skills: App-skill mappings (source_id or app_id, skill_name, weight)
+        """
+        self.skills = sorted({m["skill_name"] for m in course_skills} | {m["skill_name"] for m in app_skills})
+        self.skill_ids = {name: i for i, name in enumerate(self.skills)}
+        self.course_ids, self.teaches = _mapping_matrix(course_skills, "course_id", self.skill_ids)
+        self.app_ids, self.develops = _mapping_matrix(app_skills, "app_id", self.skill_ids)
+        self.course_rows = {cid: i for i, cid in enumerate(self.course_ids)}
+
+        self._develops_t = self.develops.T.tocsr()
+        self._develops_bin_t = _binary(self.develops).T.tocsr()
+        self._teaches_sets = _row_sets(self.teaches)
+        self._develops_sets = _row_sets(self.develops)
+
+    @classmethod
+    def from_json(cls, data_dir: str) -> "SkillOverlapScorer":
+        """Load course_skills.json and app_skills.json from data_dir"""
+        return cls(
+            load_records(os.path.join(data_dir, "course_skills.json")),
+            load_records(os.path.join(data_dir, "app_skills.json"))
+        )
+
+    @classmethod
+    def from_mongo(cls) -> "SkillOverlapScorer":
+        """Load mappings from the MongoDB CourseSkills/AppSkills repositories"""
+        from src.db.repositories import AppSkillsRepository, CourseSkillsRepository
+        return cls(CourseSkillsRepository().find_all(), AppSkillsRepository().find_all())
+
+    def courses_teaching(self, skills: Iterable[str]) -> List[str]:
+        """Ids of courses with a mapping to any of the given skills"""
+        columns = [self.skill_ids[s] for s in set(skills) if s in self.skill_ids]
+        if not columns:
+            return []
+        teaching = self.teaches[:, columns].tocsr()
+        return [self.course_ids[r] for r in np.flatnonzero(np.diff(teaching.indptr))]
+
+    def shared_skills(self, course_row: int, app_row: int) -> List[str]:
+        """Names of the skills a course and an app have in common"""
+        shared = self._teaches_sets[course_row] & self._develops_sets[app_row]
+        return [self.skills[s] for s in sorted(shared)]
+
+    def score_rows(
+        self,
+        rows: np.ndarray,
+        min_shared_skills: int = 1,
+        top_k: int = DEFAULT_TOP_K
+    ) -> List[Tuple[int, int, float, int]]:
+        """
+        Top-k apps for the given course rows
+
+        Args:
+            rows: Course row indices (see course_ids)
+            min_shared_skills: Minimum shared skills for a pair to qualify
+            top_k: Apps kept per course, ordered by score, shared skill count, app id
+
+        Returns:
+            (course row, app row, score, skill_count) tuples
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        n_apps = len(self.app_ids)
+        if not len(rows) or not n_apps:
+            return []
+        k = min(top_k, n_apps)
+
+        pairs = []
+        for start in range(0, len(rows), SCORE_BLOCK):
+            block = rows[start:start + SCORE_BLOCK]
+            counts = (_binary(self.teaches[block]) @ self._develops_bin_t).toarray()
+            # Rounded so ties do not depend on floating-point summation order
+            scores = np.round((self.teaches[block] @ self._develops_t).toarray(), 9)
+
+            # Rank key: score, then shared count; pairs below the threshold never qualify
+            eligible = counts >= min_shared_skills
+            key = np.where(eligible, scores, -np.inf)
+
+            # k-th best score per row; everything tying with it stays a
+            # candidate so the final order does not depend on argpartition
+            kth = -np.partition(-key, k - 1, axis=1)[:, k - 1:k]
+            candidates = eligible & (key >= kth)
+
+            for i in np.flatnonzero(candidates.any(axis=1)):
+                apps = np.flatnonzero(candidates[i])
+                # lexsort: last key is primary -> score desc, then shared count desc,
+                # then app id (rows are sorted by id) for a stable order on ties
+                order = apps[np.lexsort((apps, -counts[i, apps], -scores[i, apps]))][:k]
+                course = int(block[i])
+                pairs.extend(
+                    (course, int(a), float(scores[i, a]), int(counts[i, a])) for a in order
+                )
+        return pairs
+
+    def top_k(
+        self,
+        k: int = DEFAULT_TOP_K,
+        min_shared_skills: int = 1,
+        courses: Optional[Iterable[str]] = None
+    ) -> List[Dict]:
+        """
+        Top-k apps per course
+
+        Args:
+            k: Apps per course
+            min_shared_skills: Minimum shared skills for a recommendation
+            courses: Course ids to score (default: all)
+
+        Returns:
+            List of {course_id, app_id, score, skill_count, shared_skills}
+        """
+        if courses is None:
+            rows = np.arange(len(self.course_ids))
+        else:
+            rows = sorted(self.course_rows[c] for c in set(courses) if c in self.course_rows)
+
+        return [
+            {
+                "course_id": self.course_ids[course],
+                "app_id": self.app_ids[app],
+                "score": score,
+                "skill_count": shared,
+                "shared_skills": self.shared_skills(course, app),
+            }
+            for course, app, score, shared in self.score_rows(rows, min_shared_skills, k)
+        ]
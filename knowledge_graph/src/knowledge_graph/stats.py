@@ -0,0 +1,121 @@
+"""Graph statistics, computed once per build version
+
+All counts and insights for the active build come from one batched query,
+run once per GraphMeta.version and stored on a (:GraphStats {build}) node.
+Readers (builder summary, admin status endpoint) then fetch them with a
+single lookup instead of aggregating over the graph.
+
+Per-build counts cannot come from Neo4j's count store, which counts per
+label/type across all builds; they are computed through the build index.
+"""
+
+import json
+from typing import Dict, Optional
+
+
+# Counts and insights for one build, in a single round trip
+STATS_QUERY = """
+CALL { MATCH (c:Course {build: $build}) RETURN count(c) AS courses }
+CALL { MATCH (a:VRApp {build: $build}) RETURN count(a) AS apps }
+CALL { MATCH (s:Skill {build: $build}) RETURN count(s) AS skills }
+CALL { MATCH (:Course {build: $build})-[r:TEACHES]->() RETURN count(r) AS teaches }
+CALL { MATCH (:VRApp {build: $build})-[r:DEVELOPS]->() RETURN count(r) AS develops }
+CALL {
+    MATCH (:Course {build: $build})-[r:RECOMMENDS]->()
+    RETURN count(r) AS recommends,
+           avg(r.skill_count) AS avg_shared_skills,
+           max(r.skill_count) AS max_shared_skills
+}
+CALL {
+    MATCH (s:Skill {build: $build})
+    WITH s ORDER BY s.source_count DESC LIMIT 5
+    RETURN collect({name: s.name, category: s.category, count: s.source_count}) AS top_skills
+}
+CALL {
+    MATCH (c:Course {build: $build})-[:TEACHES]->(s:Skill)
+    WITH c, count(s) AS skill_count ORDER BY skill_count DESC LIMIT 5
+    RETURN collect({title: c.title, skill_count: skill_count}) AS top_courses
+}
+CALL {
+    MATCH (a:VRApp {build: $build})-[:DEVELOPS]->(s:Skill)
+    WITH a, count(s) AS skill_count ORDER BY skill_count DESC LIMIT 5
+    RETURN collect({name: a.name, skill_count: skill_count}) AS top_apps
+}
+RETURN courses, apps, skills, teaches, develops, recommends,
+       avg_shared_skills, max_shared_skills, top_skills, top_courses, top_apps
+"""
+
+
+class GraphStats:
+    """Cached statistics for the active graph build"""
+
+    def __init__(self, connection):
+        """
+        Args:
+            connection: Neo4jConnection instance
+        """
+        self.conn = connection
+        self._cached = None  # (version, stats)
+
+    def compute(self, build: int) -> Dict:
+        """
+        Run the batched statistics query for a build
+
+        Args:
+            build: Build to describe (see schema.py)
+
+        Returns:
+            Dictionary with node/relationship counts and top-5 insights
+        """
+        result = self.conn.query(STATS_QUERY, {"build": build})
+        return dict(result[0]) if result else {}
+
+    def record(self, build: int, version: Optional[int] = None) -> Dict:
+        """
+        Compute and store statistics for a build
+
+        Args:
+            build: Build to describe
+            version: GraphMeta.version the statistics belong to (default: current)
+
+        Returns:
+            The stored statistics
+        """
+        stats = self.compute(build)
+        result = self.conn.query("""
+            MATCH (meta:GraphMeta {key: 'build'})
+            MERGE (g:GraphStats {build: $build})
+            SET g.version = coalesce($version, meta.version),
+                g.data = $data
+            RETURN g.version AS version
+        """, {"build": build, "version": version, "data": json.dumps(stats)}, write=True)
+        stats_version = result[0]["version"] if result else version
+        self._cached = (stats_version, dict(stats, build=build, version=stats_version))
+        return self._cached[1]
+
+    def get(self) -> Dict:
+        """
+        Statistics for the active build
+
+        One lookup of GraphMeta and the stored GraphStats node; the batched
+        query only runs if the build version changed since it was recorded.
+
+        Returns:
+            Statistics including build and version, or {} if no build exists
+        """
+        result = self.conn.query("""
+            MATCH (meta:GraphMeta {key: 'build'})
+            OPTIONAL MATCH (g:GraphStats {build: meta.active_build})
+            RETURN meta.active_build AS build, meta.version AS version,
+                   g.version AS stats_version, g.data AS data
+        """)
+        if not result or result[0]["build"] is None:
+            return {}
+
+        row = result[0]
+        if self._cached and self._cached[0] == row["version"] and self._cached[1]["build"] == row["build"]:
+            return self._cached[1]
+        if row["data"] and row["stats_version"] == row["version"]:
+            self._cached = (row["version"], dict(json.loads(row["data"]), build=row["build"], version=row["version"]))
+            return self._cached[1]
+        return self.record(row["build"], row["version"])
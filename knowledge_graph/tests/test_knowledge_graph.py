@@ -3,6 +3,7 @@
 import unittest
 import json
 import os
+import tempfile
 from unittest.mock import Mock, MagicMock, patch
 
 # Add project root to path
@@ -13,6 +14,13 @@ from knowledge_graph.src.knowledge_graph.connection import Neo4jConnection
 from knowledge_graph.src.knowledge_graph.schema import KnowledgeGraphSchema
 from knowledge_graph.src.knowledge_graph.nodes import NodeCreator
 from knowledge_graph.src.knowledge_graph.relationships import RelationshipCreator
+from knowledge_graph.src.knowledge_graph.batching import chunk_by_key, write_batched
+from knowledge_graph.src.knowledge_graph.stats import STATS_QUERY, GraphStats
+from knowledge_graph.src.knowledge_graph.scoring import SkillOverlapScorer
+from src.records import write_records
+from knowledge_graph.src.knowledge_graph.delta import (
+    COURSE_FIELDS, SKILL_FIELDS, MAPPING_FIELDS, GraphDelta, content_hash
+)
 
 
 class TestNeo4jConnection(unittest.TestCase):
@@ -48,11 +56,11 @@ class TestNeo4jConnection(unittest.TestCase):
         with patch('knowledge_graph.src.knowledge_graph.connection.GraphDatabase') as mock_graph_db:
             mock_driver = MagicMock()
             mock_session = MagicMock()
-            mock_result = MagicMock()
+            mock_tx = MagicMock()
 
-            mock_session.run.return_value = mock_result
-            mock_result.__iter__ = lambda self: iter([Mock(data=lambda: {'test': 1})])
-            mock_driver.session.return_value = mock_session
+            mock_tx.run.return_value.data.return_value = [{'test': 1}]
+            mock_session.execute_read.side_effect = lambda work: work(mock_tx)
+            mock_driver.session.return_value.__enter__.return_value = mock_session
             mock_graph_db.driver.return_value = mock_driver
 
             conn = Neo4jConnection()
@@ -60,6 +68,28 @@ class TestNeo4jConnection(unittest.TestCase):
 
             self.assertEqual(len(result), 1)
             self.assertEqual(result[0]['test'], 1)
+            mock_session.execute_write.assert_not_called()
+
+            metrics = conn.get_metrics()
+            self.assertEqual(metrics['queries'], 1)
+            self.assertEqual(metrics['in_use'], 0)
+
+    def test_execute_uses_write_transaction(self):
+        """Test writes run in managed write transactions"""
+        with patch('knowledge_graph.src.knowledge_graph.connection.GraphDatabase') as mock_graph_db:
+            mock_driver = MagicMock()
+            mock_session = MagicMock()
+            mock_tx = MagicMock()
+
+            mock_session.execute_write.side_effect = lambda work: work(mock_tx)
+            mock_driver.session.return_value.__enter__.return_value = mock_session
+            mock_graph_db.driver.return_value = mock_driver
+
+            conn = Neo4jConnection()
+            conn.execute("CREATE (n:Test)", {"x": 1})
+
+            mock_tx.run.assert_called_once_with("CREATE (n:Test)", {"x": 1})
+            mock_session.execute_read.assert_not_called()
 
 
 class TestKnowledgeGraphSchema(unittest.TestCase):
@@ -74,15 +104,38 @@ class TestKnowledgeGraphSchema(unittest.TestCase):
         """Test constraint initialization"""
         self.schema.init_constraints()
 
-        # Verify all constraints were executed
-        self.assertEqual(self.mock_conn.execute.call_count, 3)
+        # Verify legacy constraints were dropped and per-build + GraphMeta ones created
+        self.assertEqual(self.mock_conn.execute.call_count, 7)
+
+    def test_init_build_meta_sets_active_build(self):
+        """Test readers get an active build on a graph built before versioning"""
+        self.mock_conn.query.return_value = [{"count": 0, "active": 0}]
+
+        self.assertEqual(self.schema.init_build_meta(), 0)
+
+        self.mock_conn.execute.assert_called_once()
+        self.assertIn("GraphMeta", self.mock_conn.execute.call_args[0][0])
+        cypher = self.mock_conn.query.call_args[0][0]
+        self.assertIn("coalesce(m.active_build, 0)", cypher)
 
     def test_init_indexes(self):
         """Test index initialization"""
         self.schema.init_indexes()
 
         # Verify all indexes were executed
-        self.assertEqual(self.mock_conn.execute.call_count, 4)
+        self.assertEqual(self.mock_conn.execute.call_count, 12)
+
+    def test_activate_build_is_single_write(self):
+        """Test cutover is one write that keeps the old build for rollback"""
+        self.mock_conn.query.return_value = [{"version": 2, "previous": 1}]
+
+        self.schema.activate_build(5)
+
+        self.mock_conn.query.assert_called_once()
+        cypher, params = self.mock_conn.query.call_args[0]
+        self.assertEqual(params, {"build": 5})
+        self.assertIn("m.previous_build = current", cypher)
+        self.assertTrue(self.mock_conn.query.call_args[1]["write"])
 
     def test_clear_database(self):
         """Test database clearing"""
@@ -166,6 +219,24 @@ class TestNodeCreator(unittest.TestCase):
         # Verify execute was called
         self.assertTrue(self.mock_conn.execute.called)
 
+    def test_create_courses_streams_file(self):
+        """Test that course files are streamed in chunks of batch_size * workers"""
+        courses = [dict(self.test_courses[0], course_id=f"c{i}") for i in range(5)]
+        courses.append(dict(self.test_courses[0], course_id="placeholder", description="Description not available"))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "courses.jsonl")
+            with open(path, "w", encoding="utf-8") as f:
+                f.writelines(json.dumps(c) + "\n" for c in courses)
+
+            nodes = NodeCreator(self.mock_conn, logger=lambda msg: None, batch_size=2, workers=1)
+            stats = nodes.create_courses(path)
+
+        written = [c.args[1]["courses"] for c in self.mock_conn.execute.call_args_list]
+        self.assertEqual([len(rows) for rows in written], [2, 2, 1])
+        self.assertEqual(stats["rows"], 5)
+        self.assertNotIn("placeholder", [row["course_id"] for rows in written for row in rows])
+
 
 class TestRelationshipCreator(unittest.TestCase):
     """Test relationship creation"""
@@ -216,6 +287,20 @@ class TestRelationshipCreator(unittest.TestCase):
         # Verify execute was called
         self.assertTrue(self.mock_conn.execute.called)
 
+    def test_create_course_skill_relations_from_columnar_file(self):
+        """Test that the logical .json path resolves to a columnar mappings file"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "course_skills.json")
+            written = write_records(path, self.test_course_skills, columnar=True)
+            self.assertTrue(written.endswith(".npz"))
+
+            self.relations.create_course_skill_relations(path)
+
+        rows = self.mock_conn.execute.call_args.args[1]["mappings"]
+        self.assertEqual(rows[0]["source_id"], "test_1")
+        self.assertEqual(rows[0]["skill_name"], "Python Programming")
+        self.assertEqual(rows[0]["weight"], 0.9)
+
     def test_compute_recommendations(self):
         """Test recommendation computation"""
         # Mock the query for counting
@@ -227,6 +312,128 @@ class TestRelationshipCreator(unittest.TestCase):
         self.assertTrue(self.mock_conn.execute.called)
 
 
+class TestBatchedWrites(unittest.TestCase):
+    """Test chunked UNWIND writes"""
+
+    def test_write_batched_chunks_rows(self):
+        """Test each chunk is written in its own transaction"""
+        mock_conn = Mock()
+        rows = [{"id": i} for i in range(5)]
+
+        stats = write_batched(mock_conn, "UNWIND $rows AS r", "rows", rows, "Test rows",
+                              batch_size=2, workers=2, logger=lambda msg: None)
+
+        self.assertEqual(mock_conn.execute.call_count, 3)
+        written = sorted(r["id"] for call in mock_conn.execute.call_args_list for r in call[0][1]["rows"])
+        self.assertEqual(written, list(range(5)))
+        self.assertEqual(stats["rows"], 5)
+        self.assertEqual(stats["batches"], 3)
+
+    def test_chunk_by_key_keeps_skills_together(self):
+        """Test no skill is split across chunks and chunks are ordered by source"""
+        mappings = [
+            {"source_id": f"c{i % 3}", "skill_name": f"s{i % 4}"}
+            for i in range(12)
+        ]
+
+        chunks = chunk_by_key(mappings, 4, lambda m: m["skill_name"], lambda m: m["source_id"])
+
+        seen = {}
+        for idx, chunk in enumerate(chunks):
+            self.assertEqual(chunk, sorted(chunk, key=lambda m: m["source_id"]))
+            for m in chunk:
+                self.assertEqual(seen.setdefault(m["skill_name"], idx), idx)
+        self.assertEqual(sum(len(c) for c in chunks), 12)
+
+
+class TestGraphDelta(unittest.TestCase):
+    """Test delta sync against the current graph state"""
+
+    def test_apply_only_writes_changes(self):
+        """Test unchanged rows are skipped and removed rows are deleted"""
+        course = {"course_id": "C1", "title": "Intro", "description": "Basics", "units": 4}
+        skill = {"name": "Python", "category": "technical", "aliases": [], "source_count": 1, "weight": 1.0}
+        changed_skill = {"name": "SQL", "category": "technical", "aliases": [], "source_count": 2, "weight": 1.0}
+        teaches = {"source_id": "C1", "skill_name": "Python", "weight": 0.9}
+
+        graph = {
+            "TEACHES": [{"key": "C1", "dst": "Python", "hash": content_hash(teaches, MAPPING_FIELDS)}],
+            "DEVELOPS": [],
+            "c:Course": [{"key": "C1", "hash": content_hash(course, COURSE_FIELDS)},
+                         {"key": "OLD", "hash": "x"}],
+            "a:VRApp": [],
+            "s:Skill": [{"key": "Python", "hash": content_hash(skill, SKILL_FIELDS)},
+                        {"key": "SQL", "hash": "stale"}],
+        }
+        mock_conn = Mock()
+        mock_conn.query.side_effect = lambda cypher, params: next(v for k, v in graph.items() if k in cypher)
+        nodes, relations = Mock(), Mock()
+
+        summary = GraphDelta(mock_conn, nodes, relations, logger=lambda msg: None).apply(
+            [course], [], [skill, changed_skill], [teaches], []
+        )
+
+        nodes.create_courses.assert_not_called()
+        nodes.create_skills.assert_called_once_with([changed_skill], build=0)
+        relations.create_course_skill_relations.assert_not_called()
+        self.assertEqual(summary["courses"], {"upserted": 0, "deleted": 1})
+        self.assertEqual(summary["skills"], {"upserted": 1, "deleted": 0})
+        deleted = mock_conn.execute.call_args[0][1]["rows"]
+        self.assertEqual(deleted, [{"key": "OLD"}])
+
+
+class TestSkillOverlapScorer(unittest.TestCase):
+    """Test sparse course-app scoring"""
+
+    def test_top_k(self):
+        """Test scores are summed weight products over shared skills, top-k per course"""
+        course_skills = [
+            {"source_id": "C1", "skill_name": "Python", "weight": 1.0},
+            {"source_id": "C1", "skill_name": "SQL", "weight": 0.5},
+            {"course_id": "C2", "skill_name": "Design", "weight": 1.0},
+        ]
+        app_skills = [
+            {"source_id": "A1", "skill_name": "Python", "weight": 0.5},
+            {"source_id": "A1", "skill_name": "SQL", "weight": 1.0},
+            {"source_id": "A2", "skill_name": "Python", "weight": 1.0},
+            {"app_id": "A3", "skill_name": "Design", "weight": 0.2},
+        ]
+        scorer = SkillOverlapScorer(course_skills, app_skills)
+
+        pairs = [(r["course_id"], r["app_id"], r["score"], r["skill_count"]) for r in scorer.top_k(2)]
+        self.assertEqual(pairs, [("C1", "A1", 1.0, 2), ("C1", "A2", 1.0, 1), ("C2", "A3", 0.2, 1)])
+
+        strict = scorer.top_k(2, min_shared_skills=2)
+        self.assertEqual([(r["course_id"], r["app_id"]) for r in strict], [("C1", "A1")])
+        self.assertEqual(strict[0]["shared_skills"], ["Python", "SQL"])
+
+
+class TestGraphStats(unittest.TestCase):
+    """Test statistics cached per build version"""
+
+    def test_get_recomputes_only_for_new_version(self):
+        """Test stored stats are reused until the build version changes"""
+        mock_conn = Mock()
+        meta = {"build": 7, "version": 100, "stats_version": 100, "data": json.dumps({"courses": 3})}
+
+        def query(cypher, params=None, write=False):
+            if cypher is STATS_QUERY:
+                return [{"courses": 4}]
+            if write:
+                return [{"version": params["version"]}]
+            return [dict(meta)]
+
+        mock_conn.query.side_effect = query
+        stats = GraphStats(mock_conn)
+
+        self.assertEqual(stats.get()["courses"], 3)
+        meta["version"] = 101
+        self.assertEqual(stats.get(), {"courses": 4, "build": 7, "version": 101})
+        self.assertEqual(stats.get()["courses"], 4)
+        computed = [c for c in mock_conn.query.call_args_list if c[0][0] is STATS_QUERY]
+        self.assertEqual(len(computed), 1)
+
+
 class TestKnowledgeGraphBuilder(unittest.TestCase):
     """Test knowledge graph builder integration"""
 
@@ -272,6 +479,25 @@ class TestKnowledgeGraphBuilder(unittest.TestCase):
         mock_relations.create_app_skill_relations.assert_called_once()
         mock_relations.compute_recommendations.assert_called_once()
 
+    @patch('knowledge_graph.src.knowledge_graph.builder.Neo4jConnection')
+    @patch('knowledge_graph.src.knowledge_graph.builder.KnowledgeGraphSchema')
+    def test_migrate(self, mock_schema_class, mock_conn_class):
+        """Test one-off adoption of an unversioned graph"""
+        from knowledge_graph.src.knowledge_graph.builder import KnowledgeGraphBuilder
+
+        mock_conn = MagicMock()
+        mock_conn_class.return_value = mock_conn
+        mock_schema = MagicMock()
+        mock_schema.init_build_meta.return_value = 0
+        mock_schema_class.return_value = mock_schema
+
+        builder = KnowledgeGraphBuilder()
+
+        self.assertEqual(builder.migrate(), 0)
+        mock_schema.init_build_meta.assert_called_once()
+        mock_schema.begin_build.assert_not_called()
+        mock_conn.close.assert_called_once()
+
 
 if __name__ == "__main__":
     # Run tests
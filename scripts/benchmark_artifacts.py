@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Size and load time of the data file formats (see src/records.py)
+
+Loads each dataset in --data-dir (whatever format it is stored in) and
+rewrites it into a temporary directory as an indent=2 JSON array, as JSON
+Lines and, for the skill mapping tables, as columnar .npz, then compares
+file size and best-of-N load time against json.load of the JSON array.
+Every format is checked to load back to the same records.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.records import artifact_path, load_records, write_records
+
+
+DATASETS = ["courses.json", "vr_apps.json", "skills.json", "course_skills.json", "app_skills.json"]
+MAPPING_TABLES = {"course_skills.json", "app_skills.json"}
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def json_load(path: str):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark data file formats")
+    parser.add_argument("--data-dir", default="data_collection/data",
+                        help="Directory containing the JSON data files")
+    parser.add_argument("--repeat", type=int, default=20, help="Loads per format (best is reported)")
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    failed = 0
+    try:
+        print(f"{'dataset':20s} {'format':7s} {'size':>10s} {'load':>9s}")
+        for name in DATASETS:
+            source = os.path.join(args.data_dir, name)
+            if not os.path.exists(artifact_path(source)):
+                continue
+            records = load_records(source)
+
+            # Baseline: the historical indent=2 JSON array
+            baseline = os.path.join(tmp, "baseline", name)
+            os.makedirs(os.path.dirname(baseline), exist_ok=True)
+            with open(baseline, "w", encoding="utf-8") as f:
+                json.dump(records, f, indent=2, ensure_ascii=False)
+            print(f"{name:20s} {'json':7s} {os.path.getsize(baseline) / 1024:8.1f}KB "
+                  f"{best_of(lambda: json_load(baseline), args.repeat):7.2f}ms")
+
+            path = os.path.join(tmp, name)
+            formats = [False, True] if name in MAPPING_TABLES else [False]
+            for columnar in formats:
+                written = write_records(path, records, columnar=columnar)
+                ok = load_records(path) == records
+                failed += not ok
+                print(f"{'':20s} {os.path.splitext(written)[1][1:]:7s} {os.path.getsize(written) / 1024:8.1f}KB "
+                      f"{best_of(lambda: load_records(path), args.repeat):7.2f}ms{'' if ok else '  ✗ records differ'}")
+    finally:
+        shutil.rmtree(tmp)
+
+    if failed:
+        print(f"✗ {failed} formats did not round-trip")
+        return 1
+    print("✓ All formats round-trip")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Benchmark the course lookup path: title scan vs full-text index
+
+Runs the two ways RAGRetriever._query_apps_by_course can find courses by
+name against the active graph build:
+
+  scan   toLower(c.title) CONTAINS toLower($query)   (label scan)
+  index  db.index.fulltext.queryNodes on title^2 + description
+
+Queries are built from course titles in the graph: the full title and a
+two-word fragment of it. For each mode it reports latency percentiles and
+how often the course the query came from is found (anywhere for the scan,
+in the top 5 for the scored index lookup).
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from knowledge_graph.src.knowledge_graph.connection import Neo4jConnection
+from knowledge_graph.src.knowledge_graph.schema import ACTIVE_BUILD, COURSE_TEXT_INDEX, fulltext_query
+
+
+SCAN_QUERY = f"""
+{ACTIVE_BUILD}
+MATCH (c:Course {{build: build}})
+WHERE toLower(c.title) CONTAINS toLower($query)
+RETURN c.course_id AS course_id
+"""
+
+INDEX_QUERY = f"""
+{ACTIVE_BUILD}
+CALL db.index.fulltext.queryNodes($index, $search) YIELD node AS c, score
+WITH c, score, build WHERE c.build = build
+RETURN c.course_id AS course_id, score
+LIMIT 20
+"""
+
+
+def make_queries(conn, samples: int, seed: int):
+    titles = conn.query(f"""
+        {ACTIVE_BUILD}
+        MATCH (c:Course {{build: build}}) WHERE c.title IS NOT NULL
+        RETURN c.course_id AS course_id, c.title AS title
+    """)
+    rng = random.Random(seed)
+    rng.shuffle(titles)
+
+    queries = []
+    for row in titles[:samples]:
+        words = row["title"].split()
+        queries.append((row["course_id"], row["title"]))
+        if len(words) > 2:
+            start = rng.randrange(len(words) - 1)
+            queries.append((row["course_id"], " ".join(words[start:start + 2])))
+    return queries, len(titles)
+
+
+def run(conn, queries, repeat, lookup):
+    latencies, hits = [], 0
+    for course_id, text in queries:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            found = lookup(text)
+            latencies.append((time.perf_counter() - start) * 1000)
+        hits += course_id in found
+    return latencies, hits
+
+
+def report(name, latencies, hits, total):
+    ordered = sorted(latencies)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    print(f"  {name:6s} mean {statistics.mean(ordered):7.2f} ms  p50 {statistics.median(ordered):7.2f} ms  "
+          f"p95 {p95:7.2f} ms  found {hits}/{total}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark course lookup: scan vs full-text index")
+    parser.add_argument("--samples", type=int, default=100, help="Course titles to sample")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per query")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    conn = Neo4jConnection()
+    try:
+        queries, n_courses = make_queries(conn, args.samples, args.seed)
+        if not queries:
+            print("✗ No courses in the active build")
+            return 1
+        print(f"{len(queries)} queries over {n_courses} courses, {args.repeat} runs each:")
+
+        scan = run(conn, queries, args.repeat,
+                   lambda text: [r["course_id"] for r in conn.query(SCAN_QUERY, {"query": text})])
+        report("scan", *scan, len(queries))
+
+        boosts = {"title": 2, "description": 1}
+        index = run(conn, queries, args.repeat, lambda text: [
+            r["course_id"] for r in conn.query(
+                INDEX_QUERY, {"index": COURSE_TEXT_INDEX, "search": fulltext_query(text, boosts)}
+            )[:5]
+        ])
+        report("index", *index, len(queries))
+    finally:
+        conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
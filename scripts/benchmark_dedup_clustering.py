@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Parity and timing report for the SemanticDeduplicator clustering backends
+
+Runs the exact average-linkage backend and the blocked kNN backend on the
+same embeddings and reports cluster counts, adjusted Rand index and
+pairwise precision/recall of kNN against the exact clustering.
+
+Inputs:
+  default      every skill name and alias in skills.json, embedded with the
+               deduplicator's sentence-transformers model
+  --synthetic  N synthetic unit vectors drawn around random "synonym"
+               centres (no model needed; useful for scaling runs)
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from skill_extraction.src.skill_extraction.clustering import (
+    agglomerative_labels,
+    knn_labels,
+    parity_report
+)
+from src.records import iter_records
+
+
+def skill_embeddings(data_dir: str, model_name: str) -> np.ndarray:
+    from sentence_transformers import SentenceTransformer
+
+    names = []
+    for skill in iter_records(os.path.join(data_dir, "skills.json")):
+        names.append(skill["name"])
+        names.extend(skill.get("aliases", []))
+    names = list(dict.fromkeys(names))
+
+    print(f"Embedding {len(names)} skill strings with {model_name}...")
+    embeddings = SentenceTransformer(model_name).encode(names, batch_size=32, show_progress_bar=True)
+    return embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+
+
+def synthetic_embeddings(n: int, dim: int = 384, seed: int = 0) -> np.ndarray:
+    """
+    Clouds of 1-8 near-synonyms around centres that are themselves grouped
+    into topics, so cloud spreads and inter-cloud distances straddle the
+    threshold the way related skill names do
+    """
+    rng = np.random.default_rng(seed)
+    sizes = []
+    while sum(sizes) < n:
+        sizes.append(int(rng.integers(1, 9)))
+
+    def unit(x):
+        return x / np.linalg.norm(x, axis=1, keepdims=True)
+
+    topics = unit(rng.standard_normal((max(1, len(sizes) // 20), dim)))
+    centres = unit(topics[rng.integers(0, len(topics), len(sizes))]
+                   + 0.4 * unit(rng.standard_normal((len(sizes), dim))))
+
+    points = np.repeat(centres, sizes, axis=0)[:n]
+    spread = rng.uniform(0.3, 0.8, (n, 1))
+    points = unit(points + spread * unit(rng.standard_normal(points.shape)))
+    return points.astype(np.float32)
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare dedup clustering backends")
+    parser.add_argument("--data-dir", default="data_collection/data",
+                        help="Directory containing skills.json (default: data_collection/data)")
+    parser.add_argument("--model", default="all-MiniLM-L6-v2", help="Embedding model")
+    parser.add_argument("--synthetic", type=int, help="Use N synthetic embeddings instead of skills.json")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Cosine distance threshold")
+    parser.add_argument("--neighbors", type=int, default=15, help="kNN graph degree")
+    parser.add_argument("--skip-exact", action="store_true",
+                        help="Only time the kNN backend (exact clustering needs O(n^2) memory)")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        embeddings = synthetic_embeddings(args.synthetic)
+    else:
+        embeddings = skill_embeddings(args.data_dir, args.model)
+    n = len(embeddings)
+
+    knn, knn_time = timed(knn_labels, embeddings, args.threshold, args.neighbors)
+    print(f"\nkNN (k={args.neighbors}):     {knn_time:8.2f}s  {len(np.unique(knn))} clusters")
+
+    if args.skip_exact:
+        return
+
+    print(f"Exact clustering of {n} strings needs ~{n * n * 8 / 1e9:.1f} GB for the distance matrix...")
+    exact, exact_time = timed(agglomerative_labels, embeddings, args.threshold)
+    print(f"agglomerative:   {exact_time:8.2f}s  {len(np.unique(exact))} clusters")
+
+    print("\nParity (kNN vs exact):")
+    for key, value in parity_report(exact, knn).items():
+        print(f"  {key:20s} {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Micro-benchmark for SkillNormalizer.normalize
+
+Compares the original per-call implementation (sort alias_map, one
+re.search per alias) against the precompiled matcher, with and without
+the LRU memo, and checks that every input normalizes identically.
+
+Input: every skill name and alias in skills.json (plus the skill names in
+the course/app mappings), i.e. what the pipeline and deduplicators feed
+through normalize().
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from skill_extraction.src.skill_extraction.normalizer import SkillNormalizer
+from src.records import artifact_path, iter_records
+
+
+def legacy_normalize(alias_map: dict, skill_name: str) -> str:
+    """Original SkillNormalizer.normalize, kept as the reference"""
+    cleaned = skill_name.lower().strip()
+    cleaned = re.sub(r'\s+', ' ', cleaned)
+
+    if cleaned in alias_map:
+        return alias_map[cleaned]
+
+    sorted_aliases = sorted(alias_map.items(), key=lambda x: len(x[0]), reverse=True)
+    for alias, standard in sorted_aliases:
+        if len(alias) < 2:
+            continue
+        if re.search(r'\b' + re.escape(alias) + r'\b', cleaned):
+            return standard
+
+    return skill_name.strip().title()
+
+
+def load_names(data_dir: str) -> list:
+    names = []
+    for skill in iter_records(os.path.join(data_dir, "skills.json")):
+        names.append(skill["name"])
+        names.extend(skill.get("aliases", []))
+
+    for filename in ("course_skills.json", "app_skills.json"):
+        path = os.path.join(data_dir, filename)
+        if os.path.exists(artifact_path(path)):
+            names.extend(m["skill_name"] for m in iter_records(path))
+    return names
+
+
+def timed(fn, names, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for name in names:
+            fn(name)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SkillNormalizer.normalize")
+    parser.add_argument("--data-dir", default="data_collection/data",
+                        help="Directory containing skills.json (default: data_collection/data)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repetitions (best is reported)")
+    args = parser.parse_args()
+
+    names = load_names(args.data_dir)
+    unique = len(set(names))
+    normalizer = SkillNormalizer()
+
+    mismatches = [n for n in set(names) if legacy_normalize(normalizer.alias_map, n) != normalizer.normalize(n)]
+    if mismatches:
+        print(f"✗ {len(mismatches)} outputs differ from the original implementation, e.g. {mismatches[:5]}")
+        sys.exit(1)
+    print(f"✓ Identical output for all {unique} distinct inputs")
+
+    legacy = timed(lambda n: legacy_normalize(normalizer.alias_map, n), names, args.repeat)
+    compiled = timed(normalizer._normalize, names, args.repeat)
+    # One cold pass: the memo only pays off for names repeated within the run
+    normalizer._normalize_cached.cache_clear()
+    memoized = timed(normalizer.normalize, names, 1)
+
+    print(f"\n{len(names)} calls ({unique} distinct names), best of {args.repeat}:")
+    print(f"  original (sort + per-alias re.search): {legacy * 1000:9.1f} ms")
+    print(f"  precompiled matcher:                   {compiled * 1000:9.1f} ms  ({legacy / compiled:5.1f}x)")
+    print(f"  precompiled + LRU memo (cold start):   {memoized * 1000:9.1f} ms  ({legacy / memoized:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
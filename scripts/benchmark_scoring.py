@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Timing report for the course -> app SkillOverlapScorer
+
+Scores every course against every VR app from course_skills.json and
+app_skills.json (or MongoDB) and checks the result against a pure-Python
+reference of the same formula.
+
+--scale N replicates the catalog N times (ids suffixed, skills shared) to
+time catalogs larger than the current one; the reference check is skipped
+above --check-max courses.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from knowledge_graph.src.knowledge_graph.scoring import SkillOverlapScorer
+from src.records import load_records
+
+
+def load_mappings(data_dir: str, mongo: bool):
+    if mongo:
+        from src.db.repositories import AppSkillsRepository, CourseSkillsRepository
+        return CourseSkillsRepository().find_all(), AppSkillsRepository().find_all()
+
+    return (
+        load_records(os.path.join(data_dir, "course_skills.json")),
+        load_records(os.path.join(data_dir, "app_skills.json"))
+    )
+
+
+def replicate(mappings, id_field: str, scale: int):
+    if scale <= 1:
+        return mappings
+    return [
+        dict(m, source_id=f"{m.get('source_id') or m.get(id_field)}#{i}")
+        for i in range(scale) for m in mappings
+    ]
+
+
+def reference_top_k(course_skills, app_skills, k: int, min_shared: int):
+    """Per-pair Python loop over the same formula (score, count, app id order)"""
+    courses, apps = {}, {}
+    for m in course_skills:
+        courses.setdefault(m.get("source_id") or m.get("course_id"), {})[m["skill_name"]] = m.get("weight") or 0.0
+    for m in app_skills:
+        apps.setdefault(m.get("source_id") or m.get("app_id"), {})[m["skill_name"]] = m.get("weight") or 0.0
+
+    result = set()
+    for course, taught in courses.items():
+        ranked = []
+        for app, developed in apps.items():
+            shared = taught.keys() & developed.keys()
+            if len(shared) >= min_shared:
+                score = sum(taught[s] * developed[s] for s in shared)
+                ranked.append((-round(score, 9), -len(shared), app))
+        for score, count, app in sorted(ranked)[:k]:
+            result.add((course, app, -score, -count))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark course-app skill overlap scoring")
+    parser.add_argument("--data-dir", default="data_collection/data",
+                        help="Directory containing course_skills.json and app_skills.json")
+    parser.add_argument("--mongo", action="store_true", help="Load mappings from MongoDB instead")
+    parser.add_argument("--scale", type=int, default=1, help="Replicate courses and apps N times")
+    parser.add_argument("--top-k", type=int, default=20, help="Apps per course")
+    parser.add_argument("--min-shared-skills", type=int, default=1)
+    parser.add_argument("--check-max", type=int, default=2000,
+                        help="Skip the reference check above this many courses")
+    args = parser.parse_args()
+
+    course_skills, app_skills = load_mappings(args.data_dir, args.mongo)
+    course_skills = replicate(course_skills, "course_id", args.scale)
+    app_skills = replicate(app_skills, "app_id", args.scale)
+
+    start = time.perf_counter()
+    scorer = SkillOverlapScorer(course_skills, app_skills)
+    built = time.perf_counter() - start
+
+    start = time.perf_counter()
+    top = scorer.top_k(args.top_k, args.min_shared_skills)
+    scored = time.perf_counter() - start
+
+    print(f"{len(scorer.course_ids)} courses x {len(scorer.app_ids)} apps over {len(scorer.skills)} skills")
+    print(f"  build matrices: {built * 1000:9.1f} ms")
+    print(f"  top-{args.top_k} scoring:  {scored * 1000:9.1f} ms  ({len(top)} recommendations)")
+
+    if len(scorer.course_ids) > args.check_max:
+        return 0
+
+    start = time.perf_counter()
+    expected = reference_top_k(course_skills, app_skills, args.top_k, args.min_shared_skills)
+    reference = time.perf_counter() - start
+    # Build + scoring against the reference, which needs no setup
+    print(f"  python reference: {reference * 1000:7.1f} ms  ({reference / (built + scored):5.1f}x build + scoring)")
+
+    got = {(r["course_id"], r["app_id"], round(r["score"], 9), r["skill_count"]) for r in top}
+    if got != expected:
+        print(f"✗ {len(got ^ expected)} recommendations differ from the reference")
+        return 1
+    print(f"✓ Identical top-{args.top_k} recommendations")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
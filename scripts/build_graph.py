@@ -25,7 +25,12 @@ def main():
     parser.add_argument(
         "--clear",
         action="store_true",
-        help="Clear existing data before building"
+        help="Force a full build (written as a new build, then cut over atomically)"
+    )
+    parser.add_argument(
+        "--delta",
+        action="store_true",
+        help="Only write nodes and relationships that changed since the last build"
     )
     parser.add_argument(
         "--min-shared-skills",
@@ -33,6 +38,16 @@ def main():
         default=1,
         help="Minimum shared skills for recommendations (default: 1)"
     )
+    parser.add_argument(
+        "--rollback",
+        action="store_true",
+        help="Point readers back at the previous build instead of building"
+    )
+    parser.add_argument(
+        "--migrate",
+        action="store_true",
+        help="Adopt a graph built before builds were versioned (run once after deploying)"
+    )
     parser.add_argument(
         "--test",
         action="store_true",
@@ -49,11 +64,20 @@ def main():
             success = builder.test_build(args.data_dir)
             return 0 if success else 1
 
+        if args.rollback:
+            builder.rollback()
+            return 0
+
+        if args.migrate:
+            builder.migrate()
+            return 0
+
         # Build the knowledge graph
         builder.build(
             data_dir=args.data_dir,
             clear=args.clear,
-            min_shared_skills=args.min_shared_skills
+            min_shared_skills=args.min_shared_skills,
+            delta=args.delta
         )
 
         return 0
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""Measure per-worker memory of the gunicorn server.
+
+Reads /proc/<pid>/smaps_rollup (Linux 4.14+) for the gunicorn master and
+each of its workers and reports RSS, PSS and USS (Private_Clean +
+Private_Dirty). USS is what one worker costs on its own; PSS splits shared
+pages, such as the embedding model preloaded by the master, across every
+process mapping them.
+
+Usage:
+    # A running server (compare GUNICORN_PRELOAD_MODEL=true / false)
+    python scripts/measure_worker_memory.py --pid <gunicorn master pid>
+
+    # Without gunicorn: fork workers that each load the embedding model
+    python scripts/measure_worker_memory.py --simulate --workers 4
+    python scripts/measure_worker_memory.py --simulate --workers 4 --no-preload
+"""
+
+import argparse
+import gc
+import os
+import signal
+import sys
+from typing import Dict, List
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+
+def read_rollup(pid: int) -> Dict[str, int]:
+    """
+    Read a process's smaps_rollup counters.
+
+    Args:
+        pid: Process id
+
+    Returns:
+        Counter name -> value in kB
+    """
+    counters = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                counters[parts[0].rstrip(":")] = int(parts[1])
+    return counters
+
+
+def child_pids(pid: int) -> List[int]:
+    """Return the direct children of pid (gunicorn workers of a master)."""
+    children = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/status") as f:
+                for line in f:
+                    if line.startswith("PPid:"):
+                        if int(line.split()[1]) == pid:
+                            children.append(int(entry))
+                        break
+        except OSError:
+            continue
+    return sorted(children)
+
+
+def report(master: int, workers: List[int]):
+    """Print RSS/PSS/USS for the master and its workers."""
+    print(f"{'process':<16}{'pid':>8}{'RSS MB':>10}{'PSS MB':>10}{'USS MB':>10}")
+
+    totals = {"Rss": 0, "Pss": 0, "Uss": 0}
+    for label, pid in [("master", master)] + [(f"worker {i}", p) for i, p in enumerate(workers, 1)]:
+        try:
+            c = read_rollup(pid)
+        except OSError as e:
+            print(f"⚠ Cannot read /proc/{pid}/smaps_rollup: {e}")
+            continue
+        uss = c.get("Private_Clean", 0) + c.get("Private_Dirty", 0)
+        print(f"{label:<16}{pid:>8}{c.get('Rss', 0) / 1024:>10.1f}"
+              f"{c.get('Pss', 0) / 1024:>10.1f}{uss / 1024:>10.1f}")
+        totals["Rss"] += c.get("Rss", 0)
+        totals["Pss"] += c.get("Pss", 0)
+        totals["Uss"] += uss
+
+    print(f"{'total':<16}{'':>8}{totals['Rss'] / 1024:>10.1f}"
+          f"{totals['Pss'] / 1024:>10.1f}{totals['Uss'] / 1024:>10.1f}")
+    print("\nPSS total is the memory the server really uses; "
+          "per-worker USS is what each extra worker adds.")
+
+
+def simulate(n_workers: int, preload: bool, model_name: str):
+    """
+    Fork workers the way gunicorn does and measure them once warmed up.
+
+    Args:
+        n_workers: Number of worker processes to fork
+        preload: Load the model in the parent before forking (GUNICORN_PRELOAD_MODEL)
+        model_name: sentence-transformers model to load
+    """
+    from vector_store.src.vector_store.embeddings import LocalEmbedding, preload_local_model
+
+    if preload:
+        preload_local_model(model_name)
+        # Same as gunicorn_config.on_starting
+        gc.freeze()
+        print(f"✓ Preloaded {model_name} in parent {os.getpid()}")
+
+    workers, pipes = [], []
+    for _ in range(n_workers):
+        r, w = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(r)
+            try:
+                LocalEmbedding(model_name).encode(["warm up the embedding model"])
+                os.write(w, b"1")
+                signal.pause()
+            finally:
+                os._exit(0)
+        os.close(w)
+        workers.append(pid)
+        pipes.append(r)
+
+    ready = [os.read(r, 1) == b"1" for r in pipes]
+    if not all(ready):
+        print(f"⚠ {ready.count(False)} worker(s) failed to load the model")
+
+    print(f"\nSimulated {n_workers} workers (preload {'on' if preload else 'off'})\n")
+    try:
+        report(os.getpid(), workers)
+    finally:
+        for pid, r in zip(workers, pipes):
+            os.close(r)
+            os.kill(pid, signal.SIGTERM)
+            os.waitpid(pid, 0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure gunicorn worker memory (PSS/USS)")
+    parser.add_argument("--pid", type=int, help="PID of a running gunicorn master")
+    parser.add_argument("--simulate", action="store_true",
+                        help="Fork workers locally instead of inspecting a running server")
+    parser.add_argument("--workers", type=int, default=4, help="Workers to fork with --simulate")
+    parser.add_argument("--no-preload", action="store_true",
+                        help="With --simulate, let every worker load its own model")
+    parser.add_argument("--model", default=None, help="Embedding model name (default: all-MiniLM-L6-v2)")
+    args = parser.parse_args()
+
+    if not os.path.exists("/proc/self/smaps_rollup"):
+        print("✗ /proc/<pid>/smaps_rollup is not available (Linux 4.14+ required)")
+        return 1
+
+    if args.simulate:
+        from vector_store.src.vector_store.embeddings import DEFAULT_LOCAL_MODEL
+        simulate(args.workers, not args.no_preload, args.model or DEFAULT_LOCAL_MODEL)
+        return 0
+
+    if args.pid is None:
+        parser.error("--pid is required unless --simulate is given")
+
+    workers = child_pids(args.pid)
+    if not workers:
+        print(f"⚠ No worker processes found under PID {args.pid}")
+    report(args.pid, workers)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,7 +2,6 @@
 Migration script: JSON files + SQLite -> MongoDB
 Run once to migrate all existing data.
 """
-import json
 import sqlite3
 from pathlib import Path
 import sys
@@ -25,21 +24,23 @@ from src.db.repositories import (
     CourseSkillsRepository,
     AppSkillsRepository
 )
+from src.records import artifact_path, iter_chunks
 
 DATA_DIR = Path(project_root) / "data_collection" / "data"
 SQLITE_DB = Path(project_root) / "vr_recommender.db"
 
+def upsert_file(repo, json_path: Path) -> int:
+    """Stream a data file into a repository in bounded chunks"""
+    return sum(repo.bulk_upsert(chunk) for chunk in iter_chunks(str(json_path)))
+
 def migrate_vr_apps():
     print("Migrating VR Apps...")
     repo = VRAppsRepository()
     json_path = DATA_DIR / "vr_apps.json"
-    if json_path.exists():
+    if os.path.exists(artifact_path(str(json_path))):
         try:
-            with open(json_path) as f:
-                apps = json.load(f)
-            if isinstance(apps, list):
-                count = repo.bulk_upsert(apps)
-                print(f"  ✓ Migrated {count} VR apps")
+            count = upsert_file(repo, json_path)
+            print(f"  ✓ Migrated {count} VR apps")
         except Exception as e:
             print(f"  ❌ Error: {e}")
     else:
@@ -49,13 +50,10 @@ def migrate_courses():
     print("Migrating Courses...")
     repo = CoursesRepository()
     json_path = DATA_DIR / "courses.json"
-    if json_path.exists():
+    if os.path.exists(artifact_path(str(json_path))):
         try:
-            with open(json_path) as f:
-                courses = json.load(f)
-            if isinstance(courses, list):
-                count = repo.bulk_upsert(courses)
-                print(f"  ✓ Migrated {count} courses")
+            count = upsert_file(repo, json_path)
+            print(f"  ✓ Migrated {count} courses")
         except Exception as e:
             print(f"  ❌ Error: {e}")
     else:
@@ -65,13 +63,10 @@ def migrate_skills():
     print("Migrating Skills...")
     repo = SkillsRepository()
     json_path = DATA_DIR / "skills.json"
-    if json_path.exists():
+    if os.path.exists(artifact_path(str(json_path))):
         try:
-            with open(json_path) as f:
-                skills = json.load(f)
-            if isinstance(skills, list):
-                count = repo.bulk_upsert(skills)
-                print(f"  ✓ Migrated {count} skills")
+            count = upsert_file(repo, json_path)
+            print(f"  ✓ Migrated {count} skills")
         except Exception as e:
             print(f"  ❌ Error: {e}")
     else:
@@ -83,13 +78,10 @@ def migrate_relations():
     # Course-Skills
     repo_cs = CourseSkillsRepository()
     json_path = DATA_DIR / "course_skills.json"
-    if json_path.exists():
+    if os.path.exists(artifact_path(str(json_path))):
         try:
-            with open(json_path) as f:
-                mappings = json.load(f)
-            if isinstance(mappings, list):
-                count = repo_cs.bulk_upsert(mappings)
-                print(f"  ✓ Migrated {count} course-skill mappings")
+            count = upsert_file(repo_cs, json_path)
+            print(f"  ✓ Migrated {count} course-skill mappings")
         except Exception as e:
             print(f"  ❌ Error migrating course_skills: {e}")
     else:
@@ -98,13 +90,10 @@ def migrate_relations():
     # App-Skills
     repo_as = AppSkillsRepository()
     json_path = DATA_DIR / "app_skills.json"
-    if json_path.exists():
+    if os.path.exists(artifact_path(str(json_path))):
         try:
-            with open(json_path) as f:
-                mappings = json.load(f)
-            if isinstance(mappings, list):
-                count = repo_as.bulk_upsert(mappings)
-                print(f"  ✓ Migrated {count} app-skill mappings")
+            count = upsert_file(repo_as, json_path)
+            print(f"  ✓ Migrated {count} app-skill mappings")
         except Exception as e:
             print(f"  ❌ Error migrating app_skills: {e}")
     else:
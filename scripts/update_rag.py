@@ -84,7 +84,19 @@ def main():
         except Exception as e:
             print(f"❌ Skill extraction failed: {e}")
 
-    # 2. Rebuild knowledge graph
+    # 2. Sync vector index (new, changed and removed skills only). Runs
+    # before the graph cutover, so readers picking up the new graph build
+    # already find the new skill vectors.
+    if args.rebuild_embeddings:
+        print("\n📊 Syncing vector index...")
+        try:
+            indexer = VectorIndexer()
+            indexer.build_index(f"{args.data_dir}/skills.json")
+            print("✓ Vector index synced")
+        except Exception as e:
+            print(f"❌ Vector index sync failed: {e}")
+
+    # 3. Rebuild knowledge graph
     if args.rebuild_graph:
         print("\n🕸️ Rebuilding knowledge graph...")
         try:
@@ -94,16 +106,6 @@ def main():
         except Exception as e:
             print(f"❌ Graph rebuild failed: {e}")
 
-    # 3. Rebuild vector index
-    if args.rebuild_embeddings:
-        print("\n📊 Rebuilding vector index...")
-        try:
-            indexer = VectorIndexer()
-            indexer.build_index(f"{args.data_dir}/skills.json")
-            print("✓ Vector index rebuilt")
-        except Exception as e:
-            print(f"❌ Vector index rebuild failed: {e}")
-
     print("\n✅ RAG system update complete!")
     print("=" * 70 + "\n")
 
@@ -0,0 +1,84 @@
+"""Persistent cache of LLM skill extractions keyed by content hash"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "..", "data", "extraction_cache.db"
+)
+
+
+class ExtractionCache:
+    """
+    SQLite-backed map from hash(model, prompt version, source type, text)
+    to the extracted skill list.
+
+    A record whose description is unchanged hashes to the same key on the
+    next run, so only new or edited records reach the LLM. Changing the
+    model or bumping the prompt version naturally misses every entry.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        """
+        Args:
+            path: SQLite file (created if missing)
+        """
+        self.path = os.path.abspath(path)
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS extractions (key TEXT PRIMARY KEY, skills TEXT)"
+        )
+        self._db.commit()
+
+    @staticmethod
+    def make_key(model: str, prompt_version: str, source_type: str, text: str) -> str:
+        """Content hash identifying one extraction"""
+        payload = "\x00".join([model, prompt_version, source_type, text])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[List[Dict]]:
+        """Return cached skills for key, or None on a miss"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT skills FROM extractions WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, skills: List[Dict]):
+        """Store the skills extracted for key"""
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO extractions (key, skills) VALUES (?, ?)",
+                (key, json.dumps(skills, ensure_ascii=False))
+            )
+            self._db.commit()
+
+    def clear(self):
+        """Drop all cached extractions"""
+        with self._lock:
+            self._db.execute("DELETE FROM extractions")
+            self._db.commit()
+
+    def stats(self) -> Dict:
+        """Hit/miss counters for this run and the number of stored entries"""
+        with self._lock:
+            size = self._db.execute("SELECT COUNT(*) FROM extractions").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "entries": size}
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,183 @@
+"""
+Clustering backends for semantic skill deduplication
+
+- agglomerative: scikit-learn average-linkage clustering over all pairs.
+  Exact, but O(n^2) memory and O(n^2)-O(n^3) time.
+- knn: blocked clustering for large n. A kNN graph keeps only neighbour
+  pairs within the cosine distance threshold; its connected components
+  (union-find) are independent blocks, and each block is clustered with
+  the same average-linkage algorithm. Average linkage only merges
+  clusters that share at least one pair within the threshold, so every
+  exact cluster lies inside one component and the result matches the
+  exact algorithm up to neighbours pruned by the kNN cut.
+
+  Single-linkage chaining can still join unrelated strings into one huge
+  component. Components above max_block are split by re-running the kNN
+  components inside them at half the threshold, up to MAX_SPLIT_DEPTH
+  times; members of a component that is still too large stay singletons.
+  Merging nothing is the safe failure mode for deduplication.
+"""
+
+from typing import Dict, Iterator
+
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+from sklearn.cluster import AgglomerativeClustering
+from sklearn.metrics import adjusted_rand_score
+from sklearn.metrics.cluster import pair_confusion_matrix
+
+
+# Times an oversized kNN component is re-split at half the threshold
+MAX_SPLIT_DEPTH = 8
+
+
+def agglomerative_labels(embeddings: np.ndarray, distance_threshold: float) -> np.ndarray:
+    """
+    Average-linkage clustering on cosine distance
+
+    Args:
+        embeddings: (n, dim) unit-length embeddings
+        distance_threshold: Cosine distance cut-off
+
+    Returns:
+        Cluster label per row
+    """
+    if len(embeddings) < 2:
+        return np.zeros(len(embeddings), dtype=np.int64)
+
+    clustering = AgglomerativeClustering(
+        n_clusters=None,
+        metric='cosine',
+        linkage='average',
+        distance_threshold=distance_threshold
+    )
+    return clustering.fit_predict(embeddings)
+
+
+def knn_components(
+    embeddings: np.ndarray,
+    distance_threshold: float,
+    n_neighbors: int = 15,
+    block_size: int = 2048
+) -> np.ndarray:
+    """
+    Connected components of the kNN graph restricted to cosine distance <= threshold
+
+    Similarities are computed block_size rows at a time, so memory is
+    O(block_size * n) rather than O(n^2).
+
+    Returns:
+        Component label per row
+    """
+    n = len(embeddings)
+    min_similarity = 1.0 - distance_threshold
+    k = min(n_neighbors + 1, n)  # +1: every row is its own nearest neighbour
+
+    sources, targets = [], []
+    for start in range(0, n, block_size):
+        sims = embeddings[start:start + block_size] @ embeddings.T
+        neighbours = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+        neighbour_sims = np.take_along_axis(sims, neighbours, axis=1)
+
+        rows, cols = np.nonzero(neighbour_sims >= min_similarity)
+        sources.append(rows + start)
+        targets.append(neighbours[rows, cols])
+
+    sources = np.concatenate(sources)
+    targets = np.concatenate(targets)
+    graph = coo_matrix((np.ones(len(sources), dtype=np.int8), (sources, targets)), shape=(n, n))
+    _, labels = connected_components(graph, directed=False)
+    return labels
+
+
+def _split_components(labels: np.ndarray) -> Iterator[np.ndarray]:
+    """Row indices of each component, in label order"""
+    order = np.argsort(labels, kind="stable")
+    bounds = np.flatnonzero(np.diff(labels[order])) + 1
+    return iter(np.split(order, bounds))
+
+
+def knn_blocks(
+    embeddings: np.ndarray,
+    distance_threshold: float,
+    n_neighbors: int = 15,
+    max_block: int = 5000
+) -> Iterator[np.ndarray]:
+    """
+    kNN-graph components of at most max_block rows
+
+    Oversized components are re-split with a tighter threshold; rows of a
+    component still above max_block after MAX_SPLIT_DEPTH splits come back
+    as single-row blocks.
+
+    Returns:
+        Iterator over row index arrays, one per block
+    """
+    pending = [(np.arange(len(embeddings)), distance_threshold, 0)]
+    while pending:
+        rows, threshold, depth = pending.pop()
+        components = knn_components(embeddings[rows], threshold, n_neighbors)
+        for members in _split_components(components):
+            members = rows[members]
+            if len(members) <= max_block:
+                yield members
+            elif depth < MAX_SPLIT_DEPTH:
+                pending.append((members, threshold / 2, depth + 1))
+            else:
+                print(f"   ⚠ kNN component of {len(members)} strings still larger than "
+                      f"{max_block} after {depth} splits; kept as singletons")
+                yield from members.reshape(-1, 1)
+
+
+def knn_labels(
+    embeddings: np.ndarray,
+    distance_threshold: float,
+    n_neighbors: int = 15,
+    max_block: int = 5000
+) -> np.ndarray:
+    """
+    Blocked clustering: average linkage inside each kNN-graph component
+
+    Components larger than max_block are split (see knn_blocks) to bound
+    memory; pairs across the split are never merged.
+
+    Returns:
+        Cluster label per row
+    """
+    labels = np.empty(len(embeddings), dtype=np.int64)
+
+    next_label = 0
+    for members in knn_blocks(embeddings, distance_threshold, n_neighbors, max_block):
+        if len(members) == 1:
+            labels[members] = next_label
+            next_label += 1
+            continue
+
+        block_labels = agglomerative_labels(embeddings[members], distance_threshold)
+        labels[members] = block_labels + next_label
+        next_label += int(block_labels.max()) + 1
+
+    return labels
+
+
+def parity_report(reference: np.ndarray, candidate: np.ndarray) -> Dict[str, float]:
+    """
+    Compare a clustering against the reference (exact) clustering
+
+    Pairwise precision: share of pairs merged by candidate that the reference
+    also merges. Pairwise recall: share of reference-merged pairs that the
+    candidate merges too.
+
+    Returns:
+        Dictionary with cluster counts, adjusted Rand index and pairwise
+        precision/recall
+    """
+    (_, fp), (fn, tp) = pair_confusion_matrix(reference, candidate) // 2
+    return {
+        "reference_clusters": int(len(np.unique(reference))),
+        "candidate_clusters": int(len(np.unique(candidate))),
+        "adjusted_rand": round(float(adjusted_rand_score(reference, candidate)), 4),
+        "pair_precision": round(float(tp / (tp + fp)) if tp + fp else 1.0, 4),
+        "pair_recall": round(float(tp / (tp + fn)) if tp + fn else 1.0, 4),
+    }
@@ -2,25 +2,246 @@
 
 import json
 import os
-from typing import List, Dict
-from openai import OpenAI
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, List, Dict, Optional, Tuple
+from openai import OpenAI, APIConnectionError, APIStatusError, APITimeoutError
+from .cache import DEFAULT_CACHE_PATH, ExtractionCache
+
+
+# Bump whenever the extraction prompt or parsing changes, so cached
+# extractions made with the old prompt are no longer reused
+PROMPT_VERSION = "1"
+
+# Descriptions longer than this are truncated before extraction
+MAX_TEXT_CHARS = 2000
+
+# Per-record output budget; batched requests scale it by the record count
+TOKENS_PER_RECORD = 512
+MAX_BATCH_TOKENS = 8192
+
+
+def _truncate(text: str) -> str:
+    """Truncate very long text to avoid token limits"""
+    if len(text) > MAX_TEXT_CHARS:
+        return text[:MAX_TEXT_CHARS] + "..."
+    return text
+
+
+class RateLimiter:
+    """Spaces calls evenly so that at most `rate` start per second (thread-safe)"""
+
+    def __init__(self, rate: float):
+        """
+        Args:
+            rate: Maximum calls per second; 0 or less disables limiting
+        """
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Block until the caller may start a call"""
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def _is_retryable(error: Exception) -> bool:
+    """429s, 5xx responses, timeouts and dropped connections are worth retrying"""
+    if isinstance(error, (APIConnectionError, APITimeoutError)):
+        return True
+    if isinstance(error, APIStatusError):
+        return error.status_code == 429 or error.status_code >= 500
+    return False
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Seconds requested by the server's Retry-After header, if any"""
+    response = getattr(error, "response", None)
+    try:
+        return float(response.headers.get("retry-after"))
+    except (AttributeError, TypeError, ValueError):
+        return None
 
 
 class SkillExtractor:
     """Extracts skills from text using OpenRouter LLM"""
 
-    def __init__(self):
-        """Initialize OpenRouter client with API key"""
+    def __init__(
+        self,
+        max_workers: int = None,
+        rate_limit: float = None,
+        max_retries: int = None,
+        cache_path: str = None,
+        batch_size: int = None,
+        batch_chars: int = None
+    ):
+        """
+        Initialize OpenRouter client with API key
+
+        Args:
+            max_workers: Concurrent LLM calls in extract_many
+                (default: EXTRACTION_WORKERS env var or 8)
+            rate_limit: Maximum LLM requests per second, 0 for unlimited
+                (default: EXTRACTION_RATE_LIMIT env var or 5)
+            max_retries: Retries for 429/5xx/connection errors
+                (default: EXTRACTION_MAX_RETRIES env var or 4)
+            cache_path: SQLite extraction cache, "off" to disable
+                (default: EXTRACTION_CACHE_PATH env var or skill_extraction/data/extraction_cache.db)
+            batch_size: Records packed into one LLM request by extract_many, 1 disables batching
+                (default: EXTRACTION_BATCH_SIZE env var or 10)
+            batch_chars: Input character budget per batched request
+                (default: EXTRACTION_BATCH_CHARS env var or 8000)
+        """
         api_key = os.getenv(
             "OPENROUTER_API_KEY",
             "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"
         )
+        # Retries are handled in _complete so they go through the rate limiter
         self.client = OpenAI(
             api_key=api_key,
-            base_url="https://openrouter.ai/api/v1"
+            base_url="https://openrouter.ai/api/v1",
+            max_retries=0
         )
         self.model = os.getenv("OPENROUTER_MODEL", "qwen/qwen3-next-80b-a3b-instruct")
 
+        self.max_workers = max_workers or int(os.getenv("EXTRACTION_WORKERS", "8"))
+        if rate_limit is None:
+            rate_limit = float(os.getenv("EXTRACTION_RATE_LIMIT", "5"))
+        self.rate_limiter = RateLimiter(rate_limit)
+        if max_retries is None:
+            max_retries = int(os.getenv("EXTRACTION_MAX_RETRIES", "4"))
+        self.max_retries = max_retries
+        self.backoff_base = 1.0
+        self.backoff_max = 30.0
+
+        self.batch_size = max(1, batch_size or int(os.getenv("EXTRACTION_BATCH_SIZE", "10")))
+        self.batch_chars = batch_chars or int(os.getenv("EXTRACTION_BATCH_CHARS", "8000"))
+
+        cache_path = cache_path or os.getenv("EXTRACTION_CACHE_PATH") or DEFAULT_CACHE_PATH
+        self.cache = None if cache_path.lower() in ("off", "none", "0") else ExtractionCache(cache_path)
+
+    def _complete(self, messages: List[Dict], max_tokens: int) -> str:
+        """
+        Run a chat completion, rate limited and retried with exponential backoff
+
+        Returns:
+            Response message content
+        """
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.wait()
+            try:
+                response = self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    temperature=0,
+                    max_tokens=max_tokens
+                )
+                return response.choices[0].message.content
+            except Exception as e:
+                if attempt >= self.max_retries or not _is_retryable(e):
+                    raise
+                delay = _retry_after(e)
+                if delay is None:
+                    delay = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+                    delay *= random.uniform(0.5, 1.0)
+                print(f"[WARN] LLM request failed ({e}); retry {attempt + 1}/{self.max_retries} in {delay:.1f}s")
+                time.sleep(delay)
+
+    def extract_many(
+        self,
+        texts: List[str],
+        source_type: str = "course",
+        on_progress: Callable[[int, int], None] = None
+    ) -> List[List[Dict]]:
+        """
+        Extract skills from many texts concurrently
+
+        Cached records are answered first; the rest are packed into batched
+        requests (see _pack) that run on a thread pool.
+
+        Args:
+            texts: Texts to extract skills from
+            source_type: "course" or "app"
+            on_progress: Called as on_progress(done, total) after each text completes
+
+        Returns:
+            One skill list per input text, in input order
+        """
+        results: List[List[Dict]] = [[] for _ in texts]
+        total = len(texts)
+        done = 0
+
+        pending = []
+        for idx, text in enumerate(texts):
+            text = _truncate(text)
+            cached = self._cache_get(text, source_type)
+            if cached is not None:
+                results[idx] = cached
+                done += 1
+                if on_progress:
+                    on_progress(done, total)
+            else:
+                pending.append((idx, text))
+
+        if not pending:
+            return results
+
+        jobs = self._pack(pending)
+        workers = max(1, min(self.max_workers, len(jobs)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="skill-extract") as executor:
+            futures = {
+                executor.submit(self._extract_batch, [text for _, text in job], source_type): job
+                for job in jobs
+            }
+            for future in as_completed(futures):
+                job = futures[future]
+                for (idx, _), skills in zip(job, future.result()):
+                    results[idx] = skills
+                    done += 1
+                    if on_progress:
+                        on_progress(done, total)
+
+        return results
+
+    def _pack(self, records: List[Tuple[int, str]]) -> List[List[Tuple[int, str]]]:
+        """
+        Greedily group records (in order) into batches of at most batch_size
+        records and batch_chars input characters
+
+        Texts are already truncated to MAX_TEXT_CHARS, so a single record
+        always fits on its own.
+        """
+        batches, current, chars = [], [], 0
+        for record in records:
+            size = len(record[1])
+            if current and (len(current) >= self.batch_size or chars + size > self.batch_chars):
+                batches.append(current)
+                current, chars = [], 0
+            current.append(record)
+            chars += size
+        if current:
+            batches.append(current)
+        return batches
+
+    def _cache_get(self, text: str, source_type: str) -> Optional[List[Dict]]:
+        if self.cache is None:
+            return None
+        return self.cache.get(ExtractionCache.make_key(self.model, PROMPT_VERSION, source_type, text))
+
+    def _cache_put(self, text: str, source_type: str, skills: List[Dict]):
+        # Empty results are usually unparseable responses; retry them next run
+        if self.cache is not None and skills:
+            self.cache.put(ExtractionCache.make_key(self.model, PROMPT_VERSION, source_type, text), skills)
+
     def extract_from_text(self, text: str, source_type: str = "course") -> List[Dict]:
         """
         Extract skills from text using LLM
@@ -32,10 +253,15 @@ class SkillExtractor:
         Returns:
             List[dict]: [{"name": "Python", "category": "technical", "weight": 0.9}, ...]
         """
-        # Truncate very long text to avoid token limits
-        if len(text) > 2000:
-            text = text[:2000] + "..."
+        text = _truncate(text)
+
+        cached = self._cache_get(text, source_type)
+        if cached is not None:
+            return cached
+        return self._extract_single(text, source_type)
 
+    def _extract_single(self, text: str, source_type: str) -> List[Dict]:
+        """Extract skills for one (truncated, uncached) text and cache the result"""
         prompt = f"""从以下{source_type}描述中提取关键技能:
 
 {text}
@@ -54,21 +280,127 @@ class SkillExtractor:
 ]}}"""
 
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
+            content = self._complete(
                 messages=[
                     {"role": "system", "content": "你是一个技能提取专家。只返回 JSON，不要其他内容。"},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0,
-                max_tokens=512
+                max_tokens=TOKENS_PER_RECORD
             )
 
-            return self._parse_response(response.choices[0].message.content)
+            skills = self._parse_response(content)
         except Exception as e:
             print(f"[ERROR] LLM extraction failed: {e}")
             return []
 
+        self._cache_put(text, source_type, skills)
+        return skills
+
+    def _extract_batch(self, texts: List[str], source_type: str) -> List[List[Dict]]:
+        """
+        Extract skills for several (truncated, uncached) texts in one request
+
+        Records are sent as [r1], [r2], ... and the response is keyed by
+        those ids. If the request fails, or a record is missing from the
+        response, the affected records are retried one at a time.
+
+        Returns:
+            One skill list per input text, in input order
+        """
+        if len(texts) == 1:
+            return [self._extract_single(texts[0], source_type)]
+
+        ids = [f"r{i}" for i in range(1, len(texts) + 1)]
+        records = "\n\n".join(f"[{rid}] {text}" for rid, text in zip(ids, texts))
+
+        prompt = f"""从以下 {len(texts)} 条{source_type}描述中分别提取关键技能。每条记录以 [id] 开头:
+
+{records}
+
+要求:
+1. 提取技术技能 (如 Python, SQL, Machine Learning)
+2. 提取软技能 (如 Communication, Leadership)
+3. 提取领域知识 (如 Public Policy, Finance)
+4. 为每个技能评估重要程度 (0.0-1.0)
+5. 每条记录单独返回, 以记录 id 为键, 不要遗漏任何记录
+6. 返回 JSON 格式
+
+返回格式:
+{{"results": {{
+    "r1": {{"skills": [{{"name": "Python", "category": "technical", "weight": 0.9}}]}},
+    "r2": {{"skills": [{{"name": "Public Policy", "category": "domain", "weight": 0.8}}]}}
+}}}}"""
+
+        keyed = {}
+        try:
+            content = self._complete(
+                messages=[
+                    {"role": "system", "content": "你是一个技能提取专家。只返回 JSON，不要其他内容。"},
+                    {"role": "user", "content": prompt}
+                ],
+                max_tokens=min(MAX_BATCH_TOKENS, TOKENS_PER_RECORD * len(texts))
+            )
+            keyed = self._parse_batch_response(content)
+        except Exception as e:
+            print(f"[WARN] Batched extraction of {len(texts)} records failed ({e}); retrying individually")
+
+        results = []
+        for rid, text in zip(ids, texts):
+            skills = keyed.get(rid)
+            if skills:
+                self._cache_put(text, source_type, skills)
+            else:
+                skills = self._extract_single(text, source_type)
+            results.append(skills)
+        return results
+
+    @staticmethod
+    def _strip_code_fence(content: str) -> str:
+        """Remove markdown code blocks if present"""
+        content = content.strip()
+        if content.startswith("```"):
+            content = content.split("```")[1]
+            if content.lower().startswith("json"):
+                content = content[4:]
+        return content
+
+    @staticmethod
+    def _clean_skills(skills) -> List[Dict]:
+        """Validate and clean skills"""
+        valid_skills = []
+        for skill in skills if isinstance(skills, list) else []:
+            if isinstance(skill, dict) and "name" in skill:
+                valid_skills.append({
+                    "name": str(skill["name"]).strip(),
+                    "category": skill.get("category", "technical"),
+                    "weight": float(skill.get("weight", 0.5))
+                })
+        return valid_skills
+
+    def _parse_batch_response(self, content: str) -> Dict[str, List[Dict]]:
+        """
+        Parse a keyed JSON response from a batched request
+
+        Returns:
+            Record id -> list of skill dictionaries (records that could not be
+            parsed are left out so the caller retries them)
+        """
+        try:
+            data = json.loads(self._strip_code_fence(content))
+        except Exception as e:
+            print(f"Error parsing batched LLM response: {e}")
+            return {}
+
+        entries = data.get("results", data) if isinstance(data, dict) else {}
+        parsed = {}
+        for rid, entry in entries.items() if isinstance(entries, dict) else []:
+            try:
+                skills = entry.get("skills", []) if isinstance(entry, dict) else entry
+                parsed[str(rid).strip("[] ")] = self._clean_skills(skills)
+            except Exception:
+                continue
+        return parsed
+
     def _parse_response(self, content: str) -> List[Dict]:
         """
         Parse JSON response from LLM
@@ -81,29 +413,11 @@ class SkillExtractor:
         """
         try:
             # Clean and extract JSON
-            content = content.strip()
-
-            # Remove markdown code blocks if present
-            if content.startswith("```"):
-                content = content.split("```")[1]
-                if content.lower().startswith("json"):
-                    content = content[4:]
+            content = self._strip_code_fence(content)
 
             # Parse JSON
             data = json.loads(content)
-            skills = data.get("skills", [])
-
-            # Validate and clean skills
-            valid_skills = []
-            for skill in skills:
-                if isinstance(skill, dict) and "name" in skill:
-                    valid_skills.append({
-                        "name": str(skill["name"]).strip(),
-                        "category": skill.get("category", "technical"),
-                        "weight": float(skill.get("weight", 0.5))
-                    })
-
-            return valid_skills
+            return self._clean_skills(data.get("skills", []))
         except Exception as e:
             print(f"Error parsing LLM response: {e}")
             print(f"Content: {content}")
@@ -1,9 +1,14 @@
 """Skill name normalization and standardization"""
 
 import re
+from functools import lru_cache
 from typing import Optional
 
 
+# Memoized normalize() results per normalizer
+NORMALIZE_CACHE_SIZE = 8192
+
+
 class SkillNormalizer:
     """Normalizes and standardizes skill names"""
 
@@ -229,6 +234,30 @@ class SkillNormalizer:
             ]
         }
 
+        self._compile_aliases()
+        self._normalize_cached = lru_cache(maxsize=NORMALIZE_CACHE_SIZE)(self._normalize)
+
+    def _compile_aliases(self):
+        """
+        Build the whole-word alias matcher once
+
+        Aliases are ranked by length descending (ties keep alias_map order) so
+        that e.g. "Python Programming" maps via "python programming" before
+        "programming". All of them go into a single alternation wrapped in a
+        lookahead, so one finditer pass reports, at every position, the
+        best-ranked alias that matches there; the best rank overall is the
+        alias the old one-regex-per-alias loop would have returned.
+        """
+        ranked = sorted(self.alias_map.items(), key=lambda x: len(x[0]), reverse=True)
+        # Skip very short aliases (like "r") to avoid false matches
+        ranked = [(alias, standard) for alias, standard in ranked if len(alias) >= 2]
+
+        self._alias_rank = {alias: rank for rank, (alias, _) in enumerate(ranked)}
+        self._alias_standards = [standard for _, standard in ranked]
+        self._alias_pattern = re.compile(
+            r'(?=\b(' + '|'.join(re.escape(alias) for alias, _ in ranked) + r')\b)'
+        )
+
     def normalize(self, skill_name: str) -> str:
         """
         Normalize a skill name to standard form
@@ -239,6 +268,9 @@ class SkillNormalizer:
         Returns:
             Standardized skill name
         """
+        return self._normalize_cached(skill_name)
+
+    def _normalize(self, skill_name: str) -> str:
         # Clean and lowercase for comparison
         cleaned = skill_name.lower().strip()
 
@@ -249,19 +281,15 @@ class SkillNormalizer:
         if cleaned in self.alias_map:
             return self.alias_map[cleaned]
 
-        # Check for whole word matches in alias map (more precise)
-        # Sort aliases by length descending to prevent greedy matching of short terms
-        # e.g. match "Python Programming" before "Programming"
-        sorted_aliases = sorted(self.alias_map.items(), key=lambda x: len(x[0]), reverse=True)
-        
-        for alias, standard in sorted_aliases:
-            # Skip very short aliases (like "r") to avoid false matches
-            if len(alias) < 2:
-                continue
-
-            # Check if alias appears as a whole word
-            if re.search(r'\b' + re.escape(alias) + r'\b', cleaned):
-                return standard
+        # Check for whole word matches in alias map (more precise);
+        # the longest matching alias wins (see _compile_aliases)
+        best = None
+        for match in self._alias_pattern.finditer(cleaned):
+            rank = self._alias_rank[match.group(1)]
+            if best is None or rank < best:
+                best = rank
+        if best is not None:
+            return self._alias_standards[best]
 
         # Title case for consistency
         return skill_name.strip().title()
@@ -1,17 +1,25 @@
 """Skill extraction pipeline orchestrator"""
 
-import json
 import os
 import sys
-from typing import List, Dict, Tuple
+from itertools import islice
+from typing import List, Dict, Optional, Set, Tuple
 
 # Add stage2/src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..'))
 
-from skill_extraction.extractor import SkillExtractor
-from skill_extraction.normalizer import SkillNormalizer
-from skill_extraction.semantic_deduplicator import SemanticDeduplicator
+from .extractor import SkillExtractor
+from .normalizer import SkillNormalizer
+from .semantic_deduplicator import SemanticDeduplicator
 from src.models import Skill, SkillMapping
+from src.records import artifact_path, iter_records, load_records, write_records
+
+
+# "jsonl" (default) or "columnar": mapping tables as .npz with dictionary-encoded skill names
+COLUMNAR_MAPPINGS = os.getenv("SKILL_MAPPINGS_FORMAT", "jsonl").lower() == "columnar"
+
+# {source_id, source_type} of every course/app sent to extraction, mapped or not
+EXTRACTED_SOURCES = "extracted_sources.json"
 
 
 class SkillExtractionPipeline:
@@ -25,7 +33,15 @@ class SkillExtractionPipeline:
         # Use Semantic Deduplicator for better clustering
         self.deduplicator = SemanticDeduplicator(self.normalizer)
 
-    def process_courses(self, courses_path: str, batch_size: int = 10, top_n: int = None) -> Tuple[List[Dict], List[SkillMapping]]:
+    def _progress_logger(self, label: str, batch_size: int):
+        """Build an on_progress callback that logs every batch_size records"""
+        def on_progress(done: int, total: int):
+            if done % batch_size == 0 or done == total:
+                self.logger(f"  ✓ Completed {done}/{total} {label}...")
+        return on_progress
+
+    def process_courses(self, courses_path: str, batch_size: int = 10, top_n: int = None,
+                        skip_ids: Set[str] = None) -> Tuple[List[Dict], List[SkillMapping], List[str]]:
         """
         Process all courses to extract skills
 
@@ -33,42 +49,52 @@ class SkillExtractionPipeline:
             courses_path: Path to courses JSON file
             batch_size: Number of courses to process before progress update
             top_n: Process only top N courses (optional)
+            skip_ids: Course IDs already extracted (incremental runs)
 
         Returns:
-            Tuple of (raw_skills, course_skill_mappings)
+            Tuple of (raw_skills, course_skill_mappings, extracted course IDs)
         """
         self.logger(f"Loading courses from {courses_path}...")
 
-        if not os.path.exists(courses_path):
+        if not os.path.exists(artifact_path(courses_path)):
             raise FileNotFoundError(f"Courses file not found: {courses_path}")
 
-        with open(courses_path, 'r', encoding='utf-8') as f:
-            courses = json.load(f)
-
-        # Filter out placeholder courses
-        courses = [c for c in courses if c.get('description', '').strip() and 'not available' not in c.get('description', '')]
+        # Stream the file, keeping only the id and text of courses to extract
+        courses = (
+            c for c in iter_records(courses_path)
+            if c.get('description', '').strip() and 'not available' not in c.get('description', '')
+        )
 
-        # Apply top_n limit
+        # Apply top_n limit (stops reading the file early)
         if top_n:
-            courses = courses[:top_n]
+            courses = islice(courses, top_n)
             self.logger(f"  Limited to top {top_n} courses")
 
-        self.logger(f"Processing {len(courses)} courses...")
-
-        all_skills = []
-        course_skill_mappings = []
-
-        for idx, course in enumerate(courses, 1):
+        course_ids = []
+        texts = []
+        for course in courses:
+            if skip_ids and course.get('course_id') in skip_ids:
+                continue
             # Create text from course title and description
             title = course.get('title', '')
             description = course.get('description', '')
-            course_id = course.get('course_id', f'course_{idx}')
-            text = f"{title}. {description}"
+            course_ids.append(course.get('course_id', f'course_{len(course_ids) + 1}'))
+            texts.append(f"{title}. {description}")
+
+        if skip_ids:
+            self.logger(f"  Skipping already-extracted courses, {len(course_ids)} new")
 
-            # Extract skills with progress indicator
-            # self.logger(f"  [{idx}/{len(courses)}] Extracting skills from: {course_id}")
-            skills = self.extractor.extract_from_text(text, "course")
+        self.logger(f"Processing {len(course_ids)} courses ({self.extractor.max_workers} workers)...")
 
+        all_skills = []
+        course_skill_mappings = []
+
+        # Extract concurrently; results come back in input order
+        results = self.extractor.extract_many(
+            texts, "course", on_progress=self._progress_logger("courses", batch_size)
+        )
+
+        for course_id, skills in zip(course_ids, results):
             # Store raw skills and mappings
             for skill in skills:
                 all_skills.append(skill)
@@ -79,17 +105,14 @@ class SkillExtractionPipeline:
                     weight=skill.get("weight", 0.5)
                 ))
 
-            # Progress update
-            if idx % batch_size == 0 or idx == len(courses):
-                self.logger(f"  ✓ Completed {idx}/{len(courses)} courses...")
-
-        self.logger(f"✓ Completed processing {len(courses)} courses")
+        self.logger(f"✓ Completed processing {len(course_ids)} courses")
         self.logger(f"  Extracted {len(all_skills)} skill instances")
         self.logger(f"  Created {len(course_skill_mappings)} course-skill mappings")
 
-        return all_skills, course_skill_mappings
+        return all_skills, course_skill_mappings, course_ids
 
-    def process_apps(self, apps_path: str, batch_size: int = 10, top_n: int = None) -> Tuple[List[Dict], List[SkillMapping]]:
+    def process_apps(self, apps_path: str, batch_size: int = 10, top_n: int = None,
+                     skip_ids: Set[str] = None) -> Tuple[List[Dict], List[SkillMapping], List[str]]:
         """
         Process all VR apps to extract skills
 
@@ -97,40 +120,50 @@ class SkillExtractionPipeline:
             apps_path: Path to VR apps JSON file
             batch_size: Number of apps to process before progress update
             top_n: Process only top N apps (optional)
+            skip_ids: App IDs already extracted (incremental runs)
 
         Returns:
-            Tuple of (raw_skills, app_skill_mappings)
+            Tuple of (raw_skills, app_skill_mappings, extracted app IDs)
         """
         self.logger(f"Loading VR apps from {apps_path}...")
 
-        if not os.path.exists(apps_path):
+        if not os.path.exists(artifact_path(apps_path)):
             raise FileNotFoundError(f"VR apps file not found: {apps_path}")
 
-        with open(apps_path, 'r', encoding='utf-8') as f:
-            apps = json.load(f)
+        # Stream the file, keeping only the id and text of apps to extract
+        apps = iter_records(apps_path)
 
-        # Apply top_n limit
+        # Apply top_n limit (stops reading the file early)
         if top_n:
-            apps = apps[:top_n]
+            apps = islice(apps, top_n)
             self.logger(f"  Limited to top {top_n} apps")
 
-        self.logger(f"Processing {len(apps)} VR apps...")
-
-        all_skills = []
-        app_skill_mappings = []
-
-        for idx, app in enumerate(apps, 1):
+        app_ids = []
+        texts = []
+        for app in apps:
+            if skip_ids and app.get('app_id') in skip_ids:
+                continue
             # Create text from app name, description, and features
             name = app.get('name', '')
             description = app.get('description', '')
             features = ', '.join(app.get('features', []))
-            app_id = app.get('app_id', f'app_{idx}')
-            text = f"{name}. {description}. Features: {features}"
+            app_ids.append(app.get('app_id', f'app_{len(app_ids) + 1}'))
+            texts.append(f"{name}. {description}. Features: {features}")
 
-            # Extract skills with progress indicator
-            # self.logger(f"  [{idx}/{len(apps)}] Extracting skills from: {app_id}")
-            skills = self.extractor.extract_from_text(text, "app")
+        if skip_ids:
+            self.logger(f"  Skipping already-extracted apps, {len(app_ids)} new")
 
+        self.logger(f"Processing {len(app_ids)} VR apps ({self.extractor.max_workers} workers)...")
+
+        all_skills = []
+        app_skill_mappings = []
+
+        # Extract concurrently; results come back in input order
+        results = self.extractor.extract_many(
+            texts, "app", on_progress=self._progress_logger("apps", batch_size)
+        )
+
+        for app_id, skills in zip(app_ids, results):
             # Store raw skills and mappings
             for skill in skills:
                 all_skills.append(skill)
@@ -141,17 +174,69 @@ class SkillExtractionPipeline:
                     weight=skill.get("weight", 0.5)
                 ))
 
-            # Progress update
-            if idx % batch_size == 0 or idx == len(apps):
-                self.logger(f"  ✓ Completed {idx}/{len(apps)} apps...")
-
-        self.logger(f"✓ Completed processing {len(apps)} VR apps")
+        self.logger(f"✓ Completed processing {len(app_ids)} VR apps")
         self.logger(f"  Extracted {len(all_skills)} skill instances")
         self.logger(f"  Created {len(app_skill_mappings)} app-skill mappings")
 
-        return all_skills, app_skill_mappings
+        return all_skills, app_skill_mappings, app_ids
+
+    @staticmethod
+    def _canonicalize(mappings: List[SkillMapping], canonical_names: Dict[str, str]) -> List[SkillMapping]:
+        """
+        Point mappings at the canonical skill their name was merged into
 
-    def run(self, courses_path: str, apps_path: str, output_dir: str, top_n: int = None) -> Tuple[List[Skill], List[SkillMapping], List[SkillMapping]]:
+        A source mapped to several names of one skill keeps a single mapping
+        with the highest weight.
+        """
+        merged: Dict[Tuple[str, str], SkillMapping] = {}
+        for m in mappings:
+            name = canonical_names.get(m.skill_name, m.skill_name)
+            key = (m.source_id, name)
+            if key not in merged:
+                merged[key] = SkillMapping(m.source_id, m.source_type, name, m.weight)
+            elif (m.weight or 0.0) > (merged[key].weight or 0.0):
+                merged[key].weight = m.weight
+        return list(merged.values())
+
+    def _load_extracted(self, output_dir: str) -> Dict[str, Set[str]]:
+        """
+        IDs of the courses and apps a previous run sent to extraction
+
+        Includes records that yielded no skills (and so have no mappings).
+        Runs from before extracted_sources.json existed only have mappings,
+        so their mapped IDs are all that is known.
+        """
+        path = os.path.join(output_dir, EXTRACTED_SOURCES)
+        extracted = {"course": set(), "app": set()}
+        if os.path.exists(artifact_path(path)):
+            for record in iter_records(path):
+                extracted.setdefault(record["source_type"], set()).add(record["source_id"])
+        return extracted
+
+    def _load_existing(self, output_dir: str) -> Optional[Tuple[List[Skill], List[SkillMapping], List[SkillMapping]]]:
+        """Load skills.json and the mapping files from a previous run, or None if missing"""
+        paths = [os.path.join(output_dir, name) for name in ("skills.json", "course_skills.json", "app_skills.json")]
+        if not all(os.path.exists(artifact_path(p)) for p in paths):
+            return None
+
+        skills_data, course_data, app_data = (load_records(path) for path in paths)
+
+        skills = [
+            Skill(
+                name=s["name"],
+                aliases=s.get("aliases", []),
+                category=s.get("category", "technical"),
+                source_count=s.get("source_count", 0),
+                weight=s.get("weight")
+            )
+            for s in skills_data
+        ]
+        course_mappings = [SkillMapping(**m) for m in course_data]
+        app_mappings = [SkillMapping(**m) for m in app_data]
+        return skills, course_mappings, app_mappings
+
+    def run(self, courses_path: str, apps_path: str, output_dir: str, top_n: int = None,
+            incremental: bool = False) -> Tuple[List[Skill], List[SkillMapping], List[SkillMapping]]:
         """
         Run the complete skill extraction pipeline
 
@@ -160,6 +245,10 @@ class SkillExtractionPipeline:
             apps_path: Path to VR apps JSON file
             output_dir: Directory to save output files
             top_n: Process only top N courses and apps (optional)
+            incremental: Only extract courses/apps not extracted by a previous run
+                (see extracted_sources.json) and merge their skills into the
+                existing skills.json. Records whose extraction returned no
+                skills are not retried; a full run retries them.
 
         Returns:
             Tuple of (unique_skills, course_mappings, app_mappings)
@@ -177,18 +266,52 @@ class SkillExtractionPipeline:
         else:
             self.logger(f"\n[CONFIG] Processing all courses and VR apps")
 
+        existing = self._load_existing(output_dir) if incremental else None
+        if incremental and existing is None:
+            self.logger("\n[CONFIG] No previous skills.json/mappings found, running full extraction")
+            incremental = False
+        if incremental:
+            existing_skills, existing_course_mappings, existing_app_mappings = existing
+            self.logger(f"\n[CONFIG] Incremental run against {len(existing_skills)} existing skills")
+            extracted = self._load_extracted(output_dir)
+            known_courses = extracted["course"] | {m.source_id for m in existing_course_mappings}
+            known_apps = extracted["app"] | {m.source_id for m in existing_app_mappings}
+        else:
+            known_courses = known_apps = None
+
         # Process courses
         self.logger("\n[1/2] Processing courses...")
-        course_skills_raw, course_mappings = self.process_courses(courses_path, top_n=top_n)
+        course_skills_raw, course_mappings, course_ids = self.process_courses(
+            courses_path, top_n=top_n, skip_ids=known_courses
+        )
 
         # Process VR apps
         self.logger("\n[2/2] Processing VR apps...")
-        app_skills_raw, app_mappings = self.process_apps(apps_path, top_n=top_n)
+        app_skills_raw, app_mappings, app_ids = self.process_apps(
+            apps_path, top_n=top_n, skip_ids=known_apps
+        )
+
+        if self.extractor.cache is not None:
+            stats = self.extractor.cache.stats()
+            self.logger(f"\n[Cache] {stats['hits']} records reused from extraction cache, "
+                        f"{stats['misses']} sent to the LLM ({stats['entries']} cached total)")
 
         # Merge and deduplicate skills
         self.logger("\n[Deduplication] Merging and deduplicating skills...")
         all_skills_raw = course_skills_raw + app_skills_raw
-        unique_skills = self.deduplicator.deduplicate(all_skills_raw)
+        if incremental:
+            unique_skills, changed_skills, canonical_names = self.deduplicator.deduplicate_incremental(
+                all_skills_raw, existing_skills
+            )
+            self.logger(f"  {len(changed_skills)} skills added or updated")
+            course_mappings = existing_course_mappings + self._canonicalize(course_mappings, canonical_names)
+            app_mappings = existing_app_mappings + self._canonicalize(app_mappings, canonical_names)
+            course_ids = sorted(known_courses) + course_ids
+            app_ids = sorted(known_apps) + app_ids
+        else:
+            unique_skills, canonical_names = self.deduplicator.deduplicate_with_names(all_skills_raw)
+            course_mappings = self._canonicalize(course_mappings, canonical_names)
+            app_mappings = self._canonicalize(app_mappings, canonical_names)
 
         self.logger(f"✓ Deduplication complete:")
         self.logger(f"  Input: {len(all_skills_raw)} skill instances")
@@ -209,8 +332,7 @@ class SkillExtractionPipeline:
             for s in unique_skills
         ]
 
-        with open(f"{output_dir}/skills.json", 'w', encoding='utf-8') as f:
-            json.dump(skills_data, f, indent=2, ensure_ascii=False)
+        write_records(f"{output_dir}/skills.json", skills_data)
 
         # Save course mappings
         course_mappings_data = [
@@ -223,8 +345,7 @@ class SkillExtractionPipeline:
             for m in course_mappings
         ]
 
-        with open(f"{output_dir}/course_skills.json", 'w', encoding='utf-8') as f:
-            json.dump(course_mappings_data, f, indent=2, ensure_ascii=False)
+        write_records(f"{output_dir}/course_skills.json", course_mappings_data, columnar=COLUMNAR_MAPPINGS)
 
         # Save app mappings
         app_mappings_data = [
@@ -237,8 +358,13 @@ class SkillExtractionPipeline:
             for m in app_mappings
         ]
 
-        with open(f"{output_dir}/app_skills.json", 'w', encoding='utf-8') as f:
-            json.dump(app_mappings_data, f, indent=2, ensure_ascii=False)
+        write_records(f"{output_dir}/app_skills.json", app_mappings_data, columnar=COLUMNAR_MAPPINGS)
+
+        # Save which courses/apps were extracted (incremental runs skip them)
+        write_records(f"{output_dir}/{EXTRACTED_SOURCES}", [
+            *({"source_id": i, "source_type": "course"} for i in course_ids),
+            *({"source_id": i, "source_type": "app"} for i in app_ids),
+        ])
 
         self.logger("\n" + "="*60)
         self.logger("PIPELINE COMPLETE")
@@ -4,7 +4,7 @@ Semantic Skill Deduplication using Embeddings and Clustering
 
 import sys
 import os
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 import numpy as np
 from collections import Counter
 
@@ -13,7 +13,12 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..'))
 
 from src.models import Skill
 from sentence_transformers import SentenceTransformer
-from sklearn.cluster import AgglomerativeClustering
+from .clustering import agglomerative_labels, knn_labels
+
+# Above this many unique strings, "auto" switches to the kNN backend
+APPROX_CLUSTERING_MIN_N = 5000
+
+CLUSTERING_BACKENDS = ("agglomerative", "knn", "auto")
 
 class SemanticDeduplicator:
     """
@@ -21,20 +26,54 @@ class SemanticDeduplicator:
     Replaces strict string matching with "Fuzzy Semantic" matching.
     """
 
-    def __init__(self, normalizer, model_name='all-MiniLM-L6-v2', distance_threshold=0.25):
+    def __init__(self, normalizer, model_name='all-MiniLM-L6-v2', distance_threshold=0.25,
+                 backend=None, approx_min_n=None):
         """
         Args:
             normalizer: Existing SkillNormalizer for basic cleaning
             model_name: HuggingFace model for embeddings
             distance_threshold: Cosine distance threshold for clustering (0.0 - 1.0).
                                 Lower = stricter matching. 0.25 is a good starting point.
+            backend: "agglomerative" (exact, O(n^2) memory), "knn" (blocked kNN graph,
+                     see clustering.py) or "auto" (default: DEDUP_CLUSTERING env var or "auto")
+            approx_min_n: Unique-string count at which "auto" picks "knn"
+                          (default: DEDUP_APPROX_MIN_N env var or 5000)
         """
+        self.backend = (backend or os.getenv("DEDUP_CLUSTERING", "auto")).lower()
+        if self.backend not in CLUSTERING_BACKENDS:
+            raise ValueError(
+                f"Unknown clustering backend '{self.backend}' (expected one of {', '.join(CLUSTERING_BACKENDS)})"
+            )
         self.normalizer = normalizer
         print(f"Loading embedding model: {model_name}...")
         self.model = SentenceTransformer(model_name)
         self.distance_threshold = distance_threshold
+        self.approx_min_n = approx_min_n or int(os.getenv("DEDUP_APPROX_MIN_N", APPROX_CLUSTERING_MIN_N))
+
+    def cluster(self, embeddings: np.ndarray) -> np.ndarray:
+        """
+        Cluster unit-length embeddings with the configured backend
+
+        Args:
+            embeddings: (n, dim) unit-length embeddings
+
+        Returns:
+            Cluster label per row
+        """
+        backend = self.backend
+        if backend == "auto":
+            backend = "knn" if len(embeddings) >= self.approx_min_n else "agglomerative"
+
+        print(f"Semantic Dedup: clustering {len(embeddings)} strings ({backend})")
+        if backend == "knn":
+            return knn_labels(embeddings, self.distance_threshold)
+        return agglomerative_labels(embeddings, self.distance_threshold)
 
     def deduplicate(self, skills: List[Dict]) -> List[Skill]:
+        """Merge semantically similar skills (see deduplicate_with_names)."""
+        return self.deduplicate_with_names(skills)[0]
+
+    def deduplicate_with_names(self, skills: List[Dict]) -> Tuple[List[Skill], Dict[str, str]]:
         """
         Merge semantically similar skills.
         
@@ -45,9 +84,13 @@ class SemanticDeduplicator:
         4. Cluster embeddings.
         5. Pick canonical name for each cluster.
         6. Merge stats (counts, weights).
+
+        Returns:
+            Tuple of (merged skills, canonical skill name for each normalized
+            input name). Mappings must use the canonical name to find their skill.
         """
         if not skills:
-            return []
+            return [], {}
 
         # --- Step 1: Pre-processing ---
         # Map: Normalized Name -> List of original skill dicts
@@ -68,7 +111,7 @@ class SemanticDeduplicator:
             
         unique_names = list(grouped_skills.keys())
         if not unique_names:
-            return []
+            return [], {}
 
         print(f"Semantic Dedup: {len(skills)} raw skills -> {len(unique_names)} unique strings (pre-clustering)")
 
@@ -80,15 +123,9 @@ class SemanticDeduplicator:
             # Normalize embeddings to unit length for cosine distance
             embeddings = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
 
-            # Agglomerative Clustering with Cosine Distance
-            # distance_threshold determines cut-off. Linkage='average' works well for "clouds" of synonyms.
-            clustering = AgglomerativeClustering(
-                n_clusters=None,
-                metric='cosine',
-                linkage='average',
-                distance_threshold=self.distance_threshold
-            )
-            cluster_labels = clustering.fit_predict(embeddings)
+            # Average-linkage clustering with cosine distance (exact, or blocked
+            # by kNN components for large n). distance_threshold determines cut-off.
+            cluster_labels = self.cluster(embeddings)
         else:
             cluster_labels = [0]
 
@@ -101,6 +138,7 @@ class SemanticDeduplicator:
             clusters[label].append(unique_names[idx])
 
         final_skills = []
+        canonical_names = {}
 
         for label, names_in_cluster in clusters.items():
             # Gather all raw skill instances for this cluster
@@ -123,6 +161,8 @@ class SemanticDeduplicator:
                 key=lambda x: (-x[1], len(x[0]))
             )
             canonical_name = sorted_candidates[0][0]
+            for name in names_in_cluster:
+                canonical_names[name] = canonical_name
 
             # Aggregate Metadata
             aliases = set()
@@ -166,7 +206,121 @@ class SemanticDeduplicator:
                 weight=max_weight
             ))
             
-        return final_skills
+        return final_skills, canonical_names
+
+    def deduplicate_incremental(
+        self,
+        skills: List[Dict],
+        existing: List[Skill],
+        existing_embeddings: Optional[np.ndarray] = None
+    ) -> Tuple[List[Skill], List[Skill], Dict[str, str]]:
+        """
+        Merge new raw skills into an existing canonical skill set.
+
+        Process:
+        1. Normalize and group the new raw skills (as in deduplicate).
+        2. Names equal to a canonical name or alias join that skill directly.
+        3. Other names join the canonical skill with the smallest average
+           cosine distance to its name + aliases, if within distance_threshold
+           (same criterion average-linkage clustering merges on).
+        4. Leftovers are clustered among themselves into new skills.
+
+        Args:
+            skills: New raw skill dicts (only from new/changed records)
+            existing: Current canonical skills (e.g. loaded from skills.json)
+            existing_embeddings: Optional (len(existing), dim) cluster centroids
+                from cluster_centroids(); computed when omitted
+
+        Returns:
+            Tuple of (all skills, changed skills, canonical skill name for each
+            normalized input name). Changed skills are the existing skills that
+            gained instances plus the new ones; only these need to be re-synced
+            downstream. New mappings must be renamed with the canonical names,
+            since merged names are no longer skills of their own.
+        """
+        existing = [Skill(**vars(s)) for s in existing]
+        grouped = {}
+        for s in skills:
+            if isinstance(s, dict) and "name" in s:
+                grouped.setdefault(self.normalizer.normalize(s["name"]), []).append(s)
+        if not grouped:
+            return existing, [], {}
+
+        # Step 2: exact name/alias matches
+        lookup = {}
+        for idx, skill in enumerate(existing):
+            for name in [skill.name] + list(skill.aliases):
+                lookup.setdefault(name.lower(), idx)
+
+        assignments = {}
+        unmatched = []
+        for name in grouped:
+            if name.lower() in lookup:
+                assignments[name] = lookup[name.lower()]
+            else:
+                unmatched.append(name)
+
+        # Step 3: nearest canonical cluster by average similarity
+        if unmatched and existing:
+            if existing_embeddings is None:
+                existing_embeddings = self.cluster_centroids(existing)
+            embeddings = self.model.encode(unmatched, batch_size=32, show_progress_bar=len(unmatched) >= 64)
+            embeddings = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+
+            sims = embeddings @ existing_embeddings.T
+            best = np.argmax(sims, axis=1)
+            for i, name in enumerate(unmatched):
+                if 1.0 - sims[i, best[i]] <= self.distance_threshold:
+                    assignments[name] = int(best[i])
+            unmatched = [name for name in unmatched if name not in assignments]
+
+        # Merge matched instances into their canonical skills
+        changed = set()
+        for name, idx in assignments.items():
+            skill = existing[idx]
+            aliases = set(skill.aliases)
+            for instance in grouped[name]:
+                skill.source_count += 1
+                skill.weight = max(skill.weight or 0.0, float(instance.get("weight", 0.5)))
+                raw_original = instance["name"].strip()
+                if raw_original.lower() != skill.name.lower():
+                    aliases.add(raw_original)
+                if name != skill.name:
+                    aliases.add(name)
+            skill.aliases = list(aliases)
+            changed.add(idx)
+
+        canonical_names = {name: existing[idx].name for name, idx in assignments.items()}
+
+        # Step 4: new clusters for leftovers
+        new_skills = []
+        if unmatched:
+            new_skills, new_names = self.deduplicate_with_names([s for name in unmatched for s in grouped[name]])
+            canonical_names.update(new_names)
+
+        print(f"Incremental Dedup: {len(grouped)} new strings -> {len(assignments)} merged into "
+              f"{len(changed)} existing skills, {len(new_skills)} new skills")
+
+        changed_skills = [existing[idx] for idx in sorted(changed)] + new_skills
+        return existing + new_skills, changed_skills, canonical_names
+
+    def cluster_centroids(self, skills: List[Skill]) -> np.ndarray:
+        """
+        Mean unit embedding of each skill's name and aliases.
+
+        For a unit vector x, 1 - x . centroid is its average cosine distance
+        to the cluster members (the average-linkage distance).
+
+        Returns:
+            (len(skills), dim) array (rows are not re-normalized)
+        """
+        members = [list(dict.fromkeys([s.name] + list(s.aliases))) for s in skills]
+        flat = [name for names in members for name in names]
+        embeddings = self.model.encode(flat, batch_size=32, show_progress_bar=len(flat) >= 64)
+        embeddings = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+
+        bounds = np.cumsum([0] + [len(names) for names in members])
+        return np.add.reduceat(embeddings, bounds[:-1], axis=0) / np.diff(bounds)[:, None]
 
     def merge_skill_lists(self, skill_lists: List[List[Dict]]) -> List[Skill]:
         """Wrapper to merge list of lists"""
@@ -0,0 +1,157 @@
+"""
+Tests for batched skill extraction: packing and keyed response parsing.
+"""
+
+import json
+import os
+import sys
+from types import SimpleNamespace
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from skill_extraction.src.skill_extraction.extractor import MAX_TEXT_CHARS, SkillExtractor
+
+
+class ScriptedClient:
+    """Fake OpenAI client returning canned responses in order."""
+
+    def __init__(self, *contents):
+        self.contents = list(contents)
+        self.prompts = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, messages, **kwargs):
+        self.prompts.append(messages[-1]["content"])
+        content = self.contents.pop(0)
+        if isinstance(content, Exception):
+            raise content
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def skills(name):
+    return {"skills": [{"name": name, "category": "technical", "weight": 0.8}]}
+
+
+def make_extractor(client=None, **kwargs):
+    extractor = SkillExtractor(cache_path="off", rate_limit=0, max_retries=0, **kwargs)
+    extractor.client = client
+    return extractor
+
+
+def records(*sizes):
+    return [(i, "x" * size) for i, size in enumerate(sizes)]
+
+
+class TestPack:
+    """Greedy batching by record count and input characters."""
+
+    def test_record_limit(self):
+        batches = make_extractor()._pack(records(*[10] * 25))
+        assert [len(b) for b in batches] == [10, 10, 5]
+
+    def test_char_limit(self):
+        batches = make_extractor()._pack(records(3000, 3000, 3000, 3000, 2500))
+        assert [[i for i, _ in b] for b in batches] == [[0, 1], [2, 3], [4]]
+
+    def test_exact_char_budget_fits(self):
+        batches = make_extractor()._pack(records(4000, 4000, 1))
+        assert [len(b) for b in batches] == [2, 1]
+
+    def test_oversized_record_gets_its_own_batch(self):
+        batches = make_extractor()._pack(records(10, 9000, 10))
+        assert [[i for i, _ in b] for b in batches] == [[0], [1], [2]]
+
+    def test_preserves_order_and_defaults(self):
+        extractor = make_extractor()
+        assert extractor.batch_size == 10
+        assert extractor.batch_chars == 8000
+
+        packed = extractor._pack(records(*[MAX_TEXT_CHARS] * 7))
+        assert [i for b in packed for i, _ in b] == list(range(7))
+        assert all(sum(len(t) for _, t in b) <= 8000 for b in packed)
+
+    def test_batching_disabled(self):
+        batches = make_extractor(batch_size=1)._pack(records(5, 5, 5))
+        assert [len(b) for b in batches] == [1, 1, 1]
+
+
+class TestParseBatchResponse:
+    """Keyed r1..rN responses."""
+
+    def test_results_wrapper(self):
+        content = json.dumps({"results": {"r1": skills("Python"), "r2": skills("SQL")}})
+        parsed = make_extractor()._parse_batch_response(content)
+
+        assert parsed["r1"] == [{"name": "Python", "category": "technical", "weight": 0.8}]
+        assert parsed["r2"][0]["name"] == "SQL"
+
+    def test_fenced_unwrapped_bracketed_ids(self):
+        content = "```json\n" + json.dumps({"[r1]": skills("Python"), "r2": [{"name": "SQL"}]}) + "\n```"
+        parsed = make_extractor()._parse_batch_response(content)
+
+        assert set(parsed) == {"r1", "r2"}
+        assert parsed["r2"] == [{"name": "SQL", "category": "technical", "weight": 0.5}]
+
+    def test_bad_entries_are_dropped(self):
+        content = json.dumps({"results": {"r1": skills("Python"), "r2": {"skills": [{"weight": "high"}]}}})
+        parsed = make_extractor()._parse_batch_response(content)
+        assert parsed["r1"][0]["name"] == "Python"
+        assert parsed["r2"] == []
+
+    def test_malformed(self):
+        extractor = make_extractor()
+        assert extractor._parse_batch_response("no json") == {}
+        assert extractor._parse_batch_response("[1, 2]") == {}
+
+
+class TestExtractBatch:
+    """Per-record fallback when a batched response is incomplete."""
+
+    def test_all_records_answered(self):
+        client = ScriptedClient(json.dumps({"results": {"r1": skills("Python"), "r2": skills("SQL")}}))
+        results = make_extractor(client)._extract_batch(["course a", "course b"], "course")
+
+        assert [r[0]["name"] for r in results] == ["Python", "SQL"]
+        assert len(client.prompts) == 1
+        assert "[r1] course a" in client.prompts[0]
+        assert "[r2] course b" in client.prompts[0]
+
+    def test_missing_record_falls_back_to_single(self):
+        client = ScriptedClient(
+            json.dumps({"results": {"r1": skills("Python"), "r3": skills("Ethics")}}),
+            json.dumps(skills("SQL")),
+        )
+        results = make_extractor(client)._extract_batch(["course a", "course b", "course c"], "course")
+
+        assert [r[0]["name"] for r in results] == ["Python", "SQL", "Ethics"]
+        assert len(client.prompts) == 2
+        assert "course b" in client.prompts[1]
+        assert "[r" not in client.prompts[1]
+
+    def test_empty_record_falls_back_to_single(self):
+        client = ScriptedClient(
+            json.dumps({"results": {"r1": {"skills": []}, "r2": skills("SQL")}}),
+            json.dumps(skills("Python")),
+        )
+        results = make_extractor(client)._extract_batch(["course a", "course b"], "course")
+        assert [r[0]["name"] for r in results] == ["Python", "SQL"]
+
+    def test_failed_request_retries_each_record(self):
+        client = ScriptedClient(
+            ValueError("boom"),
+            json.dumps(skills("Python")),
+            json.dumps(skills("SQL")),
+        )
+        results = make_extractor(client)._extract_batch(["course a", "course b"], "course")
+
+        assert [r[0]["name"] for r in results] == ["Python", "SQL"]
+        assert len(client.prompts) == 3
+
+    def test_single_record_skips_batch_prompt(self):
+        client = ScriptedClient(json.dumps(skills("Python")))
+        results = make_extractor(client)._extract_batch(["course a"], "course")
+
+        assert results == [[{"name": "Python", "category": "technical", "weight": 0.8}]]
+        assert "[r1]" not in client.prompts[0]
@@ -0,0 +1,54 @@
+"""
+Tests for the skill deduplication clustering backends.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from skill_extraction.src.skill_extraction.clustering import (
+    agglomerative_labels,
+    knn_components,
+    knn_labels,
+)
+
+
+def unit_circle(angles: np.ndarray) -> np.ndarray:
+    """Unit-length 2-D embeddings at the given angles."""
+    return np.stack([np.cos(angles), np.sin(angles)], axis=1)
+
+
+class TestKnnLabels:
+    """Test the blocked kNN clustering backend."""
+
+    def test_matches_agglomerative_on_separated_groups(self):
+        """Well separated groups cluster exactly like the exact backend."""
+        rng = np.random.default_rng(0)
+        centres = np.array([0.0, 1.5, 3.0, 4.5])
+        embeddings = unit_circle(np.repeat(centres, 20) + rng.normal(0, 0.02, 80))
+
+        exact = agglomerative_labels(embeddings, 0.25)
+        approx = knn_labels(embeddings, 0.25, max_block=50)
+
+        assert len(np.unique(approx)) == len(np.unique(exact)) == 4
+        for label in np.unique(exact):
+            assert len(np.unique(approx[exact == label])) == 1
+
+    def test_chain_larger_than_max_block_is_split(self):
+        """A chained component above max_block never becomes a single cluster."""
+        max_block = 100
+        # 300 points 0.01 rad apart: neighbours are within the threshold, so
+        # the kNN graph is one chain although its ends are far apart
+        embeddings = unit_circle(np.arange(300) * 0.01)
+        assert len(np.unique(knn_components(embeddings, 0.25))) == 1
+
+        labels = knn_labels(embeddings, 0.25, max_block=max_block)
+
+        assert np.bincount(labels).max() <= max_block
+        assert labels[0] != labels[-1]
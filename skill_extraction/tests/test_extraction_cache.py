@@ -0,0 +1,137 @@
+"""
+Tests for the persistent extraction cache.
+"""
+
+import json
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from skill_extraction.src.skill_extraction import extractor as extractor_module
+from skill_extraction.src.skill_extraction.cache import ExtractionCache
+from skill_extraction.src.skill_extraction.extractor import SkillExtractor
+
+SKILLS = [{"name": "Python", "category": "technical", "weight": 0.9}]
+
+
+class CountingClient:
+    """Fake OpenAI client that always extracts SKILLS and counts requests."""
+
+    def __init__(self):
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **kwargs):
+        self.calls += 1
+        content = json.dumps({"skills": SKILLS})
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ExtractionCache(str(tmp_path / "cache.db"))
+    yield cache
+    cache.close()
+
+
+class TestExtractionCache:
+    """Key derivation, persistence and stats."""
+
+    def test_round_trip_and_stats(self, cache):
+        key = ExtractionCache.make_key("model-a", "1", "course", "Intro to Python")
+
+        assert cache.get(key) is None
+        cache.put(key, SKILLS)
+        assert cache.get(key) == SKILLS
+        assert cache.get(key) == SKILLS
+
+        assert cache.stats() == {"hits": 2, "misses": 1, "entries": 1}
+
+    @pytest.mark.parametrize("changed", [
+        ("model-b", "1", "course", "Intro to Python"),
+        ("model-a", "2", "course", "Intro to Python"),
+        ("model-a", "1", "app", "Intro to Python"),
+        ("model-a", "1", "course", "Intro to Python!"),
+    ])
+    def test_any_key_part_change_is_a_miss(self, cache, changed):
+        cache.put(ExtractionCache.make_key("model-a", "1", "course", "Intro to Python"), SKILLS)
+
+        assert cache.get(ExtractionCache.make_key(*changed)) is None
+        assert cache.stats()["misses"] == 1
+
+    def test_fields_do_not_run_together(self):
+        assert ExtractionCache.make_key("ab", "1", "course", "x") != ExtractionCache.make_key("a", "b1", "course", "x")
+
+    def test_persists_across_instances(self, tmp_path):
+        path = str(tmp_path / "cache.db")
+        key = ExtractionCache.make_key("model-a", "1", "course", "Intro to Python")
+
+        first = ExtractionCache(path)
+        first.put(key, SKILLS)
+        first.close()
+
+        second = ExtractionCache(path)
+        assert second.get(key) == SKILLS
+        second.close()
+
+
+class TestExtractorCaching:
+    """SkillExtractor only calls the LLM on cache misses."""
+
+    def make_extractor(self, path, client):
+        extractor = SkillExtractor(cache_path=path, rate_limit=0, max_retries=0)
+        extractor.client = client
+        return extractor
+
+    def test_unchanged_record_is_not_re_extracted(self, tmp_path):
+        client = CountingClient()
+        extractor = self.make_extractor(str(tmp_path / "cache.db"), client)
+
+        assert extractor.extract_from_text("Intro to Python") == SKILLS
+        assert extractor.extract_from_text("Intro to Python") == SKILLS
+        assert client.calls == 1
+        assert extractor.cache.stats()["hits"] == 1
+
+    def test_model_change_misses(self, tmp_path):
+        client = CountingClient()
+        extractor = self.make_extractor(str(tmp_path / "cache.db"), client)
+        extractor.extract_from_text("Intro to Python")
+
+        extractor.model = "another/model"
+        extractor.extract_from_text("Intro to Python")
+        assert client.calls == 2
+
+    def test_prompt_version_change_misses(self, tmp_path, monkeypatch):
+        client = CountingClient()
+        extractor = self.make_extractor(str(tmp_path / "cache.db"), client)
+        extractor.extract_from_text("Intro to Python")
+
+        monkeypatch.setattr(extractor_module, "PROMPT_VERSION", extractor_module.PROMPT_VERSION + "-next")
+        extractor.extract_from_text("Intro to Python")
+        assert client.calls == 2
+
+    def test_source_type_and_text_change_miss(self, tmp_path):
+        client = CountingClient()
+        extractor = self.make_extractor(str(tmp_path / "cache.db"), client)
+        extractor.extract_from_text("Intro to Python", source_type="course")
+
+        extractor.extract_from_text("Intro to Python", source_type="app")
+        extractor.extract_from_text("Intro to Python 2", source_type="course")
+        assert client.calls == 3
+        assert extractor.cache.stats() == {"hits": 0, "misses": 3, "entries": 3}
+
+    def test_empty_result_is_not_cached(self, tmp_path):
+        client = CountingClient()
+        client.chat.completions.create = lambda **kwargs: SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content="not json"))]
+        )
+        extractor = self.make_extractor(str(tmp_path / "cache.db"), client)
+
+        assert extractor.extract_from_text("Intro to Python") == []
+        assert extractor.cache.stats()["entries"] == 0
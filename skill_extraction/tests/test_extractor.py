@@ -0,0 +1,198 @@
+"""
+Tests for SkillExtractor retries and concurrency, with a fake LLM client.
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from openai import (
+    APIConnectionError,
+    BadRequestError,
+    InternalServerError,
+    NotFoundError,
+    RateLimitError,
+)
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from skill_extraction.src.skill_extraction import extractor as extractor_module
+from skill_extraction.src.skill_extraction.extractor import RateLimiter, SkillExtractor, _is_retryable
+
+REQUEST = httpx.Request("POST", "https://openrouter.ai/api/v1/chat/completions")
+
+
+def status_error(cls, status, headers=None):
+    response = httpx.Response(status, request=REQUEST, headers=headers or {})
+    return cls(f"HTTP {status}", response=response, body=None)
+
+
+def reply(content):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def echo_skills(prompt):
+    """Answer a single or batched extraction prompt with one skill per record (its text)."""
+    records = re.findall(r"^\[(r\d+)\] (.*)$", prompt, flags=re.MULTILINE)
+    if records:
+        return {"results": {rid: {"skills": [{"name": text}]} for rid, text in records}}
+    text = prompt.split("\n\n")[1]
+    return {"skills": [{"name": text}]}
+
+
+class FakeClient:
+    """Stands in for OpenAI(): replays queued errors, then echoes the records back."""
+
+    def __init__(self, errors=(), delay=None):
+        self.errors = list(errors)
+        self.delay = delay
+        self.calls = []
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, model, messages, temperature, max_tokens):
+        prompt = messages[-1]["content"]
+        with self._lock:
+            self.calls.append(prompt)
+            error = self.errors.pop(0) if self.errors else None
+        if error is not None:
+            raise error
+        if self.delay:
+            time.sleep(self.delay(prompt))
+        return reply(json.dumps(echo_skills(prompt)))
+
+
+def make_extractor(client=None, **kwargs):
+    kwargs.setdefault("rate_limit", 0)
+    kwargs.setdefault("max_retries", 3)
+    extractor = SkillExtractor(cache_path="off", **kwargs)
+    extractor.client = client or FakeClient()
+    return extractor
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record backoff sleeps instead of waiting."""
+    recorded = []
+    monkeypatch.setattr(extractor_module.time, "sleep", recorded.append)
+    monkeypatch.setattr(extractor_module.random, "uniform", lambda a, b: 1.0)
+    return recorded
+
+
+class TestRetryClassification:
+    """Which API errors are retried."""
+
+    @pytest.mark.parametrize("error", [
+        status_error(RateLimitError, 429),
+        status_error(InternalServerError, 500),
+        status_error(InternalServerError, 503),
+        APIConnectionError(request=REQUEST),
+    ])
+    def test_retryable(self, error):
+        assert _is_retryable(error)
+
+    @pytest.mark.parametrize("error", [
+        status_error(BadRequestError, 400),
+        status_error(NotFoundError, 404),
+        ValueError("bad json"),
+    ])
+    def test_not_retryable(self, error):
+        assert not _is_retryable(error)
+
+
+class TestComplete:
+    """Backoff and retry limits in _complete."""
+
+    def test_retries_then_succeeds(self, sleeps):
+        client = FakeClient(errors=[status_error(RateLimitError, 429), status_error(InternalServerError, 502)])
+        extractor = make_extractor(client)
+
+        skills = extractor.extract_from_text("Python")
+        assert skills == [{"name": "Python", "category": "technical", "weight": 0.5}]
+        assert len(client.calls) == 3
+        assert sleeps == [1.0, 2.0]
+
+    def test_stops_at_retry_limit(self, sleeps):
+        client = FakeClient(errors=[status_error(InternalServerError, 500)] * 10)
+        extractor = make_extractor(client, max_retries=3)
+
+        with pytest.raises(InternalServerError):
+            extractor._complete([{"role": "user", "content": "x"}], max_tokens=10)
+        assert len(client.calls) == 4
+        assert sleeps == [1.0, 2.0, 4.0]
+
+    def test_backoff_is_capped(self, sleeps):
+        client = FakeClient(errors=[status_error(InternalServerError, 500)] * 10)
+        extractor = make_extractor(client, max_retries=7)
+
+        with pytest.raises(InternalServerError):
+            extractor._complete([{"role": "user", "content": "x"}], max_tokens=10)
+        assert sleeps == [1.0, 2.0, 4.0, 8.0, 16.0, 30.0, 30.0]
+
+    def test_client_error_is_not_retried(self, sleeps):
+        client = FakeClient(errors=[status_error(BadRequestError, 400)])
+        extractor = make_extractor(client)
+
+        assert extractor.extract_from_text("Python") == []
+        assert len(client.calls) == 1
+        assert sleeps == []
+
+    def test_retry_after_header(self, sleeps):
+        client = FakeClient(errors=[status_error(RateLimitError, 429, {"retry-after": "7"})])
+        make_extractor(client).extract_from_text("Python")
+        assert sleeps == [7.0]
+
+
+class TestRateLimiter:
+    """Call spacing."""
+
+    def test_disabled(self):
+        limiter = RateLimiter(0)
+        start = time.monotonic()
+        for _ in range(100):
+            limiter.wait()
+        assert time.monotonic() - start < 0.1
+
+    def test_spaces_calls(self):
+        limiter = RateLimiter(50)
+        start = time.monotonic()
+        for _ in range(6):
+            limiter.wait()
+        # First call is immediate, the other five wait 20ms each
+        assert time.monotonic() - start >= 0.09
+
+
+class TestExtractMany:
+    """Concurrent extraction keeps results aligned with the inputs."""
+
+    def test_order_preserved_unbatched(self):
+        texts = [f"Skill {i}" for i in range(20)]
+        # Later records finish first
+        client = FakeClient(delay=lambda prompt: 0.002 * (20 - int(re.search(r"Skill (\d+)", prompt).group(1))))
+        extractor = make_extractor(client, max_workers=8, batch_size=1)
+
+        progress = []
+        results = extractor.extract_many(texts, on_progress=lambda done, total: progress.append((done, total)))
+
+        assert [r[0]["name"] for r in results] == texts
+        assert len(client.calls) == 20
+        assert progress[-1] == (20, 20)
+        assert [done for done, _ in progress] == list(range(1, 21))
+
+    def test_order_preserved_batched(self):
+        texts = [f"Skill {i}" for i in range(23)]
+        client = FakeClient(delay=lambda prompt: 0.01 if "[r1] Skill 0" in prompt else 0.0)
+        extractor = make_extractor(client, max_workers=4, batch_size=5)
+
+        results = extractor.extract_many(texts)
+
+        assert [r[0]["name"] for r in results] == texts
+        assert len(client.calls) == 5
@@ -0,0 +1,218 @@
+"""
+Tests for incremental skill extraction: merging into existing skills and
+skipping already-extracted records.
+"""
+
+import json
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from skill_extraction.src.skill_extraction import pipeline as pipeline_module
+from skill_extraction.src.skill_extraction import semantic_deduplicator
+from skill_extraction.src.skill_extraction.normalizer import SkillNormalizer
+from skill_extraction.src.skill_extraction.semantic_deduplicator import SemanticDeduplicator
+from src.models import Skill
+from src.records import load_records
+
+# Toy embedding space: each name points along one axis, near-synonyms share it
+VECTORS = {
+    "Machine Learning": [1, 0, 0, 0],
+    "Statistical Learning": [0.9, 0.1, 0, 0],
+    "Deep Learning": [0, 1, 0, 0],
+    "Neural Nets": [0.05, 1, 0, 0],
+    "Public Policy": [0, 0, 1, 0],
+    "Pottery": [0, 0, 0, 1],
+    "Ceramics": [0, 0, 0.05, 1],
+}
+
+
+class FakeModel:
+    """Stands in for SentenceTransformer with the fixed VECTORS lookup."""
+
+    def __init__(self, name):
+        self.calls = []
+
+    def encode(self, names, **kwargs):
+        self.calls.append(list(names))
+        return np.array([VECTORS[n] for n in names], dtype=np.float32)
+
+
+@pytest.fixture
+def deduplicator(monkeypatch):
+    monkeypatch.setattr(semantic_deduplicator, "SentenceTransformer", FakeModel)
+    return SemanticDeduplicator(SkillNormalizer(), backend="agglomerative")
+
+
+def existing_skills():
+    return [
+        Skill(name="Machine Learning", aliases=["Statistical Learning"], category="technical",
+              source_count=3, weight=0.7),
+        Skill(name="Deep Learning", aliases=[], category="technical", source_count=2, weight=0.6),
+    ]
+
+
+def raw(name, weight=0.5):
+    return {"name": name, "category": "technical", "weight": weight}
+
+
+class TestDeduplicateIncremental:
+    """Assignment of new names to existing or new canonical skills."""
+
+    def test_alias_hit(self, deduplicator):
+        skills, changed, canonical = deduplicator.deduplicate_incremental(
+            [raw("statistical learning", 0.9)], existing_skills()
+        )
+
+        assert canonical == {"Statistical Learning": "Machine Learning"}
+        assert [s.name for s in changed] == ["Machine Learning"]
+        assert changed[0].source_count == 4
+        assert changed[0].weight == 0.9
+        assert len(skills) == 2
+        # Alias matches never need embeddings
+        assert deduplicator.model.calls == []
+
+    def test_name_hit_via_normalizer(self, deduplicator):
+        _, changed, canonical = deduplicator.deduplicate_incremental([raw("ML")], existing_skills())
+
+        assert canonical == {"Machine Learning": "Machine Learning"}
+        assert "ML" in changed[0].aliases
+
+    def test_centroid_hit(self, deduplicator):
+        skills, changed, canonical = deduplicator.deduplicate_incremental(
+            [raw("Neural Nets")], existing_skills()
+        )
+
+        assert canonical == {"Neural Nets": "Deep Learning"}
+        assert [s.name for s in changed] == ["Deep Learning"]
+        assert "Neural Nets" in changed[0].aliases
+        assert len(skills) == 2
+
+    def test_leftovers_form_new_clusters(self, deduplicator):
+        skills, changed, canonical = deduplicator.deduplicate_incremental(
+            [raw("Pottery"), raw("Ceramics"), raw("Public Policy")], existing_skills()
+        )
+
+        assert canonical == {"Pottery": "Pottery", "Ceramics": "Pottery", "Public Policy": "Public Policy"}
+        assert sorted(s.name for s in changed) == ["Pottery", "Public Policy"]
+        assert [s.name for s in skills[:2]] == ["Machine Learning", "Deep Learning"]
+        assert len(skills) == 4
+
+    def test_existing_skills_are_not_mutated(self, deduplicator):
+        existing = existing_skills()
+        deduplicator.deduplicate_incremental([raw("Neural Nets")], existing)
+        assert existing[1].aliases == []
+        assert existing[1].source_count == 2
+
+    def test_nothing_new(self, deduplicator):
+        skills, changed, canonical = deduplicator.deduplicate_incremental([], existing_skills())
+        assert len(skills) == 2
+        assert changed == []
+        assert canonical == {}
+
+
+class FakeExtractor:
+    """Records which texts reach extraction and returns canned skills per text."""
+
+    cache = None
+    max_workers = 1
+
+    def __init__(self, skills_by_text):
+        self.skills_by_text = skills_by_text
+        self.texts = []
+
+    def extract_many(self, texts, source_type="course", on_progress=None):
+        self.texts.extend(texts)
+        return [self.skills_by_text.get(text, []) for text in texts]
+
+
+def write_json(path, data):
+    with open(path, "w") as f:
+        json.dump(data, f)
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    """Inputs with one old and three new courses, plus a previous run's outputs."""
+    courses = [
+        {"course_id": "c1", "title": "ML", "description": "Old course"},
+        {"course_id": "c2", "title": "DL", "description": "New course"},
+        {"course_id": "c3", "title": "Clay", "description": "Art course"},
+        {"course_id": "c4", "title": "Misc", "description": "No skills found"},
+    ]
+    apps = [{"app_id": "a1", "name": "VR Lab", "description": "Old app"}]
+    write_json(tmp_path / "courses.json", courses)
+    write_json(tmp_path / "apps.json", apps)
+
+    out = tmp_path / "out"
+    out.mkdir()
+    write_json(out / "skills.json", [
+        {"name": s.name, "aliases": s.aliases, "category": s.category,
+         "source_count": s.source_count, "weight": s.weight}
+        for s in existing_skills()
+    ])
+    write_json(out / "course_skills.json", [
+        {"source_id": "c1", "source_type": "course", "skill_name": "Machine Learning", "weight": 0.7},
+    ])
+    write_json(out / "app_skills.json", [
+        {"source_id": "a1", "source_type": "app", "skill_name": "Deep Learning", "weight": 0.6},
+    ])
+    return tmp_path
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    monkeypatch.setattr(semantic_deduplicator, "SentenceTransformer", FakeModel)
+    monkeypatch.setenv("DEDUP_CLUSTERING", "agglomerative")
+    pipe = pipeline_module.SkillExtractionPipeline(logger=lambda *args: None)
+    pipe.extractor = FakeExtractor({
+        "DL. New course": [raw("Neural Nets", 0.8), raw("deep learning", 0.6)],
+        "Clay. Art course": [raw("Pottery"), raw("Ceramics", 0.9)],
+    })
+    return pipe
+
+
+class TestIncrementalRun:
+    """SkillExtractionPipeline.run(incremental=True)."""
+
+    def run(self, pipe, workspace):
+        return pipe.run(
+            str(workspace / "courses.json"), str(workspace / "apps.json"),
+            str(workspace / "out"), incremental=True
+        )
+
+    def test_skips_extracted_records(self, pipeline, workspace):
+        self.run(pipeline, workspace)
+        assert pipeline.extractor.texts == ["DL. New course", "Clay. Art course", "Misc. No skills found"]
+
+        records = load_records(str(workspace / "out" / pipeline_module.EXTRACTED_SOURCES))
+        extracted = {(r["source_type"], r["source_id"]) for r in records}
+        assert extracted == {
+            ("course", "c1"), ("course", "c2"), ("course", "c3"), ("course", "c4"), ("app", "a1")
+        }
+
+        # A second run has nothing left to extract, including records without skills
+        pipeline.extractor.texts = []
+        self.run(pipeline, workspace)
+        assert pipeline.extractor.texts == []
+
+    def test_mappings_use_canonical_names(self, pipeline, workspace):
+        skills, course_mappings, app_mappings = self.run(pipeline, workspace)
+
+        names = {s.name for s in skills}
+        assert all(m.skill_name in names for m in course_mappings + app_mappings)
+
+        mapped = {(m.source_id, m.skill_name): m.weight for m in course_mappings}
+        assert mapped == {
+            ("c1", "Machine Learning"): 0.7,
+            # "Neural Nets" folds into Deep Learning; the duplicate keeps the top weight
+            ("c2", "Deep Learning"): 0.8,
+            ("c3", "Pottery"): 0.9,
+        }
+        assert [(m.source_id, m.skill_name) for m in app_mappings] == [("a1", "Deep Learning")]
@@ -0,0 +1,83 @@
+"""
+Tests for SkillNormalizer alias matching.
+"""
+
+import os
+import re
+import sys
+
+import pytest
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from skill_extraction.src.skill_extraction.normalizer import SkillNormalizer
+
+
+def legacy_normalize(normalizer, skill_name):
+    """The original one-regex-per-alias loop that _compile_aliases replaces."""
+    cleaned = re.sub(r'\s+', ' ', skill_name.lower().strip())
+    if cleaned in normalizer.alias_map:
+        return normalizer.alias_map[cleaned]
+    for alias, standard in sorted(normalizer.alias_map.items(), key=lambda x: len(x[0]), reverse=True):
+        if len(alias) < 2:
+            continue
+        if re.search(r'\b' + re.escape(alias) + r'\b', cleaned):
+            return standard
+    return skill_name.strip().title()
+
+
+@pytest.fixture(scope="module")
+def normalizer():
+    return SkillNormalizer()
+
+
+class TestAliasPrecedence:
+    """The compiled matcher picks the same alias as the legacy loop."""
+
+    def test_longest_alias_wins(self, normalizer):
+        assert normalizer.normalize("Intro to Machine Learning with Python") == "Machine Learning"
+
+    def test_first_ranked_alias_wins_on_equal_length(self, normalizer):
+        # "sql" and "aws" are both 3 chars; "sql" comes first in alias_map
+        assert normalizer.normalize("AWS and SQL basics") == "SQL"
+        assert normalizer.normalize("SQL and AWS basics") == "SQL"
+
+    def test_position_does_not_matter(self, normalizer):
+        assert normalizer.normalize("ai for public policy") == "Public Policy"
+        assert normalizer.normalize("public policy for ai") == "Public Policy"
+
+    def test_word_boundaries(self, normalizer):
+        # "js" inside "json", "go" inside "google" and "r" are not matches
+        assert normalizer.normalize("json parsing") == "Json Parsing"
+        assert normalizer.normalize("googling") == "Googling"
+        assert normalizer.normalize("r studio") == "R Studio"
+
+    def test_symbol_aliases(self, normalizer):
+        assert normalizer.normalize("C++") == "C++"
+        assert normalizer.normalize("c++11 templates") == "C++"
+        # \b after "+" needs a word character, exactly as in the legacy regex
+        assert normalizer.normalize("C++ programming") == "Programming"
+        assert normalizer.normalize("ci/cd pipelines") == "CI/CD"
+
+    @pytest.mark.parametrize("skill", [
+        "Python Programming",
+        "advanced machine learning and ai",
+        "Data Analysis in Excel",
+        "cloud computing on aws and gcp",
+        "UX/UI prototyping in Figma",
+        "C++ programming",
+        "c++11 templates",
+        "C# and .NET",
+        "full-stack web development",
+        "Power BI dashboards",
+        "public speaking and leadership",
+        "epidemiology for public health",
+        "quantum basket weaving",
+        "  Deep   Learning  ",
+        "ML",
+        "r",
+    ])
+    def test_matches_legacy(self, normalizer, skill):
+        assert normalizer.normalize(skill) == legacy_normalize(normalizer, skill)
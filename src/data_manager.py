@@ -24,8 +24,11 @@ from data_collection.course_fetcher_improved import CMUCourseFetcherImproved
 from data_collection.vr_app_fetcher_improved import VRAppFetcherImproved
 from skill_extraction.pipeline import SkillExtractionPipeline
 from knowledge_graph.builder import KnowledgeGraphBuilder
+from knowledge_graph.connection import Neo4jConnection
+from knowledge_graph.stats import GraphStats
 
 from src.config_manager import ConfigManager
+from src.records import file_info, iter_chunks
 
 # Import DB Repositories
 try:
@@ -40,6 +43,10 @@ try:
 except ImportError:
     MONGO_AVAILABLE = False
 
+# Jobs whose completion changes what /chat would recommend
+CACHE_INVALIDATING_JOBS = {"graph"}
+
+
 class JobManager:
     """Manages background data update jobs."""
     
@@ -53,6 +60,9 @@ class JobManager:
         self.base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         self.data_dir = os.path.join(self.base_dir, "data_collection", "data")
 
+        # Created on first status request; reused across polls
+        self._graph_stats: Optional[GraphStats] = None
+
     def get_data_stats(self) -> Dict[str, Any]:
         """Get stats about data files and DB."""
         stats = {
@@ -68,6 +78,11 @@ class JobManager:
                 stats["db_skills"] = SkillsRepository().count()
             except:
                 stats["db_status"] = "unavailable"
+
+        try:
+            stats["graph"] = self._get_graph_stats()
+        except Exception:
+            stats["graph_status"] = "unavailable"
         
         # Add job status
         if self.current_job:
@@ -78,27 +93,17 @@ class JobManager:
         
         return stats
 
+    def _get_graph_stats(self) -> Dict[str, Any]:
+        """Counts for the active graph build (cached per build version, no graph scan)."""
+        if self._graph_stats is None:
+            self._graph_stats = GraphStats(Neo4jConnection())
+        stats = self._graph_stats.get()
+        return {k: stats.get(k) for k in ("build", "version", "courses", "apps", "skills", "teaches", "develops")}
+
     def _get_file_info(self, filename: str) -> Dict[str, Any]:
-        """Get metadata for a JSON data file."""
-        filepath = os.path.join(self.data_dir, filename)
-        if not os.path.exists(filepath):
-            return {"exists": False, "count": 0, "last_updated": None}
-            
+        """Get metadata for a JSON data file (from its sidecar, see src/records.py)."""
         try:
-            stat = os.stat(filepath)
-            last_updated = datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d %H:%M:%S')
-            
-            # Read count (lightweight check)
-            with open(filepath, 'r') as f:
-                data = json.load(f)
-                count = len(data) if isinstance(data, list) else 0
-                
-            return {
-                "exists": True,
-                "count": count,
-                "last_updated": last_updated,
-                "size_kb": round(stat.st_size / 1024, 1)
-            }
+            return file_info(os.path.join(self.data_dir, filename))
         except Exception as e:
             return {"exists": True, "error": str(e)}
 
@@ -146,6 +151,9 @@ class JobManager:
             else:
                 self._log(f"Unknown job type: {job_type}")
                 
+            if job_type in CACHE_INVALIDATING_JOBS:
+                self._invalidate_recommendation_cache()
+
             self.current_job["status"] = "COMPLETED"
             self._log("Job completed successfully.")
             
@@ -156,10 +164,20 @@ class JobManager:
             import traceback
             traceback.print_exc()
 
+    def _invalidate_recommendation_cache(self):
+        """Drop cached /chat responses after the underlying data changed."""
+        try:
+            from src.rag.cache import invalidate_recommendation_cache
+            invalidate_recommendation_cache()
+            self._log("✓ Recommendation cache invalidated")
+        except Exception as e:
+            self._log(f"⚠ Failed to invalidate recommendation cache: {e}")
+
     def _extract_skills(self, params: Dict[str, Any]):
         """Run skill extraction pipeline."""
         top_n = params.get("top_n")
-        self._log(f"Starting Skill Extraction (Top N: {top_n if top_n else 'ALL'})...")
+        incremental = bool(params.get("incremental", False))
+        self._log(f"Starting Skill Extraction (Top N: {top_n if top_n else 'ALL'}, Incremental: {incremental})...")
         
         courses_path = os.path.join(self.data_dir, "courses.json")
         apps_path = os.path.join(self.data_dir, "vr_apps.json")
@@ -169,7 +187,7 @@ class JobManager:
             pipeline = SkillExtractionPipeline(logger=self._log)
             
             self._log("Processing courses and apps...")
-            pipeline.run(courses_path, apps_path, self.data_dir, top_n=top_n)
+            pipeline.run(courses_path, apps_path, self.data_dir, top_n=top_n, incremental=incremental)
             
             self._log("Skill extraction complete. Results saved to JSON.")
 
@@ -182,8 +200,10 @@ class JobManager:
 
     def _build_graph(self, params: Dict[str, Any]):
         """Run knowledge graph builder."""
-        clear_db = params.get("clear", True)
-        self._log(f"Starting Graph Build (Clear DB: {clear_db})...")
+        # Full build into a staging build with an atomic cutover by default;
+        # "delta": true syncs only what changed, in place (readers may see it partly applied)
+        delta = bool(params.get("delta", False)) and not params.get("clear", False)
+        self._log(f"Starting Graph Build (Mode: {'delta' if delta else 'full rebuild'})...")
         
         try:
             # Inject logger
@@ -191,7 +211,7 @@ class JobManager:
             
             self._log("Building graph in Neo4j...")
             # Builder now prefers MongoDB automatically
-            builder.build(data_dir=self.data_dir, clear=clear_db)
+            builder.build(data_dir=self.data_dir, clear=not delta, delta=delta)
             
             self._log("Graph build complete.")
             
@@ -228,7 +248,7 @@ class JobManager:
             
             # Save JSON
             save_path = os.path.join(self.data_dir, "courses.json")
-            fetcher.save_courses(courses, path=save_path)
+            save_path = fetcher.save_courses(courses, path=save_path)
             self._log(f"Saved to {save_path}")
 
             # Sync to MongoDB
@@ -261,7 +281,7 @@ class JobManager:
             
             # Save JSON
             save_path = os.path.join(self.data_dir, "vr_apps.json")
-            fetcher.save_apps(apps, path=save_path)
+            save_path = fetcher.save_apps(apps, path=save_path)
             self._log(f"Saved to {save_path}")
 
             # Sync to MongoDB
@@ -273,23 +293,20 @@ class JobManager:
         except Exception as e:
             raise e
 
+    def _upsert_file(self, repo, filename: str) -> int:
+        """Stream a data file into a MongoDB repository in bounded chunks."""
+        path = os.path.join(self.data_dir, filename)
+        return sum(repo.bulk_upsert(chunk) for chunk in iter_chunks(path))
+
     def _sync_skills_to_mongo(self):
         """Helper to sync extracted skills and mappings to MongoDB."""
         self._log("Syncing skills and mappings to MongoDB...")
         
-        # Load from JSON
+        # Stream from JSON into Mongo in bounded chunks
         try:
-            with open(os.path.join(self.data_dir, "skills.json")) as f:
-                skills = json.load(f)
-            with open(os.path.join(self.data_dir, "course_skills.json")) as f:
-                c_skills = json.load(f)
-            with open(os.path.join(self.data_dir, "app_skills.json")) as f:
-                a_skills = json.load(f)
-
-            # Write to Mongo
-            s_count = SkillsRepository().bulk_upsert(skills)
-            cs_count = CourseSkillsRepository().bulk_upsert(c_skills)
-            as_count = AppSkillsRepository().bulk_upsert(a_skills)
+            s_count = self._upsert_file(SkillsRepository(), "skills.json")
+            cs_count = self._upsert_file(CourseSkillsRepository(), "course_skills.json")
+            as_count = self._upsert_file(AppSkillsRepository(), "app_skills.json")
             
             self._log(f"✓ MongoDB Sync: {s_count} skills, {cs_count} course-skills, {as_count} app-skills")
         except Exception as e:
@@ -0,0 +1,296 @@
+"""Two-tier response cache for /chat recommendations.
+
+Tier 1 (exact): keyed on the normalized query string.
+Tier 2 (semantic): a near-match on query-embedding cosine similarity
+resolves to the exact key of a previously answered query.
+
+Payloads live in Redis (shared across gunicorn workers) when REDIS_URL is
+set, with an in-process LRU as fallback. The semantic index is kept per
+process. All entries are namespaced by a cache version; bumping the
+version (invalidate_recommendation_cache) drops every entry at once,
+which the JobManager does after a graph rebuild.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+
+REDIS_PREFIX = "vrrec:cache"
+VERSION_KEY = f"{REDIS_PREFIX}:version"
+
+# Live caches in this process, so invalidation can also clear local state
+_instances = weakref.WeakSet()
+
+
+def normalize_query(text: str) -> str:
+    """Canonical form used for exact-match keys."""
+    cleaned = re.sub(r"\s+", " ", (text or "").lower()).strip()
+    return cleaned.strip(" .!?")
+
+
+def _query_hash(normalized: str) -> str:
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+def _connect_redis(redis_url: Optional[str]):
+    """Return a Redis client, or None if Redis is unavailable."""
+    if not redis_url or redis is None:
+        return None
+    try:
+        client = redis.Redis.from_url(redis_url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        client.ping()
+        return client
+    except Exception as e:
+        print(f"   [Cache] Redis unavailable ({e}). Using in-process LRU.")
+        return None
+
+
+def invalidate_recommendation_cache(redis_url: Optional[str] = None):
+    """
+    Drop all cached recommendations.
+
+    Bumps the shared Redis version (affects every worker) and clears the
+    caches living in this process.
+    """
+    client = _connect_redis(redis_url or os.getenv("REDIS_URL"))
+    if client is not None:
+        try:
+            client.incr(VERSION_KEY)
+        except Exception as e:
+            print(f"   [Cache] Failed to bump Redis cache version: {e}")
+
+    for cache in list(_instances):
+        cache.clear()
+
+
+@dataclass
+class CacheLookup:
+    """Result of a cache lookup, reused when storing the fresh response."""
+    key: str
+    payload: Optional[Dict] = None
+    tier: Optional[str] = None           # "exact" | "semantic" | None (miss)
+    embedding: Optional[np.ndarray] = None
+    version: int = 0                     # Cache version the lookup was answered under
+    epoch: int = 0                       # Local clear() count at lookup time
+
+
+class RecommendationCache:
+    """Exact + semantic response cache backed by Redis or an in-process LRU."""
+
+    def __init__(
+        self,
+        embed_fn: Optional[Callable[[str], np.ndarray]] = None,
+        redis_url: Optional[str] = None,
+        ttl_seconds: int = 3600,
+        max_entries: int = 512,
+        similarity_threshold: float = 0.92
+    ):
+        """
+        Args:
+            embed_fn: Maps a query string to its embedding; None disables the semantic tier
+            redis_url: Redis connection URL; None uses the in-process LRU only
+            ttl_seconds: Time-to-live for cached responses
+            max_entries: LRU capacity (payloads and semantic index)
+            similarity_threshold: Minimum cosine similarity for a semantic hit
+        """
+        self.embed_fn = embed_fn
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        self.redis = _connect_redis(redis_url)
+
+        self._lock = threading.Lock()
+        self._lru = OrderedDict()            # key -> (expires_at, payload)
+        self._slots = OrderedDict()          # key -> row in self._vectors (LRU order)
+        self._vectors = None                 # (max_entries, dim) float32, unit rows
+        self._epoch = 0                      # Bumped by clear(); guards put() after a local clear
+        self._seen_version = 0
+        self._seen_version = self._read_version()
+
+        self.stats = {"exact_hits": 0, "semantic_hits": 0, "misses": 0}
+        _instances.add(self)
+
+        backend = "redis" if self.redis is not None else "memory"
+        print(f"   [Cache] Recommendation cache ready ({backend}, ttl={ttl_seconds}s, "
+              f"size={max_entries}, semantic={'on' if embed_fn else 'off'})")
+
+    @classmethod
+    def from_config(cls, embed_fn: Optional[Callable[[str], np.ndarray]] = None) -> Optional["RecommendationCache"]:
+        """Build a cache from ConfigManager settings, or None if disabled."""
+        from src.config_manager import ConfigManager
+
+        config = ConfigManager()
+        if str(config.get("RECOMMENDATION_CACHE_ENABLED", "true")).lower() in ("0", "false", "no", "off"):
+            return None
+
+        return cls(
+            embed_fn=embed_fn,
+            redis_url=config.get("REDIS_URL"),
+            ttl_seconds=int(config.get("RECOMMENDATION_CACHE_TTL", 3600)),
+            max_entries=int(config.get("RECOMMENDATION_CACHE_SIZE", 512)),
+            similarity_threshold=float(config.get("RECOMMENDATION_CACHE_SIMILARITY", 0.92))
+        )
+
+    # ------------------------------------------------------------------ #
+
+    def _read_version(self) -> int:
+        if self.redis is None:
+            return 0
+        try:
+            return int(self.redis.get(VERSION_KEY) or 0)
+        except Exception:
+            return self._seen_version
+
+    def _check_version(self) -> int:
+        """Drop local state if another process invalidated the cache."""
+        version = self._read_version()
+        if version != self._seen_version:
+            self.clear()
+            self._seen_version = version
+        return version
+
+    def _redis_key(self, version: int, key: str) -> str:
+        return f"{REDIS_PREFIX}:v{version}:q:{key}"
+
+    def _get_payload(self, version: int, key: str) -> Optional[Dict]:
+        if self.redis is not None:
+            try:
+                raw = self.redis.get(self._redis_key(version, key))
+                return json.loads(raw) if raw else None
+            except Exception as e:
+                print(f"   [Cache] Redis get failed: {e}")
+
+        with self._lock:
+            entry = self._lru.get(key)
+            if entry is None:
+                return None
+            expires_at, payload = entry
+            if expires_at < time.time():
+                del self._lru[key]
+                return None
+            self._lru.move_to_end(key)
+            return payload
+
+    def _set_payload(self, version: int, key: str, payload: Dict):
+        if self.redis is not None:
+            try:
+                self.redis.setex(self._redis_key(version, key), self.ttl_seconds, json.dumps(payload))
+                return
+            except Exception as e:
+                print(f"   [Cache] Redis set failed: {e}")
+
+        with self._lock:
+            self._lru[key] = (time.time() + self.ttl_seconds, payload)
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+
+    def _embed(self, text: str) -> Optional[np.ndarray]:
+        if self.embed_fn is None:
+            return None
+        try:
+            vec = np.asarray(self.embed_fn(text), dtype=np.float32).ravel()
+            norm = np.linalg.norm(vec)
+            return vec / norm if norm > 0 else None
+        except Exception as e:
+            print(f"   [Cache] Query embedding failed: {e}")
+            return None
+
+    def _nearest(self, embedding: np.ndarray) -> Optional[str]:
+        """Return the cached key most similar to embedding above the threshold."""
+        with self._lock:
+            if self._vectors is None or not self._slots:
+                return None
+            sims = self._vectors @ embedding
+            best = int(np.argmax(sims))
+            if sims[best] < self.similarity_threshold:
+                return None
+            for key, slot in self._slots.items():
+                if slot == best:
+                    return key
+        return None
+
+    def _index(self, key: str, embedding: np.ndarray):
+        """Add a key's embedding to the semantic index, evicting LRU rows."""
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = np.zeros((self.max_entries, embedding.shape[0]), dtype=np.float32)
+            if key in self._slots:
+                slot = self._slots[key]
+                self._slots.move_to_end(key)
+            elif len(self._slots) < self.max_entries:
+                slot = len(self._slots)
+                self._slots[key] = slot
+            else:
+                _, slot = self._slots.popitem(last=False)
+                self._slots[key] = slot
+            self._vectors[slot] = embedding
+
+    # ------------------------------------------------------------------ #
+
+    def get(self, text: str) -> CacheLookup:
+        """
+        Look up a response for text (exact first, then semantic).
+
+        Returns:
+            CacheLookup; pass it to put() after computing a response on a miss
+        """
+        version = self._check_version()
+        lookup = CacheLookup(key=_query_hash(normalize_query(text)), version=version, epoch=self._epoch)
+
+        payload = self._get_payload(version, lookup.key)
+        if payload is not None:
+            self.stats["exact_hits"] += 1
+            lookup.payload, lookup.tier = payload, "exact"
+            return lookup
+
+        lookup.embedding = self._embed(text)
+        if lookup.embedding is not None:
+            near_key = self._nearest(lookup.embedding)
+            if near_key is not None:
+                payload = self._get_payload(version, near_key)
+                if payload is not None:
+                    self.stats["semantic_hits"] += 1
+                    lookup.payload, lookup.tier = payload, "semantic"
+                    return lookup
+
+        self.stats["misses"] += 1
+        return lookup
+
+    def put(self, lookup: CacheLookup, payload: Dict):
+        """
+        Store the response computed for a missed lookup.
+
+        Skipped if the cache was invalidated since the lookup, so a response
+        built from the old graph/index is never stored under the new version.
+        """
+        version = self._check_version()
+        if version != lookup.version or self._epoch != lookup.epoch:
+            return
+        self._set_payload(version, lookup.key, payload)
+        if lookup.embedding is not None:
+            self._index(lookup.key, lookup.embedding)
+
+    def clear(self):
+        """Clear in-process state (LRU payloads and semantic index)."""
+        with self._lock:
+            self._epoch += 1
+            self._lru.clear()
+            self._slots.clear()
+            if self._vectors is not None:
+                self._vectors[:] = 0.0
@@ -1,7 +1,7 @@
 """Data models for RAG retrieval and recommendation system."""
 
-from dataclasses import dataclass
-from typing import List, Optional
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
 
 
 @dataclass
@@ -24,3 +24,4 @@ class RecommendationResult:
     query_understanding: str
     matched_skills: List[str]
     total_matches: int
+    timings: Dict[str, float] = field(default_factory=dict)  # Per-stage latency in ms
@@ -5,7 +5,7 @@ Uses OpenRouter API to re-rank applications and generate explanations.
 
 import os
 import json
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 from src.config_manager import ConfigManager
 
 try:
@@ -30,6 +30,17 @@ class LLMRanker:
         )
         self.model = self.config.openrouter_model
 
+    def _format_app_list(self, apps: List[Dict]) -> str:
+        """Render candidate apps as the bullet list used in ranking prompts."""
+        app_items = []
+        for app in apps:
+            info = f"- {app['name']} ({app['category']}): matches {', '.join(app['matched_skills'])}"
+            if app.get("retrieval_source") == "semantic_bridge":
+                info += f" [Note: {app.get('bridge_explanation', 'Indirect match')}]"
+            app_items.append(info)
+
+        return "\n".join(app_items)
+
     def rank_and_explain(self, query: str, apps: List[Dict]) -> List[Dict]:
         """
         Rank applications and generate reasoning for each.
@@ -45,14 +56,7 @@ class LLMRanker:
             return []
 
         # Build prompt
-        app_items = []
-        for app in apps:
-            info = f"- {app['name']} ({app['category']}): matches {', '.join(app['matched_skills'])}"
-            if app.get("retrieval_source") == "semantic_bridge":
-                info += f" [Note: {app.get('bridge_explanation', 'Indirect match')}]"
-            app_items.append(info)
-            
-        app_list = "\n".join(app_items)
+        app_list = self._format_app_list(apps)
 
         prompt = f"""User Query: "{query}"
 
@@ -89,17 +93,78 @@ Return JSON format:
                 app["reasoning"] = "Matches your learning interests"
             return apps
 
-    def _parse_rankings(self, content: str, apps: List[Dict]) -> List[Dict]:
+    def understand_and_rank(self, query: str, apps: List[Dict]) -> Tuple[str, List[Dict]]:
         """
-        Parse LLM response and extract rankings.
+        Summarize the query and explain each app in a single LLM call.
+
+        Combines understand_query and rank_and_explain into one structured
+        JSON response to halve LLM round trips on the /chat path.
+
+        Args:
+            query: User query string
+            apps: List of candidate VR applications
+
+        Returns:
+            Tuple of (query understanding, apps with reasoning added)
+        """
+        if not apps:
+            # Nothing to rank, so a single understanding call is all we need
+            return self.understand_query(query), []
+
+        app_list = self._format_app_list(apps)
+
+        prompt = f"""User Query: "{query}"
+
+Candidate VR Apps:
+{app_list}
+
+1. Summarize what the user wants to learn in one sentence.
+2. Generate a short reasoning for each app explaining why it fits the user's learning needs.
+If an app has [Note: ...], incorporate that context into the reasoning (e.g., "Indirect match via...").
+
+Return JSON format:
+{{
+    "understanding": "One-sentence summary in English",
+    "rankings": [
+        {{"name": "App Name", "reasoning": "Reasoning text in English"}},
+        ...
+    ]
+}}"""
+
+        try:
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": "You are an expert VR application recommender. Return JSON only. Output must be in English."},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.3,
+                max_tokens=1152
+            )
+            content = response.choices[0].message.content
+        except Exception as e:
+            print(f"LLM combined ranking error: {e}")
+            content = ""
+
+        data = self._load_json(content)
+        understanding = self._parse_understanding(data, query)
+        return understanding, self._apply_rankings(data, apps)
+
+    def _load_json(self, content: Optional[str]) -> Dict:
+        """
+        Extract the JSON object from an LLM response.
+
+        Handles markdown code fences and leading/trailing chatter.
 
         Args:
             content: LLM response text
-            apps: Original apps list
 
         Returns:
-            Apps with reasoning added
+            Parsed JSON object, or an empty dict if it cannot be parsed
         """
+        if not content:
+            return {}
+
         try:
             content = content.strip()
             if "```" in content:
@@ -107,11 +172,53 @@ Return JSON format:
                 if content.startswith("json"):
                     content = content[4:]
 
-            data = json.loads(content)
-            rankings = {r["name"]: r["reasoning"] for r in data.get("rankings", [])}
+            try:
+                data = json.loads(content)
+            except json.JSONDecodeError:
+                # Fall back to the outermost {...} span
+                start, end = content.find("{"), content.rfind("}")
+                if start == -1 or end <= start:
+                    raise
+                data = json.loads(content[start:end + 1])
+
+            return data if isinstance(data, dict) else {}
         except Exception as e:
             print(f"Parse error: {e}")
-            rankings = {}
+            return {}
+
+    def _parse_rankings(self, content: str, apps: List[Dict]) -> List[Dict]:
+        """
+        Parse LLM response and extract rankings.
+
+        Accepts both the rank-only schema ({"rankings": [...]}) and the
+        combined schema ({"understanding": "...", "rankings": [...]}).
+
+        Args:
+            content: LLM response text
+            apps: Original apps list
+
+        Returns:
+            Apps with reasoning added
+        """
+        return self._apply_rankings(self._load_json(content), apps)
+
+    def _apply_rankings(self, data: Dict, apps: List[Dict]) -> List[Dict]:
+        """
+        Attach per-app reasoning from parsed LLM output.
+
+        Args:
+            data: Parsed LLM response (may be empty)
+            apps: Original apps list
+
+        Returns:
+            Apps with reasoning added
+        """
+        rankings = {}
+        entries = data.get("rankings", [])
+        if isinstance(entries, list):
+            for r in entries:
+                if isinstance(r, dict) and r.get("name") and r.get("reasoning"):
+                    rankings[r["name"]] = str(r["reasoning"]).strip()
 
         # Add reasoning to each app
         for app in apps:
@@ -119,6 +226,22 @@ Return JSON format:
 
         return apps
 
+    def _parse_understanding(self, data: Dict, query: str) -> str:
+        """
+        Extract the one-sentence understanding from a combined response.
+
+        Args:
+            data: Parsed LLM response (may be empty)
+            query: User query string (used for the fallback text)
+
+        Returns:
+            Query understanding text
+        """
+        understanding = data.get("understanding")
+        if isinstance(understanding, str) and understanding.strip():
+            return understanding.strip()
+        return self.fallback_understanding(query)
+
     def understand_query(self, query: str) -> str:
         """
         Understand user query intent using LLM.
@@ -146,4 +269,9 @@ Return the summary directly, no other text. Output in English."""
             return response.choices[0].message.content.strip()
         except Exception as e:
             print(f"Query understanding error: {e}")
-            return f"Learning interest: {query}"
+            return self.fallback_understanding(query)
+
+    @staticmethod
+    def fallback_understanding(query: str) -> str:
+        """Understanding text used when the LLM call is skipped or fails."""
+        return f"Learning interest: {query}"
@@ -19,6 +19,9 @@ if vs_path not in sys.path:
 
 from vector_store.search_service import SkillSearchService
 from knowledge_graph.connection import Neo4jConnection
+from knowledge_graph.schema import ACTIVE_BUILD, COURSE_TEXT_INDEX, fulltext_query
+from .cache import invalidate_recommendation_cache
+from .skill_index import SkillAppIndex
 
 
 class RAGRetriever:
@@ -33,14 +36,21 @@ class RAGRetriever:
         
         self.skill_search = SkillSearchService(persist_dir=persist_dir)
         self.graph = Neo4jConnection()
+        # In-memory DEVELOPS index keeps Neo4j off the per-request path
+        self.skill_index = SkillAppIndex(self.graph)
+        self.skill_index.load()
         self.active_skills = self._get_active_skills()
         print(f"   [RAG] Loaded {len(self.active_skills)} active skills (skills with VR Apps)")
 
     def _get_active_skills(self) -> List[str]:
         """Fetch all skills that are actually connected to VR Apps."""
+        if self.skill_index.ready:
+            return self.skill_index.active_skills
+
         try:
-            cypher = """
-            MATCH (s:Skill)<-[:DEVELOPS]-(a:VRApp)
+            cypher = f"""
+            {ACTIVE_BUILD}
+            MATCH (s:Skill {{build: build}})<-[:DEVELOPS]-(a:VRApp)
             RETURN DISTINCT s.name as skill
             """
             result = self.graph.query(cypher)
@@ -49,6 +59,28 @@ class RAGRetriever:
             print(f"   [RAG] Warning: Failed to load active skills: {e}")
             return []
 
+    def refresh(self) -> bool:
+        """
+        Pick up a new graph build or a re-synced vector index.
+
+        Both are version-checked periodically, not per request. When either
+        changed, cached /chat responses are dropped, since they were built
+        from the old data.
+
+        Returns:
+            True if anything was reloaded
+        """
+        changed = False
+        if self.skill_index.maybe_refresh():
+            self.active_skills = self._get_active_skills()
+            self.skill_search.invalidate_bridge_matrix()
+            changed = True
+        if self.skill_search.maybe_refresh():
+            changed = True
+        if changed:
+            invalidate_recommendation_cache()
+        return changed
+
     def retrieve(self, query: str, top_k: int = 8) -> List[Dict]:
         """
         Main retrieval function.
@@ -64,11 +96,9 @@ class RAGRetriever:
         Returns:
             List of dictionaries containing VR application data
         """
-        # Auto-refresh active skills if empty (handles case where graph was built after startup)
-        if not self.active_skills:
-            print("   [RAG] Active skills cache is empty. Refreshing from graph...")
-            self.active_skills = self._get_active_skills()
-            print(f"   [RAG] Refreshed: {len(self.active_skills)} active skills loaded")
+        # Pick up a new graph build or vector index; this also covers a
+        # graph first built after startup
+        self.refresh()
 
         candidates = {}
         
@@ -78,7 +108,11 @@ class RAGRetriever:
         # --- Strategy 1: Direct Skill Retrieval ---
         # Vector search for related skills -> Apps
         # We get more candidates initially to filter
-        related_skills = self.skill_search.find_related_skills(query, top_k=10)
+        # Embed the query once and share it across both strategies
+        query_embedding = self.skill_search.encode_query(query)
+        related_skills = self.skill_search.find_related_skills(
+            query, top_k=10, query_embedding=query_embedding
+        )
         
         if related_skills:
             direct_apps = self._query_apps_by_skills(related_skills, top_k)
@@ -96,7 +130,8 @@ class RAGRetriever:
                 query, 
                 self.active_skills, 
                 top_k=5, 
-                min_similarity=BRIDGE_SIMILARITY_THRESHOLD
+                min_similarity=BRIDGE_SIMILARITY_THRESHOLD,
+                query_embedding=query_embedding
             )
             
             if bridged_skills_data:
@@ -141,7 +176,7 @@ class RAGRetriever:
     def _query_apps_by_course(self, query_text: str, top_k: int) -> List[Dict]:
         """
         Query Neo4j for VR apps recommended for a specific course.
-        Matches course_id (exact/regex) or title (fuzzy).
+        Matches course_id (exact/regex) or title/description (full-text index).
         """
         import re
         
@@ -155,8 +190,9 @@ class RAGRetriever:
             course_id = course_id_match.group(1)
             print(f"   [Course Search] Detected Course ID: {course_id}")
             
-            cypher = """
-            MATCH (c:Course {course_id: $course_id})
+            cypher = f"""
+            {ACTIVE_BUILD}
+            MATCH (c:Course {{course_id: $course_id, build: build}})
             MATCH (c)-[r:RECOMMENDS]->(a:VRApp)
             RETURN a.app_id AS app_id,
                    a.name AS name,
@@ -169,12 +205,46 @@ class RAGRetriever:
             """
             return self.graph.query(cypher, {"course_id": course_id, "top_k": top_k})
 
-        # 2. Fallback: Title contains search
-        # Only perform if the query is short enough to be a title, or risk false positives?
-        # For now, we stick to the simple CONTAINS but maybe boost matches
-        
-        cypher = """
-        MATCH (c:Course)
+        # 2. Fallback: full-text search on title (boosted) and description,
+        # best-matching courses first
+        search = fulltext_query(clean_query, {"title": 2, "description": 1})
+        if not search:
+            return []
+
+        cypher = f"""
+        {ACTIVE_BUILD}
+        CALL db.index.fulltext.queryNodes($index, $search) YIELD node AS c, score AS match_score
+        WITH c, match_score, build WHERE c.build = build
+        WITH c, match_score LIMIT $course_limit
+        MATCH (c)-[r:RECOMMENDS]->(a:VRApp)
+        WITH a, r, match_score
+        ORDER BY match_score DESC, r.score DESC
+        WITH a, collect(r)[0] AS r, max(match_score) AS match_score
+        RETURN a.app_id AS app_id,
+               a.name AS name,
+               a.category AS category,
+               a.description AS description,
+               r.shared_skills AS matched_skills,
+               r.score AS score,
+               match_score
+        ORDER BY match_score DESC, score DESC
+        LIMIT $top_k
+        """
+
+        try:
+            return self.graph.query(cypher, {
+                "index": COURSE_TEXT_INDEX,
+                "search": search,
+                "course_limit": 20,
+                "top_k": top_k
+            })
+        except Exception as e:
+            # Index missing (graph built before it existed): scan titles instead
+            print(f"   [Course Search] Warning: Full-text search failed ({e}); scanning titles")
+
+        cypher = f"""
+        {ACTIVE_BUILD}
+        MATCH (c:Course {{build: build}})
         WHERE toLower(c.title) CONTAINS toLower($query)
         MATCH (c)-[r:RECOMMENDS]->(a:VRApp)
         RETURN a.app_id AS app_id,
@@ -196,7 +266,10 @@ class RAGRetriever:
 
     def _query_apps_by_skills(self, skills: List[str], top_k: int) -> List[Dict]:
         """
-        Query Neo4j knowledge graph for VR applications based on skills.
+        Find VR applications based on skills.
+
+        Served from the in-memory SkillAppIndex; falls back to querying
+        Neo4j directly if the index could not be loaded.
 
         Args:
             skills: List of skill names
@@ -205,8 +278,12 @@ class RAGRetriever:
         Returns:
             List of VR application dictionaries
         """
-        cypher = """
-        MATCH (s:Skill)<-[d:DEVELOPS]-(a:VRApp)
+        if self.skill_index.ready:
+            return self.skill_index.query(skills, top_k)
+
+        cypher = f"""
+        {ACTIVE_BUILD}
+        MATCH (s:Skill {{build: build}})<-[d:DEVELOPS]-(a:VRApp)
         WHERE s.name IN $skills
         WITH a, collect(s.name) AS matched_skills, sum(d.weight) AS score
         RETURN a.app_id AS app_id,
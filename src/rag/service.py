@@ -3,20 +3,62 @@
 Orchestrates the complete retrieval and ranking pipeline.
 """
 
-from typing import List
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+from src.config_manager import ConfigManager
 from .retriever import RAGRetriever
 from .ranker import LLMRanker
 from .models import RecommendationResult, VRAppMatch
 
 
+# Query understanding execution modes (config key: RAG_QUERY_UNDERSTANDING)
+#   sequential - understand the query, then retrieve (original behaviour)
+#   concurrent - run the understanding LLM call while retrieval runs
+#   combined   - one LLM call returns both the understanding and the rankings
+#   off        - skip the understanding LLM call entirely
+UNDERSTANDING_MODES = ("sequential", "concurrent", "combined", "off")
+DEFAULT_UNDERSTANDING_MODE = "concurrent"
+
+
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 2)
+
+
 class RAGService:
     """RAG recommendation service main entry point."""
 
-    def __init__(self):
-        """Initialize the RAG service with retriever and ranker."""
+    def __init__(self, understanding_mode: Optional[str] = None):
+        """
+        Initialize the RAG service with retriever and ranker.
+
+        Args:
+            understanding_mode: One of UNDERSTANDING_MODES. Defaults to the
+                RAG_QUERY_UNDERSTANDING config value ("concurrent" if unset).
+        """
         self.retriever = RAGRetriever()
         self.ranker = LLMRanker()
 
+        mode = understanding_mode or ConfigManager().get(
+            "RAG_QUERY_UNDERSTANDING", DEFAULT_UNDERSTANDING_MODE
+        )
+        mode = str(mode).strip().lower()
+        if mode not in UNDERSTANDING_MODES:
+            print(f"   [RAG] Unknown query understanding mode '{mode}', using '{DEFAULT_UNDERSTANDING_MODE}'")
+            mode = DEFAULT_UNDERSTANDING_MODE
+        self.understanding_mode = mode
+
+        # Shared pool for the understanding call; sized for gunicorn's threads per worker
+        self._executor = None
+        if self.understanding_mode == "concurrent":
+            self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="rag-understand")
+
+    def _timed_understand(self, query: str):
+        """Run query understanding and return (understanding, elapsed_ms)."""
+        start = time.perf_counter()
+        understanding = self.ranker.understand_query(query)
+        return understanding, _elapsed_ms(start)
+
     def recommend(self, query: str, top_k: int = 8) -> RecommendationResult:
         """
         Generate VR app recommendations for a user query.
@@ -26,24 +68,61 @@ class RAGService:
             top_k: Number of recommendations to return
 
         Returns:
-            RecommendationResult with apps and metadata
+            RecommendationResult with apps, metadata and per-stage timings (ms)
         """
-        # 1. Understand the query
-        query_understanding = self.ranker.understand_query(query)
+        total_start = time.perf_counter()
+        timings = {}
+        understanding_future = None
+
+        # 1. Understand the query (retrieval does not depend on it)
+        if self.understanding_mode == "sequential":
+            query_understanding, timings["understand_ms"] = self._timed_understand(query)
+        elif self.understanding_mode == "concurrent":
+            understanding_future = self._executor.submit(self._timed_understand, query)
+        elif self.understanding_mode == "combined":
+            # Produced by the ranking call below
+            query_understanding = None
+        else:
+            query_understanding = self.ranker.fallback_understanding(query)
+            timings["understand_ms"] = 0.0
 
-        # 2. Retrieve candidate applications
-        candidates = self.retriever.retrieve(query, top_k=top_k * 2)
+        # 2. Retrieve candidate applications (vector search + graph lookup)
+        start = time.perf_counter()
+        try:
+            candidates = self.retriever.retrieve(query, top_k=top_k * 2)
+        finally:
+            timings["retrieve_ms"] = _elapsed_ms(start)
+            if understanding_future is not None:
+                wait_start = time.perf_counter()
+                try:
+                    query_understanding, timings["understand_ms"] = understanding_future.result()
+                except Exception as e:
+                    # Never let the overlapped call fail (or mask a retrieval error)
+                    print(f"   [RAG] Query understanding failed: {e}")
+                    query_understanding = self.ranker.fallback_understanding(query)
+                    timings["understand_ms"] = 0.0
+                # Time /chat actually spent blocked on the LLM after retrieval finished
+                timings["understand_wait_ms"] = _elapsed_ms(wait_start)
 
         if not candidates:
+            if query_understanding is None:
+                query_understanding, timings["understand_ms"] = self._timed_understand(query)
+            timings["total_ms"] = _elapsed_ms(total_start)
             return RecommendationResult(
                 apps=[],
                 query_understanding=query_understanding,
                 matched_skills=[],
-                total_matches=0
+                total_matches=0,
+                timings=timings
             )
 
         # 3. Rank and explain using LLM
-        ranked_apps = self.ranker.rank_and_explain(query, candidates)
+        start = time.perf_counter()
+        if self.understanding_mode == "combined":
+            query_understanding, ranked_apps = self.ranker.understand_and_rank(query, candidates)
+        else:
+            ranked_apps = self.ranker.rank_and_explain(query, candidates)
+        timings["rank_ms"] = _elapsed_ms(start)
 
         # 4. Build final result
         all_skills = set()
@@ -62,13 +141,18 @@ class RAGService:
                 bridge_explanation=app.get("bridge_explanation", "")
             ))
 
+        timings["total_ms"] = _elapsed_ms(total_start)
+
         return RecommendationResult(
             apps=app_matches,
             query_understanding=query_understanding,
             matched_skills=list(all_skills),
-            total_matches=len(candidates)
+            total_matches=len(candidates),
+            timings=timings
         )
 
     def close(self):
         """Close service connections."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
         self.retriever.close()
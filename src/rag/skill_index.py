@@ -0,0 +1,211 @@
+"""In-process Skill -> VRApp adjacency index.
+
+Loads the (Skill)<-[:DEVELOPS]-(VRApp) graph once and keeps it as CSR
+arrays (per skill: app indices and DEVELOPS weights), so the per-request
+skill lookup is a NumPy gather + bincount instead of a Cypher query.
+
+The index tracks the graph build version written by KnowledgeGraphBuilder
+and reloads itself when a newer build is detected. Only the active build
+(GraphMeta.active_build) is loaded, so a build in progress is never seen.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class _Snapshot:
+    """Immutable index contents; swapped atomically on reload."""
+    version: Optional[int]
+    skill_ids: Dict[str, int]    # skill name -> row
+    skill_names: List[str]       # row -> skill name
+    indptr: np.ndarray           # (n_skills + 1,) int64
+    app_idx: np.ndarray          # (n_edges,) int32
+    weights: np.ndarray          # (n_edges,) float64
+    apps: List[Dict]             # app index -> {app_id, name, category, description}
+
+
+class SkillAppIndex:
+    """CSR index of DEVELOPS edges keyed by skill."""
+
+    def __init__(self, graph, refresh_interval: float = 30.0):
+        """
+        Args:
+            graph: Neo4jConnection used to load the index and poll the build version
+            refresh_interval: Seconds between build-version checks
+        """
+        self.graph = graph
+        self.refresh_interval = refresh_interval
+        self._snapshot: Optional[_Snapshot] = None
+        self._last_check = 0.0
+        self._refresh_lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self._snapshot is not None
+
+    @property
+    def version(self) -> Optional[int]:
+        return self._snapshot.version if self._snapshot else None
+
+    @property
+    def active_skills(self) -> List[str]:
+        """Skills with at least one DEVELOPS edge."""
+        return list(self._snapshot.skill_names) if self._snapshot else []
+
+    def _fetch_version(self) -> Optional[int]:
+        try:
+            result = self.graph.query(
+                "MATCH (m:GraphMeta {key: 'build'}) RETURN m.version AS version"
+            )
+            return result[0]["version"] if result else None
+        except Exception as e:
+            print(f"   [SkillIndex] Warning: Failed to read graph version: {e}")
+            return None
+
+    def load(self) -> bool:
+        """
+        (Re)load the index from Neo4j.
+
+        Returns:
+            True if the index was loaded successfully
+        """
+        version = self._fetch_version()
+        try:
+            rows = self.graph.query("""
+            MATCH (meta:GraphMeta {key: 'build'})
+            MATCH (s:Skill {build: meta.active_build})<-[d:DEVELOPS]-(a:VRApp)
+            RETURN s.name AS skill,
+                   a.app_id AS app_id,
+                   a.name AS name,
+                   a.category AS category,
+                   a.description AS description,
+                   d.weight AS weight
+            ORDER BY skill
+            """)
+        except Exception as e:
+            print(f"   [SkillIndex] Warning: Failed to load DEVELOPS edges: {e}")
+            return False
+
+        app_ids: Dict[str, int] = {}
+        apps: List[Dict] = []
+        skill_ids: Dict[str, int] = {}
+        skill_names: List[str] = []
+        indptr = [0]
+        app_idx = []
+        weights = []
+
+        for r in rows:
+            if r["skill"] not in skill_ids:
+                if skill_names:
+                    indptr.append(len(app_idx))
+                skill_ids[r["skill"]] = len(skill_names)
+                skill_names.append(r["skill"])
+
+            if r["app_id"] not in app_ids:
+                app_ids[r["app_id"]] = len(apps)
+                apps.append({
+                    "app_id": r["app_id"],
+                    "name": r["name"],
+                    "category": r["category"],
+                    "description": r["description"],
+                })
+
+            app_idx.append(app_ids[r["app_id"]])
+            # sum() in Cypher ignores nulls; a zero weight is equivalent
+            weights.append(r["weight"] if r["weight"] is not None else 0.0)
+
+        if skill_names:
+            indptr.append(len(app_idx))
+
+        self._snapshot = _Snapshot(
+            version=version,
+            skill_ids=skill_ids,
+            skill_names=skill_names,
+            indptr=np.asarray(indptr, dtype=np.int64),
+            app_idx=np.asarray(app_idx, dtype=np.int32),
+            weights=np.asarray(weights, dtype=np.float64),
+            apps=apps,
+        )
+        self._last_check = time.monotonic()
+        print(f"   [SkillIndex] Loaded {len(skill_names)} skills, {len(apps)} apps, "
+              f"{len(app_idx)} DEVELOPS edges (graph version {version})")
+        return True
+
+    def maybe_refresh(self) -> bool:
+        """
+        Reload if the graph build version changed (checked at most every
+        refresh_interval seconds, by one thread at a time).
+
+        Returns:
+            True if the index was reloaded
+        """
+        if time.monotonic() - self._last_check < self.refresh_interval:
+            return False
+        if not self._refresh_lock.acquire(blocking=False):
+            return False
+        try:
+            self._last_check = time.monotonic()
+            version = self._fetch_version()
+            # No version marker means a build is in progress (or the graph was
+            # cleared); keep serving the current snapshot until one is written
+            if self._snapshot is not None and version in (None, self._snapshot.version):
+                return False
+            return self.load()
+        finally:
+            self._refresh_lock.release()
+
+    def query(self, skills: List[str], top_k: int) -> List[Dict]:
+        """
+        Score apps by the sum of DEVELOPS weights over the given skills.
+
+        Equivalent to the Cypher in RAGRetriever._query_apps_by_skills:
+        ORDER BY score DESC, size(matched_skills) DESC LIMIT top_k.
+
+        Args:
+            skills: List of skill names
+            top_k: Maximum number of results
+
+        Returns:
+            List of VR application dictionaries
+        """
+        snap = self._snapshot
+        if snap is None or not snap.apps:
+            return []
+
+        rows = [snap.skill_ids[s] for s in dict.fromkeys(skills) if s in snap.skill_ids]
+        if not rows:
+            return []
+
+        rows = np.asarray(rows, dtype=np.int64)
+        spans = [np.arange(snap.indptr[r], snap.indptr[r + 1]) for r in rows]
+        edges = np.concatenate(spans)
+        edge_apps = snap.app_idx[edges]
+
+        n_apps = len(snap.apps)
+        scores = np.bincount(edge_apps, weights=snap.weights[edges], minlength=n_apps)
+        counts = np.bincount(edge_apps, minlength=n_apps)
+
+        hit = np.flatnonzero(counts)
+        # lexsort: last key is primary -> score desc, then matched count desc
+        order = hit[np.lexsort((-counts[hit], -scores[hit]))][:top_k]
+
+        selected = set(order.tolist())
+        matched = {a: [] for a in selected}
+        for r, span in zip(rows, spans):
+            for a in snap.app_idx[span].tolist():
+                if a in selected:
+                    matched[a].append(snap.skill_names[r])
+
+        results = []
+        for a in order.tolist():
+            app = dict(snap.apps[a])
+            app["matched_skills"] = matched[a]
+            app["score"] = float(scores[a])
+            results.append(app)
+
+        return results
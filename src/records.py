@@ -0,0 +1,387 @@
+"""Reading and writing the data files.
+
+A dataset (courses, VR apps, skills, the skill mappings) is addressed by its
+logical path, e.g. ``data/courses.json``, and stored next to it in one of
+three formats:
+
+  .jsonl  JSON Lines, one compact record per line (what write_records emits)
+  .npz    columnar: one array per field, string fields dictionary-encoded;
+          meant for the flat mapping tables, where skill names repeat
+  .json   a JSON array (the historical ``indent=2`` files, still readable)
+
+Readers resolve the logical path to the most recently written of these, so
+the legacy .json files (tracked in git, and still opened directly by a few
+older scripts) are left in place when a newer format is written. Text formats
+are read incrementally: records are decoded from a bounded text buffer and
+handed out one at a time or in chunks of ``chunk_size``, so a consumer never
+holds more than one chunk of a large file.
+
+Each data file can carry a sidecar ``<file>.meta.json`` with its record
+count, SHA-256 and the size/mtime it was computed for. ``file_info`` trusts
+the sidecar while size and mtime still match and only rescans (once) after
+the file changed, so status checks do not parse the data.
+"""
+
+import codecs
+import hashlib
+import json
+import os
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+
+DEFAULT_CHUNK_SIZE = int(os.getenv("RECORDS_CHUNK_SIZE", "1000"))
+
+# Bytes read per step of the incremental parser
+READ_SIZE = 64 * 1024
+
+META_SUFFIX = ".meta.json"
+
+JSON_EXT = ".json"
+JSONL_EXT = ".jsonl"
+COLUMNAR_EXT = ".npz"
+# Preference order when two formats of a dataset were written at the same time
+ARTIFACT_EXTS = (COLUMNAR_EXT, JSONL_EXT, JSON_EXT)
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\r\n"
+
+
+def metadata_path(path: str) -> str:
+    """Sidecar metadata file for a data file."""
+    return path + META_SUFFIX
+
+
+def _formats(path: str) -> List[str]:
+    """Every file a logical data path can be stored as."""
+    stem, ext = os.path.splitext(path)
+    if ext not in ARTIFACT_EXTS:
+        return [path]
+    return [stem + e for e in ARTIFACT_EXTS]
+
+
+def artifact_path(path: str) -> str:
+    """
+    File a logical data path is stored in.
+
+    The most recently written of its formats, so a dataset rewritten by an
+    older tool as plain .json is not shadowed by a stale .jsonl.
+
+    Args:
+        path: Logical path (any of the dataset's extensions)
+
+    Returns:
+        Existing file for the dataset, or path itself if there is none
+    """
+    existing = [p for p in _formats(path) if os.path.exists(p)]
+    if not existing:
+        return path
+    return max(existing, key=lambda p: os.stat(p).st_mtime_ns)
+
+
+def _blocks(path: str, digest=None) -> Iterator[str]:
+    """Decoded text blocks of a file, feeding the raw bytes to digest."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    with open(path, "rb") as f:
+        while True:
+            raw = f.read(READ_SIZE)
+            if digest is not None:
+                digest.update(raw)
+            if not raw:
+                tail = decoder.decode(b"", final=True)
+                if tail:
+                    yield tail
+                return
+            yield decoder.decode(raw)
+
+
+def _parse(blocks: Iterator[str]) -> Iterator[Dict]:
+    """
+    Records from a JSON array or JSON Lines text stream.
+
+    A JSON array is consumed element by element: the buffer holds at most
+    the element being decoded plus one read block.
+    """
+    buffer = ""
+    pos = 0
+    eof = False
+    in_array = None  # Decided by the first non-whitespace character
+
+    def fill() -> bool:
+        nonlocal buffer, pos, eof
+        block = next(blocks, None)
+        if block is None:
+            eof = True
+            return False
+        buffer = buffer[pos:] + block
+        pos = 0
+        return True
+
+    while True:
+        # Skip separators: whitespace, plus '[' ',' ']' inside an array
+        while True:
+            while pos < len(buffer) and (buffer[pos] in _WHITESPACE or (in_array and buffer[pos] in ",]")):
+                pos += 1
+            if pos < len(buffer) or not fill():
+                break
+        if pos >= len(buffer):
+            return
+
+        if in_array is None:
+            in_array = buffer[pos] == "["
+            if in_array:
+                pos += 1
+                continue
+
+        while True:
+            try:
+                record, end = _decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # Element split across blocks: read more and retry
+                if not fill():
+                    raise
+                continue
+            # A bare value ending exactly at the buffer end may continue in the next block
+            if end == len(buffer) and not eof and not isinstance(record, (dict, list)):
+                if fill():
+                    continue
+            break
+        pos = end
+        yield record
+
+
+def _utf8_json(value) -> np.ndarray:
+    """A JSON value as a uint8 array (string arrays in NumPy are fixed-width UTF-32)."""
+    return np.frombuffer(json.dumps(value, ensure_ascii=False).encode("utf-8"), dtype=np.uint8)
+
+
+def _encode_columns(records: List[Dict]) -> Dict[str, np.ndarray]:
+    """
+    Columnar arrays for flat records.
+
+    Numeric fields are stored as-is, with a boolean mask of missing (None)
+    values if there are any; string fields as a sorted dictionary of
+    distinct values plus int32 codes (-1 for None).
+    """
+    fields = list(dict.fromkeys(field for record in records for field in record))
+    arrays = {"__fields__": _utf8_json(fields)}
+    for field in fields:
+        values = [record.get(field) for record in records]
+        numbers = [v for v in values if v is not None]
+        if numbers and all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in numbers):
+            missing = np.fromiter((v is None for v in values), dtype=bool, count=len(values))
+            # The placeholder keeps an all-int column int; the mask restores None
+            arrays[f"{field}__numbers"] = np.asarray([0 if v is None else v for v in values])
+            if missing.any():
+                arrays[f"{field}__missing"] = missing
+        elif all(v is None or isinstance(v, str) for v in values):
+            distinct = sorted({v for v in values if v is not None})
+            codes = {v: i for i, v in enumerate(distinct)}
+            arrays[f"{field}__values"] = _utf8_json(distinct)
+            arrays[f"{field}__codes"] = np.fromiter(
+                (codes[v] if v is not None else -1 for v in values), dtype=np.int32, count=len(values)
+            )
+        else:
+            raise ValueError(f"Field '{field}' is not a flat string or number column; write it as JSON Lines")
+    return arrays
+
+
+def _iter_columnar(path: str) -> Iterator[Dict]:
+    """Records of a columnar (.npz) data file."""
+    with np.load(path, allow_pickle=False) as data:
+        fields = json.loads(data["__fields__"].tobytes())
+        columns = []
+        for field in fields:
+            if f"{field}__numbers" in data.files:
+                column = data[f"{field}__numbers"].tolist()
+                if f"{field}__missing" in data.files:
+                    for i in np.flatnonzero(data[f"{field}__missing"]).tolist():
+                        column[i] = None
+                columns.append(column)
+            else:
+                values = json.loads(data[f"{field}__values"].tobytes()) + [None]  # code -1 -> None
+                columns.append([values[code] for code in data[f"{field}__codes"].tolist()])
+    for row in zip(*columns):
+        yield dict(zip(fields, row))
+
+
+def _iter_lines(path: str) -> Iterator[Dict]:
+    """
+    Records of a JSON Lines file.
+
+    Lines are read in blocks of about READ_SIZE bytes and decoded with one
+    json.loads per block, which is much cheaper than one call per line.
+    """
+    with open(path, "r", encoding="utf-8-sig") as f:
+        while True:
+            lines = f.readlines(READ_SIZE)
+            if not lines:
+                return
+            yield from json.loads("[" + ",".join(line for line in lines if line.strip()) + "]")
+
+
+def iter_records(path: str) -> Iterator[Dict]:
+    """
+    Yield the records of a data file one at a time.
+
+    Args:
+        path: Logical path of the dataset (see artifact_path)
+
+    Returns:
+        Iterator over records
+    """
+    path = artifact_path(path)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Data file not found: {path}")
+    if path.endswith(COLUMNAR_EXT):
+        return _iter_columnar(path)
+    if path.endswith(JSONL_EXT):
+        return _iter_lines(path)
+    return _parse(_blocks(path))
+
+
+def iter_chunks(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[List[Dict]]:
+    """
+    Yield the records of a data file in lists of at most chunk_size.
+
+    Args:
+        path: Path to the data file
+        chunk_size: Records per chunk (default: RECORDS_CHUNK_SIZE env var or 1000)
+
+    Returns:
+        Iterator over record chunks
+    """
+    chunk = []
+    for record in iter_records(path):
+        chunk.append(record)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def load_records(path: str) -> List[Dict]:
+    """All records of a data file (for consumers that need them at once)."""
+    return list(iter_records(path))
+
+
+def write_metadata(path: str, count: Optional[int] = None) -> Dict:
+    """
+    Compute and store the sidecar metadata of a data file.
+
+    Writers that know their record count pass it, so only the bytes are
+    hashed; otherwise the file is scanned once to count its records.
+
+    Args:
+        path: Path to the data file
+        count: Number of records, if known
+
+    Returns:
+        Metadata: count, sha256, size, mtime
+    """
+    digest = hashlib.sha256()
+    if count is None and not path.endswith(COLUMNAR_EXT):
+        count = sum(1 for _ in _parse(_blocks(path, digest)))
+    else:
+        with open(path, "rb") as f:
+            for raw in iter(lambda: f.read(READ_SIZE), b""):
+                digest.update(raw)
+        if count is None:
+            count = sum(1 for _ in _iter_columnar(path))
+
+    stat = os.stat(path)
+    meta = {
+        "count": count,
+        "sha256": digest.hexdigest(),
+        "size": stat.st_size,
+        "mtime": stat.st_mtime_ns,
+    }
+    tmp = metadata_path(path) + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.replace(tmp, metadata_path(path))
+    return meta
+
+
+def read_metadata(path: str) -> Optional[Dict]:
+    """Sidecar metadata of a data file, or None if missing or stale."""
+    try:
+        stat = os.stat(path)
+        with open(metadata_path(path), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if meta.get("size") != stat.st_size or meta.get("mtime") != stat.st_mtime_ns:
+        return None
+    return meta
+
+
+def file_info(path: str) -> Dict:
+    """
+    Status of a data file from its sidecar metadata.
+
+    The data is only scanned when the sidecar is missing or stale, and the
+    refreshed sidecar is written back for the next check.
+
+    Args:
+        path: Logical path of the dataset (see artifact_path)
+
+    Returns:
+        Dictionary with exists, file, count, sha256, last_updated, size_kb
+    """
+    path = artifact_path(path)
+    if not os.path.exists(path):
+        return {"exists": False, "count": 0, "last_updated": None}
+
+    meta = read_metadata(path)
+    if meta is None:
+        meta = write_metadata(path)
+    return {
+        "exists": True,
+        "file": os.path.basename(path),
+        "count": meta["count"],
+        "sha256": meta["sha256"],
+        "last_updated": datetime.fromtimestamp(meta["mtime"] / 1e9).strftime('%Y-%m-%d %H:%M:%S'),
+        "size_kb": round(meta["size"] / 1024, 1),
+    }
+
+
+def write_records(path: str, records: Iterable[Dict], columnar: bool = False) -> str:
+    """
+    Write a dataset as JSON Lines, or columnar, with its sidecar metadata.
+
+    The dataset's other formats (e.g. a legacy .json) are left alone; being
+    newer, the written file is the one readers resolve to. Writes go through
+    a temporary file and an atomic rename; readers never see a partial file.
+
+    Args:
+        path: Logical path of the dataset, e.g. data/course_skills.json
+        records: Records to write (streamed for JSON Lines)
+        columnar: Write the columnar .npz format (flat records only)
+
+    Returns:
+        Path of the written file
+    """
+    target = os.path.splitext(path)[0] + (COLUMNAR_EXT if columnar else JSONL_EXT)
+    os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+
+    tmp = target + ".tmp"
+    if columnar:
+        records = list(records)
+        with open(tmp, "wb") as f:
+            np.savez_compressed(f, **_encode_columns(records))
+        count = len(records)
+    else:
+        count = 0
+        with open(tmp, "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")))
+                f.write("\n")
+                count += 1
+    os.replace(tmp, target)
+
+    write_metadata(target, count)
+    return target
@@ -0,0 +1,14 @@
+"""
+Shared setup for the src/ unit tests.
+"""
+
+import os
+import sys
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+# src.db connects at import time; these tests mock every repository, so point
+# the client at localhost instead of whatever cluster .env names.
+os.environ.setdefault("MONGODB_URI", "mongodb://localhost:27017/")
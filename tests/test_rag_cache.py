@@ -0,0 +1,151 @@
+"""
+Tests for the two-tier recommendation cache.
+"""
+
+import json
+
+import numpy as np
+
+from src.rag import cache as cache_module
+from src.rag.cache import RecommendationCache, invalidate_recommendation_cache, normalize_query
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the redis commands the cache uses."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def setex(self, key, ttl, value):
+        self.data[key] = value.encode("utf-8") if isinstance(value, str) else value
+
+    def incr(self, key):
+        self.data[key] = int(self.data.get(key) or 0) + 1
+        return self.data[key]
+
+
+VECTORS = {
+    "learn python": [1.0, 0.0, 0.0],
+    "learning python": [0.99, 0.14, 0.0],
+    "learn anatomy": [0.0, 1.0, 0.0],
+    "learn chemistry": [0.0, 0.0, 1.0],
+}
+
+
+def embed(text):
+    return np.array(VECTORS[normalize_query(text)], dtype=np.float32)
+
+
+def miss_then_put(cache, text, payload):
+    lookup = cache.get(text)
+    assert lookup.tier is None
+    cache.put(lookup, payload)
+    return lookup
+
+
+class TestLookups:
+    """Exact and semantic tiers over the in-process LRU."""
+
+    def test_exact_hit_ignores_case_and_punctuation(self):
+        cache = RecommendationCache()
+        miss_then_put(cache, "Learn Python", {"vr_apps": ["a"]})
+
+        lookup = cache.get("  learn   python? ")
+        assert lookup.tier == "exact"
+        assert lookup.payload == {"vr_apps": ["a"]}
+        assert cache.stats == {"exact_hits": 1, "semantic_hits": 0, "misses": 1}
+
+    def test_semantic_hit(self):
+        cache = RecommendationCache(embed_fn=embed, similarity_threshold=0.9)
+        miss_then_put(cache, "learn python", {"vr_apps": ["a"]})
+
+        lookup = cache.get("learning python")
+        assert lookup.tier == "semantic"
+        assert lookup.payload == {"vr_apps": ["a"]}
+
+    def test_below_threshold_is_a_miss(self):
+        cache = RecommendationCache(embed_fn=embed, similarity_threshold=0.9)
+        miss_then_put(cache, "learn python", {"vr_apps": ["a"]})
+
+        lookup = cache.get("learn anatomy")
+        assert lookup.tier is None
+        assert lookup.payload is None
+        assert cache.stats["misses"] == 2
+
+    def test_ttl_expiry(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(cache_module.time, "time", lambda: now[0])
+
+        cache = RecommendationCache(ttl_seconds=60)
+        miss_then_put(cache, "learn python", {"vr_apps": ["a"]})
+
+        now[0] += 59
+        assert cache.get("learn python").tier == "exact"
+        now[0] += 2
+        assert cache.get("learn python").tier is None
+
+    def test_lru_eviction(self):
+        cache = RecommendationCache(embed_fn=embed, max_entries=2)
+        miss_then_put(cache, "learn python", {"vr_apps": ["python"]})
+        miss_then_put(cache, "learn anatomy", {"vr_apps": ["anatomy"]})
+
+        # Touch python so anatomy becomes least recently used
+        assert cache.get("learn python").tier == "exact"
+        miss_then_put(cache, "learn chemistry", {"vr_apps": ["chemistry"]})
+
+        assert cache.get("learn python").tier == "exact"
+        assert cache.get("learn chemistry").tier == "exact"
+        assert cache.get("learn anatomy").tier is None
+        assert len(cache._slots) == 2
+
+
+class TestInvalidation:
+    """Version bumps drop entries and stale responses are never stored."""
+
+    def test_invalidate_clears_local_entries(self):
+        cache = RecommendationCache()
+        miss_then_put(cache, "learn python", {"vr_apps": ["a"]})
+
+        invalidate_recommendation_cache()
+        assert cache.get("learn python").tier is None
+
+    def test_put_after_local_clear_is_skipped(self):
+        cache = RecommendationCache()
+        lookup = cache.get("learn python")
+
+        invalidate_recommendation_cache()
+        cache.put(lookup, {"vr_apps": ["stale"]})
+
+        assert cache.get("learn python").tier is None
+
+    def test_redis_version_bump(self):
+        redis_client = FakeRedis()
+        cache = RecommendationCache(embed_fn=embed)
+        cache.redis = redis_client
+        miss_then_put(cache, "learn python", {"vr_apps": ["a"]})
+        assert cache.get("learn python").tier == "exact"
+
+        # Another worker rebuilt the graph
+        redis_client.incr(cache_module.VERSION_KEY)
+        lookup = cache.get("learn python")
+        assert lookup.tier is None
+        assert lookup.version == 1
+        assert cache.get("learning python").tier is None
+
+    def test_put_after_redis_bump_is_skipped(self):
+        redis_client = FakeRedis()
+        cache = RecommendationCache()
+        cache.redis = redis_client
+        lookup = cache.get("learn python")
+
+        redis_client.incr(cache_module.VERSION_KEY)
+        cache.put(lookup, {"vr_apps": ["stale"]})
+
+        assert not any(b":q:" in key.encode() for key in redis_client.data)
+        assert cache.get("learn python").tier is None
+
+        cache.put(cache.get("learn python"), {"vr_apps": ["fresh"]})
+        assert json.loads(redis_client.data[cache._redis_key(1, lookup.key)]) == {"vr_apps": ["fresh"]}
@@ -0,0 +1,136 @@
+"""
+Tests for LLMRanker response parsing on canned LLM outputs.
+"""
+
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.rag.ranker import LLMRanker
+
+
+def make_apps():
+    return [
+        {"name": "Anatomy VR", "category": "Science", "matched_skills": ["Anatomy"]},
+        {"name": "Code Lab", "category": "Programming", "matched_skills": ["Python"]},
+    ]
+
+
+def make_ranker(content=None, error=None):
+    """LLMRanker with a fake client that returns `content` (or raises `error`)."""
+    ranker = LLMRanker.__new__(LLMRanker)
+    ranker.model = "test-model"
+    ranker.client = MagicMock()
+    if error is not None:
+        ranker.client.chat.completions.create.side_effect = error
+    else:
+        message = SimpleNamespace(content=content)
+        ranker.client.chat.completions.create.return_value = SimpleNamespace(
+            choices=[SimpleNamespace(message=message)]
+        )
+    return ranker
+
+
+COMBINED = {
+    "understanding": "Wants to learn human anatomy and Python.",
+    "rankings": [
+        {"name": "Anatomy VR", "reasoning": "Covers anatomy."},
+        {"name": "Code Lab", "reasoning": "Teaches Python."},
+    ],
+}
+
+
+class TestLoadJson:
+    """Extracting the JSON object from raw LLM text."""
+
+    def test_plain_json(self):
+        assert make_ranker()._load_json(json.dumps(COMBINED)) == COMBINED
+
+    def test_code_fence(self):
+        content = f"```json\n{json.dumps(COMBINED)}\n```"
+        assert make_ranker()._load_json(content) == COMBINED
+
+    def test_outermost_brace_fallback(self):
+        content = f"Sure! Here you go:\n{json.dumps(COMBINED)}\nHope this helps."
+        assert make_ranker()._load_json(content) == COMBINED
+
+    @pytest.mark.parametrize("content", [None, "", "no json here", "{broken", "[1, 2]"])
+    def test_malformed_returns_empty(self, content):
+        assert make_ranker()._load_json(content) == {}
+
+
+class TestApplyRankings:
+    """Attaching reasoning to candidate apps."""
+
+    def test_missing_app_gets_default(self):
+        data = {"rankings": [{"name": "Anatomy VR", "reasoning": "  Covers anatomy.  "}]}
+        apps = make_ranker()._apply_rankings(data, make_apps())
+
+        assert apps[0]["reasoning"] == "Covers anatomy."
+        assert apps[1]["reasoning"] == "Matches your learning interests"
+
+    def test_extra_app_is_ignored(self):
+        data = {"rankings": COMBINED["rankings"] + [{"name": "Unknown", "reasoning": "?"}]}
+        apps = make_ranker()._apply_rankings(data, make_apps())
+
+        assert [app["name"] for app in apps] == ["Anatomy VR", "Code Lab"]
+        assert apps[1]["reasoning"] == "Teaches Python."
+
+    def test_bad_entries_are_skipped(self):
+        data = {"rankings": ["nope", {"name": "Anatomy VR"}, {"reasoning": "no name"}]}
+        apps = make_ranker()._apply_rankings(data, make_apps())
+        assert {app["reasoning"] for app in apps} == {"Matches your learning interests"}
+
+    def test_non_list_rankings(self):
+        apps = make_ranker()._apply_rankings({"rankings": "oops"}, make_apps())
+        assert {app["reasoning"] for app in apps} == {"Matches your learning interests"}
+
+
+class TestUnderstandAndRank:
+    """The combined understanding + ranking call."""
+
+    def test_parses_combined_response(self):
+        ranker = make_ranker(json.dumps(COMBINED))
+        understanding, apps = ranker.understand_and_rank("anatomy and python", make_apps())
+
+        assert understanding == COMBINED["understanding"]
+        assert [app["reasoning"] for app in apps] == ["Covers anatomy.", "Teaches Python."]
+
+    def test_uses_larger_token_budget(self):
+        ranker = make_ranker(json.dumps(COMBINED))
+        ranker.understand_and_rank("anatomy", make_apps())
+
+        kwargs = ranker.client.chat.completions.create.call_args.kwargs
+        assert kwargs["max_tokens"] == 1152
+        assert kwargs["model"] == "test-model"
+
+    def test_malformed_output_falls_back(self):
+        ranker = make_ranker("I cannot answer that.")
+        understanding, apps = ranker.understand_and_rank("anatomy", make_apps())
+
+        assert understanding == "Learning interest: anatomy"
+        assert {app["reasoning"] for app in apps} == {"Matches your learning interests"}
+
+    def test_blank_understanding_falls_back(self):
+        ranker = make_ranker(json.dumps({"understanding": "  ", "rankings": COMBINED["rankings"]}))
+        understanding, apps = ranker.understand_and_rank("anatomy", make_apps())
+
+        assert understanding == "Learning interest: anatomy"
+        assert apps[0]["reasoning"] == "Covers anatomy."
+
+    def test_api_error_falls_back(self):
+        ranker = make_ranker(error=RuntimeError("timeout"))
+        understanding, apps = ranker.understand_and_rank("anatomy", make_apps())
+
+        assert understanding == "Learning interest: anatomy"
+        assert {app["reasoning"] for app in apps} == {"Matches your learning interests"}
+
+    def test_no_apps_only_understands(self):
+        ranker = make_ranker("Wants anatomy.")
+        understanding, apps = ranker.understand_and_rank("anatomy", [])
+
+        assert understanding == "Wants anatomy."
+        assert apps == []
+        assert ranker.client.chat.completions.create.call_args.kwargs["max_tokens"] == 100
@@ -0,0 +1,142 @@
+"""
+Tests for RAGService query understanding modes and timings.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.rag.ranker import LLMRanker
+from src.rag.service import RAGService
+
+
+def make_candidates(n=3):
+    return [
+        {
+            "app_id": f"app{i}",
+            "name": f"App {i}",
+            "category": "Education",
+            "score": 1.0 - i * 0.1,
+            "matched_skills": [f"Skill {i}"],
+            "retrieval_source": "direct",
+        }
+        for i in range(n)
+    ]
+
+
+def with_reasoning(apps):
+    for app in apps:
+        app["reasoning"] = f"Good for {app['name']}"
+    return apps
+
+
+def make_service(mode, candidates=None):
+    """Build a RAGService whose retriever and ranker are mocks."""
+    with patch("src.rag.service.RAGRetriever"), patch("src.rag.service.LLMRanker"):
+        service = RAGService(understanding_mode=mode)
+
+    service.retriever = MagicMock()
+    service.retriever.retrieve.return_value = make_candidates() if candidates is None else candidates
+
+    service.ranker = MagicMock()
+    service.ranker.understand_query.return_value = "Wants to learn things"
+    service.ranker.fallback_understanding.side_effect = LLMRanker.fallback_understanding
+    service.ranker.rank_and_explain.side_effect = lambda query, apps: with_reasoning(apps)
+    service.ranker.understand_and_rank.side_effect = (
+        lambda query, apps: ("Combined understanding", with_reasoning(apps))
+    )
+    return service
+
+
+class TestUnderstandingModes:
+    """Each mode makes the expected LLM calls and reports its timings."""
+
+    def test_unknown_mode_falls_back_to_default(self):
+        with patch("src.rag.service.RAGRetriever"), patch("src.rag.service.LLMRanker"):
+            service = RAGService(understanding_mode="bogus")
+        assert service.understanding_mode == "concurrent"
+        service.close()
+
+    def test_sequential(self):
+        service = make_service("sequential")
+        result = service.recommend("learn python", top_k=2)
+
+        service.ranker.understand_query.assert_called_once_with("learn python")
+        service.ranker.rank_and_explain.assert_called_once()
+        service.ranker.understand_and_rank.assert_not_called()
+        service.retriever.retrieve.assert_called_once_with("learn python", top_k=4)
+
+        assert result.query_understanding == "Wants to learn things"
+        assert [app.app_id for app in result.apps] == ["app0", "app1"]
+        assert result.total_matches == 3
+        assert set(result.timings) == {"understand_ms", "retrieve_ms", "rank_ms", "total_ms"}
+
+    def test_concurrent(self):
+        service = make_service("concurrent")
+        result = service.recommend("learn python", top_k=2)
+        service.close()
+
+        service.ranker.understand_query.assert_called_once_with("learn python")
+        service.ranker.rank_and_explain.assert_called_once()
+        assert result.query_understanding == "Wants to learn things"
+        assert set(result.timings) == {
+            "understand_ms", "understand_wait_ms", "retrieve_ms", "rank_ms", "total_ms"
+        }
+
+    def test_combined(self):
+        service = make_service("combined")
+        result = service.recommend("learn python", top_k=2)
+
+        service.ranker.understand_query.assert_not_called()
+        service.ranker.rank_and_explain.assert_not_called()
+        service.ranker.understand_and_rank.assert_called_once()
+        assert result.query_understanding == "Combined understanding"
+        assert result.apps[0].reasoning == "Good for App 0"
+        assert set(result.timings) == {"retrieve_ms", "rank_ms", "total_ms"}
+
+    def test_off(self):
+        service = make_service("off")
+        result = service.recommend("learn python")
+
+        service.ranker.understand_query.assert_not_called()
+        service.ranker.rank_and_explain.assert_called_once()
+        assert result.query_understanding == "Learning interest: learn python"
+        assert result.timings["understand_ms"] == 0.0
+
+    @pytest.mark.parametrize("mode", ["sequential", "concurrent", "combined", "off"])
+    def test_no_candidates(self, mode):
+        service = make_service(mode, candidates=[])
+        result = service.recommend("learn python")
+        service.close()
+
+        assert result.apps == []
+        assert result.total_matches == 0
+        assert result.query_understanding
+        assert "rank_ms" not in result.timings
+        assert "total_ms" in result.timings
+        service.ranker.rank_and_explain.assert_not_called()
+        service.ranker.understand_and_rank.assert_not_called()
+
+
+class TestConcurrentFailures:
+    """The overlapped understanding call must not break the request."""
+
+    def test_failing_understanding_uses_fallback(self):
+        service = make_service("concurrent")
+        service.ranker.understand_query.side_effect = RuntimeError("LLM down")
+
+        result = service.recommend("learn python", top_k=2)
+        service.close()
+
+        assert result.query_understanding == "Learning interest: learn python"
+        assert result.timings["understand_ms"] == 0.0
+        assert len(result.apps) == 2
+
+    def test_retrieval_error_is_not_masked(self):
+        service = make_service("concurrent")
+        service.ranker.understand_query.side_effect = RuntimeError("LLM down")
+        service.retriever.retrieve.side_effect = ValueError("graph down")
+
+        with pytest.raises(ValueError, match="graph down"):
+            service.recommend("learn python")
+        service.close()
@@ -0,0 +1,154 @@
+"""
+Tests for the in-process Skill -> VRApp index.
+"""
+
+from unittest.mock import MagicMock
+
+from src.rag.skill_index import SkillAppIndex
+
+
+def edge(skill, app_id, weight):
+    return {
+        "skill": skill,
+        "app_id": app_id,
+        "name": f"App {app_id}",
+        "category": "Education",
+        "description": f"About {app_id}",
+        "weight": weight,
+    }
+
+
+EDGES = [
+    # Sorted by skill, as the Cypher ORDER BY returns them
+    edge("Anatomy", "a1", 0.9),
+    edge("Anatomy", "a2", 0.5),
+    edge("Biology", "a2", 0.4),
+    edge("Biology", "a3", 0.9),
+    edge("Chemistry", "a4", None),
+]
+
+
+def make_graph(edges=EDGES, version=1):
+    """Mock Neo4jConnection answering the version and edge queries."""
+    graph = MagicMock()
+    state = {"edges": edges, "version": version}
+
+    def query(cypher, *args, **kwargs):
+        if "DEVELOPS" in cypher:
+            return state["edges"]
+        return [{"version": state["version"]}] if state["version"] is not None else []
+
+    graph.query.side_effect = query
+    graph.state = state
+    return graph
+
+
+def make_index(graph=None, **kwargs):
+    index = SkillAppIndex(graph or make_graph(), **kwargs)
+    assert index.load()
+    return index
+
+
+class TestQuery:
+    """Scoring, ordering and truncation."""
+
+    def test_scores_sum_weights(self):
+        results = make_index().query(["Anatomy", "Biology"], top_k=10)
+        scores = {r["app_id"]: r["score"] for r in results}
+
+        assert scores == {"a1": 0.9, "a2": 0.9, "a3": 0.9}
+        matched = {r["app_id"]: r["matched_skills"] for r in results}
+        assert matched["a2"] == ["Anatomy", "Biology"]
+        assert results[0]["name"] == "App a2"
+
+    def test_tie_on_score_breaks_on_matched_count(self):
+        results = make_index().query(["Anatomy", "Biology"], top_k=10)
+        # a2 matches two skills; a1 and a3 keep load order after it
+        assert [r["app_id"] for r in results] == ["a2", "a1", "a3"]
+
+    def test_score_dominates_matched_count(self):
+        graph = make_graph([
+            edge("Anatomy", "a1", 0.2),
+            edge("Anatomy", "a2", 1.0),
+            edge("Biology", "a1", 0.2),
+        ])
+        results = make_index(graph).query(["Anatomy", "Biology"], top_k=10)
+        assert [r["app_id"] for r in results] == ["a2", "a1"]
+
+    def test_unknown_skills_are_ignored(self):
+        index = make_index()
+        assert index.query(["Astrophysics"], top_k=5) == []
+        assert [r["app_id"] for r in index.query(["Astrophysics", "Biology"], top_k=5)] == ["a3", "a2"]
+
+    def test_duplicate_skills_count_once(self):
+        results = make_index().query(["Biology", "Biology"], top_k=5)
+        assert results[0]["score"] == 0.9
+        assert results[0]["matched_skills"] == ["Biology"]
+
+    def test_null_weight_scores_zero(self):
+        results = make_index().query(["Chemistry"], top_k=5)
+        assert results == [{
+            "app_id": "a4",
+            "name": "App a4",
+            "category": "Education",
+            "description": "About a4",
+            "matched_skills": ["Chemistry"],
+            "score": 0.0,
+        }]
+
+    def test_top_k_truncation(self):
+        results = make_index().query(["Anatomy", "Biology"], top_k=2)
+        assert [r["app_id"] for r in results] == ["a2", "a1"]
+
+    def test_empty_before_load(self):
+        index = SkillAppIndex(make_graph())
+        assert not index.ready
+        assert index.query(["Anatomy"], top_k=5) == []
+
+
+class TestRefresh:
+    """Reloading when the active build version changes."""
+
+    def test_load_records_version_and_skills(self):
+        index = make_index()
+        assert index.version == 1
+        assert index.active_skills == ["Anatomy", "Biology", "Chemistry"]
+
+    def test_load_failure_keeps_snapshot(self):
+        graph = make_graph()
+        index = make_index(graph)
+        graph.query.side_effect = RuntimeError("neo4j down")
+
+        assert not index.load()
+        assert index.version == 1
+        assert index.query(["Biology"], top_k=1)[0]["app_id"] == "a3"
+
+    def test_reloads_on_version_change(self):
+        graph = make_graph()
+        index = make_index(graph, refresh_interval=0)
+
+        assert not index.maybe_refresh()
+
+        graph.state["edges"] = [edge("Physics", "a9", 1.0)]
+        graph.state["version"] = 2
+        assert index.maybe_refresh()
+        assert index.version == 2
+        assert index.active_skills == ["Physics"]
+        assert index.query(["Anatomy"], top_k=5) == []
+
+    def test_missing_version_keeps_snapshot(self):
+        graph = make_graph()
+        index = make_index(graph, refresh_interval=0)
+
+        graph.state["version"] = None
+        assert not index.maybe_refresh()
+        assert index.version == 1
+
+    def test_refresh_interval_throttles_checks(self):
+        graph = make_graph()
+        index = make_index(graph, refresh_interval=3600)
+        calls = graph.query.call_count
+
+        graph.state["version"] = 2
+        assert not index.maybe_refresh()
+        assert graph.query.call_count == calls
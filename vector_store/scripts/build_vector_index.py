@@ -48,10 +48,15 @@ def main():
         default=None,
         help="Specific model name to use"
     )
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Clear the index and re-embed every skill (default: sync new, changed and removed skills)"
+    )
     parser.add_argument(
         "--no-clear",
         action="store_true",
-        help="Do not clear existing index before building"
+        help="Deprecated: syncing in place is now the default; ignored"
     )
     parser.add_argument(
         "--test",
@@ -70,6 +75,8 @@ def main():
     )
 
     args = parser.parse_args()
+    if args.no_clear:
+        print("⚠ --no-clear is deprecated and ignored: the index is synced in place unless --rebuild is given")
 
     try:
         # Initialize indexer
@@ -80,8 +87,7 @@ def main():
         )
 
         # Build index
-        clear_existing = not args.no_clear
-        indexer.build_index(args.skills, clear_existing=clear_existing)
+        indexer.build_index(args.skills, clear_existing=args.rebuild)
 
         # Show statistics
         if args.stats:
@@ -9,17 +9,22 @@ from .embeddings import (
     EmbeddingModel,
     LocalEmbedding,
     OpenAIEmbedding,
-    get_embedding_model
+    CachedEmbedding,
+    get_embedding_model,
+    preload_local_model
 )
 
 from .indexer import VectorIndexer
-from .search_service import SkillSearchService
+from .search_service import SkillSearchService, query_embedding_scope
 
 __all__ = [
     'EmbeddingModel',
     'LocalEmbedding',
     'OpenAIEmbedding',
+    'CachedEmbedding',
     'get_embedding_model',
+    'preload_local_model',
     'VectorIndexer',
-    'SkillSearchService'
+    'SkillSearchService',
+    'query_embedding_scope'
 ]
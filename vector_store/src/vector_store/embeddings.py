@@ -6,8 +6,63 @@ Supports both local (sentence-transformers) and OpenAI embeddings.
 
 from sentence_transformers import SentenceTransformer
 import numpy as np
-from typing import List, Optional
+from collections import OrderedDict
+from typing import Dict, List, Optional
+import hashlib
 import os
+import re
+import sqlite3
+import threading
+
+
+# Batches at least this large show a progress bar (index builds, dedup)
+PROGRESS_BAR_MIN_BATCH = 64
+
+DEFAULT_LOCAL_MODEL = "all-MiniLM-L6-v2"
+
+# Loaded sentence-transformers models, shared by every LocalEmbedding in the
+# process. When the gunicorn master preloads a model here (see
+# preload_local_model), forked workers inherit it copy-on-write.
+_shared_models: Dict[str, SentenceTransformer] = {}
+_shared_models_lock = threading.Lock()
+
+
+def load_shared_model(model_name: str = DEFAULT_LOCAL_MODEL) -> SentenceTransformer:
+    """
+    Return the process-wide SentenceTransformer for model_name, loading it once.
+
+    Args:
+        model_name: sentence-transformers model name
+
+    Returns:
+        Shared SentenceTransformer instance
+    """
+    with _shared_models_lock:
+        model = _shared_models.get(model_name)
+        if model is None:
+            print(f"Loading local embedding model: {model_name}")
+            model = SentenceTransformer(model_name)
+            _shared_models[model_name] = model
+            print("✓ Model loaded successfully")
+        else:
+            print(f"✓ Reusing loaded embedding model: {model_name}")
+        return model
+
+
+def preload_local_model(model_name: str = DEFAULT_LOCAL_MODEL) -> SentenceTransformer:
+    """
+    Load the local embedding model before worker processes are forked.
+
+    Only loads weights; no inference is run, so no torch/tokenizer thread
+    pools exist at fork time.
+
+    Args:
+        model_name: sentence-transformers model name
+
+    Returns:
+        Shared SentenceTransformer instance
+    """
+    return load_shared_model(model_name)
 
 
 class EmbeddingModel:
@@ -29,28 +84,31 @@ class EmbeddingModel:
 class LocalEmbedding(EmbeddingModel):
     """Local embedding model using sentence-transformers."""
 
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
+    def __init__(self, model_name: str = DEFAULT_LOCAL_MODEL):
         """
         Initialize local embedding model.
 
         Args:
             model_name: sentence-transformers model name
         """
-        print(f"Loading local embedding model: {model_name}")
-        self.model = SentenceTransformer(model_name)
-        print("✓ Model loaded successfully")
+        self.model_name = model_name
+        self.model = load_shared_model(model_name)
 
-    def encode(self, texts: List[str]) -> np.ndarray:
+    def encode(self, texts: List[str], show_progress_bar: Optional[bool] = None) -> np.ndarray:
         """
         Encode texts using local sentence-transformers model.
 
         Args:
             texts: List of texts to encode
+            show_progress_bar: Defaults to True only for bulk (indexing) batches,
+                so per-query encodes on the request path stay quiet
 
         Returns:
             numpy array of embeddings
         """
-        return self.model.encode(texts, show_progress_bar=True)
+        if show_progress_bar is None:
+            show_progress_bar = len(texts) >= PROGRESS_BAR_MIN_BATCH
+        return self.model.encode(texts, show_progress_bar=show_progress_bar)
 
 
 class OpenAIEmbedding(EmbeddingModel):
@@ -78,6 +136,7 @@ class OpenAIEmbedding(EmbeddingModel):
             base_url=base_url
         )
         self.model = model
+        self.model_name = model
         print(f"Using OpenAI embedding model: {model}")
 
     def encode(self, texts: List[str]) -> np.ndarray:
@@ -104,9 +163,152 @@ class OpenAIEmbedding(EmbeddingModel):
             raise
 
 
+class CachedEmbedding(EmbeddingModel):
+    """
+    Bounded, thread-safe LRU cache around any EmbeddingModel.
+
+    Entries are keyed on the model name plus the whitespace-normalized text
+    (case is preserved, since not every model is case-insensitive). With
+    persist_path set, embeddings are also written through to a SQLite file
+    so warm restarts skip recomputation.
+    """
+
+    def __init__(
+        self,
+        model: EmbeddingModel,
+        max_size: int = 2048,
+        persist_path: Optional[str] = None
+    ):
+        """
+        Args:
+            model: Underlying embedding model
+            max_size: Maximum number of embeddings kept in memory
+            persist_path: Optional SQLite file for a disk-backed cache
+        """
+        self.model = model
+        self.model_name = getattr(model, "model_name", type(model).__name__)
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+
+        self._db = None
+        if persist_path:
+            os.makedirs(os.path.dirname(os.path.abspath(persist_path)), exist_ok=True)
+            self._db = sqlite3.connect(persist_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB)"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Collapse whitespace; the normalized text is what gets embedded."""
+        return re.sub(r"\s+", " ", text).strip()
+
+    def _key(self, normalized: str) -> str:
+        return hashlib.sha1(f"{self.model_name}\x00{normalized}".encode("utf-8")).hexdigest()
+
+    def _lookup(self, key: str) -> Optional[np.ndarray]:
+        """Memory first, then disk (promoting disk hits into memory)."""
+        vector = self._cache.get(key)
+        if vector is not None:
+            self._cache.move_to_end(key)
+            return vector
+
+        if self._db is not None:
+            row = self._db.execute(
+                "SELECT vector FROM embeddings WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                vector = np.frombuffer(row[0], dtype=np.float32)
+                self._remember(key, vector)
+                return vector
+        return None
+
+    def _remember(self, key: str, vector: np.ndarray):
+        self._cache[key] = vector
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+
+    def encode(self, texts: List[str], **kwargs) -> np.ndarray:
+        """
+        Encode texts, computing only the ones not already cached.
+
+        Args:
+            texts: List of texts to encode
+            **kwargs: Passed through to the underlying model on a miss
+
+        Returns:
+            numpy array of float32 embeddings
+        """
+        normalized = [self.normalize(t) for t in texts]
+        keys = [self._key(n) for n in normalized]
+
+        found: Dict[str, np.ndarray] = {}
+        missing: "OrderedDict[str, str]" = OrderedDict()
+        with self._lock:
+            for key, text in zip(keys, normalized):
+                if key in found or key in missing:
+                    continue
+                vector = self._lookup(key)
+                if vector is None:
+                    missing[key] = text
+                else:
+                    found[key] = vector
+            self.hits += len(texts) - len(missing)
+            self.misses += len(missing)
+
+        if missing:
+            computed = np.asarray(self.model.encode(list(missing.values()), **kwargs), dtype=np.float32)
+            with self._lock:
+                for key, vector in zip(missing.keys(), computed):
+                    vector = np.array(vector, dtype=np.float32)
+                    vector.flags.writeable = False
+                    found[key] = vector
+                    self._remember(key, vector)
+                if self._db is not None:
+                    self._db.executemany(
+                        "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                        [(key, found[key].tobytes()) for key in missing]
+                    )
+                    self._db.commit()
+
+        if not keys:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.stack([found[key] for key in keys])
+
+    def cache_info(self) -> Dict:
+        """Hit/miss counters and current size."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "model": self.model_name,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+                "size": len(self._cache),
+                "max_size": self.max_size,
+                "persistent": self._db is not None
+            }
+
+    def clear(self):
+        """Drop all cached embeddings (memory and disk)."""
+        with self._lock:
+            self._cache.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM embeddings")
+                self._db.commit()
+
+
 def get_embedding_model(
     use_openai: bool = False,
-    model_name: Optional[str] = None
+    model_name: Optional[str] = None,
+    cache_size: Optional[int] = None,
+    cache_path: Optional[str] = None
 ) -> EmbeddingModel:
     """
     Get an embedding model based on configuration.
@@ -114,15 +316,28 @@ def get_embedding_model(
     Args:
         use_openai: If True, use OpenAI embeddings; otherwise use local
         model_name: Optional model name (defaults based on provider)
+        cache_size: LRU size for CachedEmbedding; 0 disables caching
+            (default: EMBEDDING_CACHE_SIZE env var or 2048)
+        cache_path: SQLite file for a persistent cache
+            (default: EMBEDDING_CACHE_PATH env var; unset keeps it in memory)
 
     Returns:
         EmbeddingModel instance
     """
     if use_openai:
-        return OpenAIEmbedding(
+        model = OpenAIEmbedding(
             model=model_name or "text-embedding-3-small"
         )
     else:
-        return LocalEmbedding(
-            model_name=model_name or "all-MiniLM-L6-v2"
+        model = LocalEmbedding(
+            model_name=model_name or DEFAULT_LOCAL_MODEL
         )
+
+    if cache_size is None:
+        cache_size = int(os.getenv("EMBEDDING_CACHE_SIZE", "2048"))
+    if cache_path is None:
+        cache_path = os.getenv("EMBEDDING_CACHE_PATH") or None
+
+    if cache_size > 0:
+        return CachedEmbedding(model, max_size=cache_size, persist_path=cache_path)
+    return model
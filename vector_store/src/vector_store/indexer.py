@@ -3,13 +3,29 @@ Vector indexing pipeline for building and managing skill embeddings.
 
 Orchestrates the process of loading skills, generating embeddings,
 and storing them in ChromaDB.
+
+The index is kept in sync incrementally: each stored skill carries a hash
+of the text it was embedded from, so a re-run only embeds new or changed
+skills, upserts them in place and deletes skills that disappeared. The
+collection is never emptied, so a running search service keeps serving
+while the index is updated, and the index version marker (see store.py)
+tells it to reopen the collection once the sync is done.
 """
 
-import json
+import hashlib
 import os
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.records import artifact_path, file_info, iter_chunks
+
 from .embeddings import get_embedding_model
-from .store import SkillVectorStore
+from .store import SkillVectorStore, skill_metadata
+
+
+# Skills embedded and added per step while building the index
+EMBED_CHUNK_SIZE = int(os.getenv("VECTOR_EMBED_CHUNK_SIZE", "512"))
 
 
 class VectorIndexer:
@@ -19,7 +35,8 @@ class VectorIndexer:
         self,
         use_openai: bool = False,
         persist_dir: str = "vector_store/data/chroma",
-        model_name: str = None
+        model_name: str = None,
+        cache_size: Optional[int] = 0
     ):
         """
         Initialize the vector indexer.
@@ -28,65 +45,122 @@ class VectorIndexer:
             use_openai: If True, use OpenAI embeddings; otherwise use local
             persist_dir: Directory for ChromaDB persistence
             model_name: Specific model name to use
+            cache_size: Embedding cache size (see get_embedding_model). Bulk
+                builds embed each skill once, so caching is off by default;
+                None uses the EMBEDDING_CACHE_SIZE default
         """
-        self.embedding_model = get_embedding_model(use_openai, model_name)
+        self.embedding_model = get_embedding_model(use_openai, model_name, cache_size=cache_size)
         self.store = SkillVectorStore(persist_dir)
         print(f"✓ Vector indexer initialized")
 
-    def build_index(self, skills_path: str, clear_existing: bool = True):
+    def build_index(self, skills_path: str, clear_existing: bool = False):
         """
         Build the vector index from skills JSON file.
 
+        Without clear_existing the index is synced in place (see sync_index).
+
         Args:
             skills_path: Path to skills.json file
-            clear_existing: If True, clear existing index before building
+            clear_existing: If True, drop the index and re-embed every skill
         """
-        # Load skills
-        if not os.path.exists(skills_path):
+        if not os.path.exists(artifact_path(skills_path)):
             raise FileNotFoundError(f"Skills file not found: {skills_path}")
 
-        with open(skills_path, 'r') as f:
-            skills = json.load(f)
-
         print(f"\n{'='*60}")
         print(f"BUILDING VECTOR INDEX")
         print(f"{'='*60}")
-        print(f"Skills to process: {len(skills)}")
+        print(f"Skills to process: {file_info(skills_path)['count']}")
         print(f"Embedding model: {type(self.embedding_model).__name__}")
         print(f"Output directory: {self.store.persist_dir}")
+        print(f"Mode: {'full rebuild' if clear_existing else 'incremental'}")
         print(f"{'='*60}\n")
 
         # Clear existing if requested
         if clear_existing:
             self.store.clear()
 
-        # Generate document texts
-        print("Generating skill documents...")
-        texts = [self._skill_to_text(s) for s in skills]
-
-        # Generate embeddings
-        print("Generating embeddings...")
-        embeddings = self.embedding_model.encode(texts)
-
-        # Store in vector database
-        print("Storing in vector database...")
-        self.store.add_skills(skills, embeddings.tolist())
+        counts = self.sync_index(skills_path)
 
         # Persist
         self.store.persist()
 
         # Show statistics
         stats = self.store.get_stats()
-        vector_dims = embeddings.shape[1] if len(embeddings) > 0 else "N/A"
 
         print(f"\n{'='*60}")
         print(f"INDEX BUILD COMPLETE")
         print(f"{'='*60}")
         print(f"Total skills indexed: {stats['total_skills']}")
-        print(f"Vector dimensions: {vector_dims}")
+        print(f"Added: {counts['added']}, changed: {counts['changed']}, "
+              f"metadata only: {counts['metadata']}, removed: {counts['removed']}, "
+              f"unchanged: {counts['unchanged']}")
+        print(f"Vector dimensions: {counts['dimensions'] or 'N/A'}")
         print(f"Storage: {self.store.persist_dir}")
         print(f"{'='*60}\n")
 
+    def sync_index(self, skills_path: str) -> Dict:
+        """
+        Bring the index in line with a skills file.
+
+        Skills are matched by name and compared by a hash of their document
+        text: new and changed skills are embedded and upserted, skills whose
+        text is unchanged only get their metadata refreshed (if it differs),
+        and stored skills missing from the file are deleted. If anything
+        changed, the index version is bumped at the end.
+
+        Args:
+            skills_path: Path to skills.json file
+
+        Returns:
+            Dictionary with added, changed, metadata, removed, unchanged
+            counts and the embedding dimensions (None if nothing was embedded)
+        """
+        existing = self.store.get_metadatas()
+        counts = {"added": 0, "changed": 0, "metadata": 0, "removed": 0, "unchanged": 0, "dimensions": None}
+        seen = set()
+
+        # Skills are streamed and embedded a chunk at a time
+        for skills in iter_chunks(skills_path, EMBED_CHUNK_SIZE):
+            embed, texts, metadatas = [], [], []
+            refresh, refreshed = [], []
+            for skill in skills:
+                name = skill["name"]
+                if name in seen:
+                    continue
+                seen.add(name)
+
+                text = self._skill_to_text(skill)
+                metadata = skill_metadata(skill, hashlib.sha256(text.encode("utf-8")).hexdigest())
+                stored = existing.get(name)
+                if stored is None or stored.get("doc_hash") != metadata["doc_hash"]:
+                    counts["added" if stored is None else "changed"] += 1
+                    embed.append(skill)
+                    texts.append(text)
+                    metadatas.append(metadata)
+                elif stored != metadata:
+                    counts["metadata"] += 1
+                    refresh.append(name)
+                    refreshed.append(metadata)
+                else:
+                    counts["unchanged"] += 1
+
+            if embed:
+                print(f"Embedding {len(embed)} new or changed skills...")
+                embeddings = self.embedding_model.encode(texts)
+                self.store.upsert_skills(embed, embeddings.tolist(), metadatas)
+                counts["dimensions"] = embeddings.shape[1]
+            self.store.update_metadata(refresh, refreshed)
+
+        removed = [name for name in existing if name not in seen]
+        if removed:
+            print(f"Removing {len(removed)} skills no longer in {os.path.basename(skills_path)}...")
+            self.store.delete_skills(removed)
+        counts["removed"] = len(removed)
+
+        if counts["added"] or counts["changed"] or counts["metadata"] or counts["removed"]:
+            self.store.mark_version()
+        return counts
+
     def _skill_to_text(self, skill: dict) -> str:
         """
         Convert skill to text for embedding.
@@ -102,11 +176,24 @@ class VectorIndexer:
         category = skill.get("category", "unknown")
         return f"{skill['name']}{alias_str}. Category: {category}"
 
+    def encode_query(self, query: str) -> np.ndarray:
+        """
+        Embed a single query string.
+
+        Args:
+            query: Query text
+
+        Returns:
+            1-D embedding vector
+        """
+        return np.asarray(self.embedding_model.encode([query])[0])
+
     def search(
         self,
         query: str,
         top_k: int = 10,
-        min_similarity: float = 0.0
+        min_similarity: float = 0.0,
+        query_embedding: Optional[np.ndarray] = None
     ) -> List[Tuple[str, float, dict]]:
         """
         Search for skills similar to query.
@@ -115,16 +202,18 @@ class VectorIndexer:
             query: Query text
             top_k: Number of results
             min_similarity: Minimum similarity threshold
+            query_embedding: Precomputed embedding of query (skips encoding)
 
         Returns:
             List of (skill_name, similarity, metadata) tuples
         """
-        # Generate query embedding
-        query_embedding = self.embedding_model.encode([query])[0]
+        # Generate query embedding unless the caller already has one
+        if query_embedding is None:
+            query_embedding = self.encode_query(query)
 
         # Search
         results = self.store.search(
-            query_embedding=query_embedding.tolist(),
+            query_embedding=np.asarray(query_embedding).tolist(),
             query_text=query,
             top_k=top_k
         )
@@ -180,7 +269,7 @@ class VectorIndexer:
         clear_existing: bool = False
     ):
         """
-        Update the index with new skills.
+        Update the index with new, changed and removed skills.
 
         Args:
             skills_path: Path to updated skills.json
@@ -5,10 +5,43 @@ Provides a simple interface for RAG systems and other components
 to search and retrieve skills using semantic similarity.
 """
 
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
 from typing import List, Dict, Optional
+
+import numpy as np
+
 from .indexer import VectorIndexer
 
 
+# Per-request memo of query text -> embedding (see query_embedding_scope)
+_query_embeddings: ContextVar[Optional[Dict[str, np.ndarray]]] = ContextVar(
+    "query_embeddings", default=None
+)
+
+
+@contextmanager
+def query_embedding_scope():
+    """
+    Memoize query embeddings for the duration of one request.
+
+    Inside the scope, SkillSearchService.encode_query embeds each distinct
+    query string once, however many lookups (cache, direct search, semantic
+    bridge) need it. Nested scopes share the outer memo.
+    """
+    if _query_embeddings.get() is not None:
+        yield
+        return
+
+    token = _query_embeddings.set({})
+    try:
+        yield
+    finally:
+        _query_embeddings.reset(token)
+
+
 class SkillSearchService:
     """
     Search service for skill semantic search.
@@ -21,7 +54,8 @@ class SkillSearchService:
         self,
         persist_dir: str = "vector_store/data/chroma",
         use_openai: bool = False,
-        model_name: str = None
+        model_name: str = None,
+        refresh_interval: float = 30.0
     ):
         """
         Initialize the search service.
@@ -30,19 +64,79 @@ class SkillSearchService:
             persist_dir: ChromaDB persistence directory
             use_openai: If True, use OpenAI embeddings
             model_name: Specific model name
+            refresh_interval: Seconds between index version checks (see maybe_refresh)
         """
         self.indexer = VectorIndexer(
             use_openai=use_openai,
             persist_dir=persist_dir,
-            model_name=model_name
+            model_name=model_name,
+            # Query path: repeated queries are common, so keep the embedding cache
+            cache_size=None
         )
 
+        # Bridge matrix: unit-norm float32 embeddings of the candidate
+        # ('active') skills, rebuilt when the candidate set changes
+        self._bridge = None
+        self._bridge_lock = threading.Lock()
+
+        self.refresh_interval = refresh_interval
+        self._last_check = time.monotonic()
+        self._refresh_lock = threading.Lock()
+
+    def maybe_refresh(self) -> bool:
+        """
+        Reopen the vector store if the index was synced by another process
+        (checked at most every refresh_interval seconds, by one thread at a time).
+
+        Returns:
+            True if the store was reloaded
+        """
+        if time.monotonic() - self._last_check < self.refresh_interval:
+            return False
+        if not self._refresh_lock.acquire(blocking=False):
+            return False
+        try:
+            self._last_check = time.monotonic()
+            store = self.indexer.store
+            if store.read_version() == store.version:
+                return False
+            try:
+                store.reload()
+            except Exception as e:
+                print(f"⚠ Failed to reload vector store: {e}")
+                return False
+            self.invalidate_bridge_matrix()
+            return True
+        finally:
+            self._refresh_lock.release()
+
+    def encode_query(self, query: str) -> np.ndarray:
+        """
+        Embed a query, reusing the result within a query_embedding_scope.
+
+        Args:
+            query: Search query text
+
+        Returns:
+            1-D embedding vector
+        """
+        memo = _query_embeddings.get()
+        if memo is None:
+            return self.indexer.encode_query(query)
+
+        embedding = memo.get(query)
+        if embedding is None:
+            embedding = self.indexer.encode_query(query)
+            memo[query] = embedding
+        return embedding
+
     def find_related_skills(
         self,
         query: str,
         top_k: int = 10,
         min_similarity: float = 0.3,
-        category_filter: Optional[str] = None
+        category_filter: Optional[str] = None,
+        query_embedding: Optional[np.ndarray] = None
     ) -> List[str]:
         """
         Find skills related to a query.
@@ -52,14 +146,19 @@ class SkillSearchService:
             top_k: Number of results to return
             min_similarity: Minimum similarity score (0.0-1.0)
             category_filter: Optional category to filter results
+            query_embedding: Precomputed embedding of query
 
         Returns:
             List of skill names
         """
+        if query_embedding is None:
+            query_embedding = self.encode_query(query)
+
         results = self.indexer.search(
             query=query,
             top_k=top_k * 2,  # Get more to allow filtering
-            min_similarity=min_similarity
+            min_similarity=min_similarity,
+            query_embedding=query_embedding
         )
 
         # Filter by category if specified
@@ -79,7 +178,8 @@ class SkillSearchService:
         self,
         query: str,
         top_k: int = 10,
-        min_similarity: float = 0.3
+        min_similarity: float = 0.3,
+        query_embedding: Optional[np.ndarray] = None
     ) -> List[Dict]:
         """
         Find skills with their similarity scores.
@@ -88,14 +188,19 @@ class SkillSearchService:
             query: Search query text
             top_k: Number of results
             min_similarity: Minimum similarity
+            query_embedding: Precomputed embedding of query
 
         Returns:
             List of dicts: [{"name": "...", "score": ..., "category": ...}, ...]
         """
+        if query_embedding is None:
+            query_embedding = self.encode_query(query)
+
         results = self.indexer.search(
             query=query,
             top_k=top_k,
-            min_similarity=min_similarity
+            min_similarity=min_similarity,
+            query_embedding=query_embedding
         )
 
         return [
@@ -217,54 +322,121 @@ class SkillSearchService:
 
         return recommendations[:num_recommendations]
 
+    def _get_bridge_matrix(self, candidate_skills: List[str]) -> Dict:
+        """
+        Return the precomputed embedding matrix for a candidate skill set.
+
+        The matrix is built once from the stored skill embeddings and reused
+        until the candidate set or the store's contents change (or
+        invalidate_bridge_matrix is called).
+
+        Args:
+            candidate_skills: List of allowed skill names
+
+        Returns:
+            Dict with 'source', 'key', 'version', 'names', 'matrix' and 'metadatas'
+        """
+        version = self.indexer.store.version
+        bridge = self._bridge
+        if bridge is not None and bridge["version"] == version and bridge["source"] is candidate_skills:
+            return bridge
+
+        key = frozenset(candidate_skills)
+        if bridge is not None and bridge["version"] == version and bridge["key"] == key:
+            return bridge
+
+        with self._bridge_lock:
+            bridge = self._bridge
+            if bridge is not None and bridge["version"] == version and bridge["key"] == key:
+                return bridge
+
+            names, embeddings, metadatas = self.indexer.store.get_embeddings(sorted(key))
+            if names:
+                matrix = np.asarray(embeddings, dtype=np.float32)
+                norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+                norms[norms == 0] = 1.0
+                matrix = np.ascontiguousarray(matrix / norms, dtype=np.float32)
+            else:
+                matrix = np.zeros((0, 0), dtype=np.float32)
+
+            bridge = {
+                "source": candidate_skills,
+                "key": key,
+                "version": version,
+                "names": list(names),
+                "matrix": matrix,
+                "metadatas": metadatas,
+            }
+            self._bridge = bridge
+            print(f"✓ Bridge matrix built: {len(names)} active skills")
+            return bridge
+
+    def invalidate_bridge_matrix(self):
+        """Force the bridge matrix to be rebuilt on next use (e.g. after re-indexing)."""
+        with self._bridge_lock:
+            self._bridge = None
+
     def find_nearest_from_candidates(
         self,
         query: str,
         candidate_skills: List[str],
         top_k: int = 5,
-        min_similarity: float = 0.0
+        min_similarity: float = 0.0,
+        query_embedding: Optional[np.ndarray] = None
     ) -> List[Dict]:
         """
         Find the skills from a candidate list that are most similar to the query.
         Useful for bridging user queries to 'Active Skills' that have content.
 
+        Scores every candidate exactly with one matrix-vector product over a
+        precomputed embedding matrix, then selects the top_k with argpartition.
+
         Args:
             query: Search query
             candidate_skills: List of allowed skill names (whitelist)
             top_k: Number of results
             min_similarity: Minimum similarity threshold
+            query_embedding: Precomputed embedding of query
 
         Returns:
             List of dicts with name, score, and metadata
         """
-        # Convert candidates to set for O(1) lookup
-        candidate_set = set(candidate_skills)
-        
-        # Search with a LARGE limit to ensure we don't miss candidates
-        # even if they are "far" in the global list.
-        # 5000 should cover most variations without being too slow.
-        search_limit = 5000
-        
-        results = self.indexer.search(
-            query=query,
-            top_k=search_limit,
-            min_similarity=min_similarity
-        )
-        
-        # Filter: keep only if in candidate_set
-        filtered_results = []
-        for name, score, meta in results:
-            if name in candidate_set:
-                filtered_results.append({
-                    "name": name,
-                    "score": score,
-                    "category": meta.get("category", "unknown"),
-                    "aliases": meta.get("aliases", "").split(",")
-                })
-                if len(filtered_results) >= top_k:
-                    break
-                    
-        return filtered_results
+        if not candidate_skills or top_k <= 0:
+            return []
+
+        bridge = self._get_bridge_matrix(candidate_skills)
+        matrix = bridge["matrix"]
+        if matrix.shape[0] == 0:
+            return []
+
+        if query_embedding is None:
+            query_embedding = self.encode_query(query)
+        query_vec = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(query_vec)
+        if norm == 0:
+            return []
+
+        # Cosine similarity (same as 1 - Chroma cosine distance)
+        sims = matrix @ (query_vec / norm)
+
+        k = min(top_k, sims.shape[0])
+        top = np.argpartition(-sims, k - 1)[:k]
+        top = top[np.argsort(-sims[top], kind="stable")]
+
+        results = []
+        for i in top.tolist():
+            score = float(sims[i])
+            if score < min_similarity:
+                break
+            meta = bridge["metadatas"][i] or {}
+            results.append({
+                "name": bridge["names"][i],
+                "score": score,
+                "category": meta.get("category", "unknown"),
+                "aliases": meta.get("aliases", "").split(",")
+            })
+
+        return results
 
     def search_multiple_queries(
         self,
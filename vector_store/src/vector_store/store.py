@@ -6,9 +6,43 @@ semantic search capabilities.
 """
 
 import chromadb
-from typing import List, Tuple, Optional
+from chromadb.api.shared_system_client import SharedSystemClient
+from typing import Dict, List, Tuple, Optional
 import json
 import os
+import time
+
+
+# Ids per collection.get/delete call (keeps requests under Chroma's batch limit)
+GET_BATCH_SIZE = 5000
+
+# Index version marker in persist_dir, rewritten whenever the stored skills
+# change. Other processes (e.g. the web server) poll it to know when to
+# reopen the collection: a long-lived Chroma client keeps serving its
+# in-memory HNSW index and does not see writes made by another process.
+VERSION_FILE = "index_version"
+
+
+def skill_metadata(skill: dict, doc_hash: Optional[str] = None) -> dict:
+    """
+    Metadata stored with a skill's embedding.
+
+    Args:
+        skill: Skill dictionary
+        doc_hash: Hash of the embedded document text (see VectorIndexer.sync_index)
+
+    Returns:
+        Metadata dictionary
+    """
+    metadata = {
+        "category": skill.get("category", "unknown"),
+        "aliases": ",".join(skill.get("aliases", [])),
+        "source_count": skill.get("source_count", 0),
+        "weight": skill.get("weight", 0.0)
+    }
+    if doc_hash is not None:
+        metadata["doc_hash"] = doc_hash
+    return metadata
 
 
 class SkillVectorStore:
@@ -25,14 +59,71 @@ class SkillVectorStore:
         # Ensure directory exists
         os.makedirs(persist_dir, exist_ok=True)
 
+        self._open()
+        print(f"✓ Vector store initialized at {persist_dir}")
+
+    def _open(self):
+        """Open the client and collection, recording the index version they reflect."""
+        # Read first: a sync finishing in between then looks like a newer version
+        version = self.read_version()
+
         # Use new ChromaDB client API
-        self.client = chromadb.PersistentClient(path=persist_dir)
+        client = chromadb.PersistentClient(path=self.persist_dir)
 
-        self.collection = self.client.get_or_create_collection(
+        collection = client.get_or_create_collection(
             name="skills",
             metadata={"hnsw:space": "cosine"}
         )
-        print(f"✓ Vector store initialized at {persist_dir}")
+        self.client, self.collection, self.version = client, collection, version
+
+    def read_version(self) -> Optional[int]:
+        """Index version on disk, or None if the index was never synced."""
+        try:
+            with open(os.path.join(self.persist_dir, VERSION_FILE), "r") as f:
+                return int(f.read().strip())
+        except (OSError, ValueError):
+            return None
+
+    def mark_version(self) -> int:
+        """
+        Record that the stored skills changed.
+
+        Returns:
+            The new version (epoch nanoseconds)
+        """
+        version = time.time_ns()
+        path = os.path.join(self.persist_dir, VERSION_FILE)
+        with open(path + ".tmp", "w") as f:
+            f.write(str(version))
+        os.replace(path + ".tmp", path)
+        self.version = version
+        return version
+
+    def reload(self):
+        """
+        Reopen the collection to pick up changes written by another process.
+
+        Chroma shares one system per path within a process, so its cache is
+        cleared first. Once the new client is open the old system is stopped,
+        releasing its segments (HNSW index, SQLite handles); if opening fails
+        the old client is kept and keeps serving.
+        """
+        old_client = self.client
+        identifier = old_client._identifier
+        old_system = old_client._system
+        refcount = SharedSystemClient._identifier_to_refcount.get(identifier, 0)
+        old_client.clear_system_cache()
+        try:
+            self._open()
+        except Exception:
+            SharedSystemClient._identifier_to_system[identifier] = old_system
+            SharedSystemClient._identifier_to_refcount[identifier] = refcount
+            raise
+        # The client and its admin client hold two references; more means
+        # another store on this path in the process still uses the system
+        if refcount <= 2:
+            old_system.stop()
+        print(f"✓ Vector store reloaded (index version {self.version})")
 
     def add_skills(
         self,
@@ -52,15 +143,7 @@ class SkillVectorStore:
 
         ids = [s["name"] for s in skills]
         documents = [self._skill_to_document(s) for s in skills]
-        metadatas = [
-            {
-                "category": s.get("category", "unknown"),
-                "aliases": ",".join(s.get("aliases", [])),
-                "source_count": s.get("source_count", 0),
-                "weight": s.get("weight", 0.0)
-            }
-            for s in skills
-        ]
+        metadatas = [skill_metadata(s) for s in skills]
 
         self.collection.add(
             ids=ids,
@@ -71,6 +154,54 @@ class SkillVectorStore:
 
         print(f"✓ Added {len(skills)} skills to vector store")
 
+    def upsert_skills(
+        self,
+        skills: List[dict],
+        embeddings: List[List[float]],
+        metadatas: List[dict]
+    ):
+        """
+        Insert skills or replace the stored ones with the same name.
+
+        Args:
+            skills: List of skill dictionaries
+            embeddings: Embedding vectors corresponding to skills
+            metadatas: Metadata per skill (see skill_metadata)
+        """
+        if not skills:
+            return
+
+        self.collection.upsert(
+            ids=[s["name"] for s in skills],
+            documents=[self._skill_to_document(s) for s in skills],
+            embeddings=embeddings,
+            metadatas=metadatas
+        )
+
+    def update_metadata(self, names: List[str], metadatas: List[dict]):
+        """
+        Replace the metadata of stored skills, keeping their embeddings.
+
+        Args:
+            names: Skill names (collection ids)
+            metadatas: New metadata per skill
+        """
+        if not names:
+            return
+
+        self.collection.update(ids=list(names), metadatas=metadatas)
+
+    def delete_skills(self, names: List[str]):
+        """
+        Remove skills from the store.
+
+        Args:
+            names: Skill names (collection ids)
+        """
+        names = list(names)
+        for start in range(0, len(names), GET_BATCH_SIZE):
+            self.collection.delete(ids=names[start:start + GET_BATCH_SIZE])
+
     def _skill_to_document(self, skill: dict) -> str:
         """
         Convert skill to document text for embedding.
@@ -156,6 +287,43 @@ class SkillVectorStore:
 
         return all_results
 
+    def get_embeddings(self, names: List[str]) -> Tuple[List[str], List[List[float]], List[dict]]:
+        """
+        Fetch stored embeddings and metadata for the given skill names.
+
+        Names that are not in the store are skipped.
+
+        Args:
+            names: Skill names (collection ids)
+
+        Returns:
+            Tuple of (ids, embeddings, metadatas) in matching order
+        """
+        if not names:
+            return [], [], []
+
+        result = self.collection.get(ids=list(names), include=["embeddings", "metadatas"])
+        embeddings = result.get("embeddings")
+        metadatas = result.get("metadatas") or [{} for _ in result["ids"]]
+        return result["ids"], [] if embeddings is None else list(embeddings), metadatas
+
+    def get_metadatas(self) -> Dict[str, dict]:
+        """
+        Metadata of every stored skill, without embeddings.
+
+        Returns:
+            Dictionary of skill name -> metadata
+        """
+        metadatas = {}
+        offset = 0
+        while True:
+            result = self.collection.get(include=["metadatas"], limit=GET_BATCH_SIZE, offset=offset)
+            ids = result["ids"]
+            metadatas.update(zip(ids, result.get("metadatas") or [{} for _ in ids]))
+            if len(ids) < GET_BATCH_SIZE:
+                return metadatas
+            offset += len(ids)
+
     def get_all_skills(self) -> List[str]:
         """Get all skill names in the store."""
         try:
@@ -192,6 +360,7 @@ class SkillVectorStore:
             name="skills",
             metadata={"hnsw:space": "cosine"}
         )
+        self.mark_version()
 
     def save_stats(self, filepath: str):
         """Save statistics to a JSON file."""
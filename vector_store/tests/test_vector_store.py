@@ -213,6 +213,33 @@ class TestVectorIndexer:
 
         assert stats1['total_skills'] == stats2['total_skills']
 
+    def test_incremental_sync(self, sample_skills, temp_dir):
+        """Only new or changed skills are re-embedded; removed skills are deleted."""
+        skills_file = os.path.join(temp_dir, "skills.json")
+        with open(skills_file, 'w') as f:
+            json.dump(sample_skills, f)
+
+        indexer = VectorIndexer(
+            use_openai=False,
+            persist_dir=os.path.join(temp_dir, "chroma")
+        )
+        indexer.build_index(skills_file)
+
+        sample_skills[0]["aliases"].append("Statistical Learning")
+        sample_skills[1]["weight"] = 0.5
+        removed = sample_skills.pop()
+        sample_skills.append({"name": "Data Visualization", "aliases": [], "category": "technical"})
+        with open(skills_file, 'w') as f:
+            json.dump(sample_skills, f)
+
+        counts = indexer.sync_index(skills_file)
+
+        assert (counts["added"], counts["changed"], counts["metadata"], counts["removed"]) == (1, 1, 1, 1)
+        assert counts["unchanged"] == 2
+        assert sorted(indexer.store.get_all_skills()) == sorted(s["name"] for s in sample_skills)
+        assert removed["name"] not in indexer.store.get_all_skills()
+        assert indexer.get_skill_info("Deep Learning")["weight"] == 0.5
+
     def test_empty_index(self, temp_dir):
         """Test behavior with empty skills list."""
         skills_file = os.path.join(temp_dir, "skills.json")
@@ -238,3 +265,230 @@ class TestVectorIndexer:
 
         with pytest.raises(FileNotFoundError):
             indexer.build_index("/nonexistent/skills.json")
+
+
+class TestBridgeSearch:
+    """Test the active-skill bridge matrix in SkillSearchService."""
+
+    @pytest.fixture
+    def service(self):
+        """SkillSearchService over a fake store and embedding model."""
+        import threading
+        from unittest.mock import MagicMock
+        import numpy as np
+        from vector_store.src.vector_store.search_service import SkillSearchService
+
+        vectors = {
+            "Machine Learning": [1.0, 0.0, 0.0],
+            "Deep Learning": [0.8, 0.6, 0.0],
+            "Public Policy": [0.0, 0.0, 2.0],
+            "Communication": [0.0, 1.0, 0.0],
+        }
+
+        def get_embeddings(names):
+            ids = [n for n in names if n in vectors]
+            metas = [{"category": "technical", "aliases": "a,b"} for _ in ids]
+            return ids, [vectors[n] for n in ids], metas
+
+        service = SkillSearchService.__new__(SkillSearchService)
+        service.indexer = MagicMock()
+        service.indexer.store.get_embeddings.side_effect = get_embeddings
+        service.indexer.encode_query.return_value = np.array([2.0, 0.0, 0.0])
+        service._bridge = None
+        service._bridge_lock = threading.Lock()
+        return service
+
+    def test_nearest_from_candidates(self, service):
+        """Only candidates are scored, ranked by cosine similarity."""
+        candidates = ["Deep Learning", "Machine Learning", "Communication", "Unknown"]
+        results = service.find_nearest_from_candidates("ml", candidates, top_k=2)
+
+        assert [r["name"] for r in results] == ["Machine Learning", "Deep Learning"]
+        assert results[0]["score"] == pytest.approx(1.0)
+        assert results[1]["score"] == pytest.approx(0.8)
+        assert set(results[0]) == {"name", "score", "category", "aliases"}
+
+    def test_min_similarity(self, service):
+        """Candidates below the threshold are dropped."""
+        candidates = ["Deep Learning", "Machine Learning", "Communication"]
+        results = service.find_nearest_from_candidates("ml", candidates, top_k=5, min_similarity=0.5)
+
+        assert [r["name"] for r in results] == ["Machine Learning", "Deep Learning"]
+
+    def test_matrix_rebuilt_when_candidates_change(self, service):
+        """The matrix is reused for the same set and rebuilt for a new one."""
+        service.find_nearest_from_candidates("ml", ["Machine Learning"], top_k=1)
+        service.find_nearest_from_candidates("ml", ["Machine Learning"], top_k=1)
+        assert service.indexer.store.get_embeddings.call_count == 1
+
+        results = service.find_nearest_from_candidates("ml", ["Public Policy"], top_k=1)
+        assert service.indexer.store.get_embeddings.call_count == 2
+        assert results[0]["name"] == "Public Policy"
+        assert results[0]["score"] == pytest.approx(0.0)
+
+    def test_query_encoded_once_per_scope(self, service):
+        """Within a query_embedding_scope each query is embedded once."""
+        from vector_store.src.vector_store.search_service import query_embedding_scope
+
+        with query_embedding_scope():
+            service.encode_query("ml")
+            service.find_nearest_from_candidates("ml", ["Machine Learning"], top_k=1)
+        assert service.indexer.encode_query.call_count == 1
+
+        service.encode_query("ml")
+        assert service.indexer.encode_query.call_count == 2
+
+
+class TestIndexVersion:
+    """Test picking up an index synced by another process."""
+
+    def test_search_service_reloads_on_new_version(self, tmp_path):
+        """A new index version reopens the store and drops the bridge matrix."""
+        import threading
+        from unittest.mock import MagicMock
+        from vector_store.src.vector_store.search_service import SkillSearchService
+        from vector_store.src.vector_store.store import SkillVectorStore, skill_metadata
+
+        service = SkillSearchService.__new__(SkillSearchService)
+        service.indexer = MagicMock()
+        service.indexer.store = SkillVectorStore(str(tmp_path))
+        service._bridge = {"version": None}
+        service._bridge_lock = threading.Lock()
+        service.refresh_interval = 0.0
+        service._last_check = 0.0
+        service._refresh_lock = threading.Lock()
+
+        assert service.maybe_refresh() is False
+
+        # Another writer (e.g. build_vector_index.py) syncs the index
+        writer = SkillVectorStore(str(tmp_path))
+        skill = {"name": "Python Programming", "category": "technical"}
+        writer.upsert_skills([skill], [[1.0, 0.0, 0.0]], [skill_metadata(skill, "hash")])
+        version = writer.mark_version()
+
+        assert service.maybe_refresh() is True
+        assert service.indexer.store.version == version
+        assert service._bridge is None
+        assert service.indexer.store.get_all_skills() == ["Python Programming"]
+        assert service.maybe_refresh() is False
+
+    def test_reload_stops_old_system(self, tmp_path):
+        """Reloading releases the old Chroma system instead of leaking it."""
+        from chromadb.api.shared_system_client import SharedSystemClient
+        from vector_store.src.vector_store.store import SkillVectorStore
+
+        SharedSystemClient.clear_system_cache()
+        store = SkillVectorStore(str(tmp_path))
+        old_system = store.client._system
+
+        store.reload()
+
+        assert old_system._running is False
+        assert store.client._system is not old_system
+        assert store.get_all_skills() == []
+
+    def test_reload_keeps_shared_system(self, tmp_path):
+        """A system still used by another store on the same path is left running."""
+        from chromadb.api.shared_system_client import SharedSystemClient
+        from vector_store.src.vector_store.store import SkillVectorStore
+
+        SharedSystemClient.clear_system_cache()
+        store = SkillVectorStore(str(tmp_path))
+        other = SkillVectorStore(str(tmp_path))
+        old_system = store.client._system
+
+        store.reload()
+
+        assert old_system._running is True
+        assert other.get_all_skills() == []
+
+
+class TestCachedEmbedding:
+    """Test the CachedEmbedding wrapper."""
+
+    class CountingModel:
+        """Deterministic fake embedding model that records encode calls."""
+        model_name = "fake-model"
+
+        def __init__(self):
+            self.calls = []
+
+        def encode(self, texts):
+            import numpy as np
+            self.calls.append(list(texts))
+            return np.array([[len(t), t.count(" "), 1.0] for t in texts])
+
+    def test_hits_and_misses(self):
+        """Repeated texts are served from the cache."""
+        from vector_store.src.vector_store.embeddings import CachedEmbedding
+
+        model = self.CountingModel()
+        cached = CachedEmbedding(model, max_size=10)
+
+        first = cached.encode(["machine learning", "python"])
+        second = cached.encode(["machine   learning ", "python", "sql"])
+
+        assert model.calls == [["machine learning", "python"], ["sql"]]
+        assert (second[0] == first[0]).all()
+        assert cached.cache_info()["hits"] == 2
+        assert cached.cache_info()["misses"] == 3
+
+    def test_lru_eviction(self):
+        """The least recently used entry is evicted first."""
+        from vector_store.src.vector_store.embeddings import CachedEmbedding
+
+        model = self.CountingModel()
+        cached = CachedEmbedding(model, max_size=2)
+
+        cached.encode(["a"])
+        cached.encode(["b"])
+        cached.encode(["a"])
+        cached.encode(["c"])
+        cached.encode(["a"])
+        cached.encode(["b"])
+
+        assert model.calls == [["a"], ["b"], ["c"], ["b"]]
+
+    def test_persistent_cache(self, tmp_path):
+        """Embeddings survive a restart when persisted to disk."""
+        from vector_store.src.vector_store.embeddings import CachedEmbedding
+
+        path = str(tmp_path / "embeddings.db")
+        CachedEmbedding(self.CountingModel(), persist_path=path).encode(["data science"])
+
+        model = self.CountingModel()
+        vectors = CachedEmbedding(model, persist_path=path).encode(["data science"])
+
+        assert model.calls == []
+        assert vectors.shape == (1, 3)
+        assert vectors[0][0] == len("data science")
+
+    def test_local_models_are_shared(self, monkeypatch):
+        """LocalEmbedding instances reuse one loaded model per name."""
+        from vector_store.src.vector_store import embeddings
+
+        loads = []
+        monkeypatch.setattr(embeddings, "_shared_models", {})
+        monkeypatch.setattr(embeddings, "SentenceTransformer", lambda name: loads.append(name) or object())
+
+        embeddings.preload_local_model("shared-model")
+        first = embeddings.LocalEmbedding("shared-model")
+        second = embeddings.LocalEmbedding("shared-model")
+
+        assert loads == ["shared-model"]
+        assert first.model is second.model
+
+    def test_cache_only_on_query_path(self, monkeypatch, tmp_path):
+        """Bulk indexing skips the embedding cache; the search service keeps it."""
+        from vector_store.src.vector_store import embeddings
+        from vector_store.src.vector_store.search_service import SkillSearchService
+
+        monkeypatch.setattr(embeddings, "_shared_models", {})
+        monkeypatch.setattr(embeddings, "SentenceTransformer", lambda name: object())
+        monkeypatch.setenv("EMBEDDING_CACHE_SIZE", "16")
+
+        indexer = VectorIndexer(persist_dir=str(tmp_path / "index"))
+        service = SkillSearchService(persist_dir=str(tmp_path / "service"))
+
+        assert isinstance(indexer.embedding_model, embeddings.LocalEmbedding)
+        assert isinstance(service.indexer.embedding_model, embeddings.CachedEmbedding)
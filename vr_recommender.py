@@ -29,6 +29,8 @@ from typing import Dict, List, Optional
 from datetime import datetime
 
 from src.rag.service import RAGService
+from src.rag.cache import RecommendationCache
+from vector_store.search_service import query_embedding_scope
 
 
 # ----------------------------- Data Model ----------------------------- #
@@ -49,6 +51,24 @@ class HeinzVRLLMRecommender:
         """Initialize the RAG-based recommender."""
         self.rag_service = RAGService()
 
+        # Response cache in front of generate_recommendation (None if disabled)
+        try:
+            # Shares the per-request query embedding with retrieval
+            self.cache = RecommendationCache.from_config(
+                embed_fn=self.rag_service.retriever.skill_search.encode_query
+            )
+        except Exception as e:
+            print(f"⚠ Recommendation cache disabled: {e}")
+            self.cache = None
+
+    @staticmethod
+    def _full_query(query: StudentQuery) -> str:
+        """Build the full query text sent to the RAG service."""
+        full_query = query.query
+        if query.interests:
+            full_query += f". Interests: {', '.join(query.interests)}"
+        return full_query
+
     def recommend_vr_apps(self, query: StudentQuery) -> List[Dict]:
         """
         Generate VR app recommendations using RAG system.
@@ -60,9 +80,7 @@ class HeinzVRLLMRecommender:
             List[Dict]: Recommended VR applications with scores and reasoning
         """
         # Build full query text from StudentQuery
-        full_query = query.query
-        if query.interests:
-            full_query += f". Interests: {', '.join(query.interests)}"
+        full_query = self._full_query(query)
 
         # Call RAG service
         result = self.rag_service.recommend(full_query, top_k=8)
@@ -104,7 +122,20 @@ class HeinzVRLLMRecommender:
         print(f"\n🔍 Processing (RAG): {query.query}")
 
         try:
-            vr_apps = self.recommend_vr_apps(query)
+            # Reload data synced by other processes before serving from the cache
+            self.rag_service.retriever.refresh()
+
+            # Each query string is embedded once for the cache and retrieval
+            with query_embedding_scope():
+                lookup = self.cache.get(self._full_query(query)) if self.cache else None
+                if lookup is not None and lookup.payload is not None:
+                    print(f"⚡ Cache hit ({lookup.tier})")
+                    vr_apps = lookup.payload["vr_apps"]
+                else:
+                    vr_apps = self.recommend_vr_apps(query)
+                    if lookup is not None:
+                        self.cache.put(lookup, {"vr_apps": vr_apps})
+
             return {
                 "student_query": query.query,
                 "vr_apps": vr_apps,
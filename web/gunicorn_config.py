@@ -1,5 +1,7 @@
+import gc
 import multiprocessing
 import os
+import sys
 
 # Gunicorn Configuration
 
@@ -32,4 +34,37 @@ wsgi_app = "flask_api:app"
 # Environment
 raw_env = [
     "FLASK_ENV=production"
-]
\ No newline at end of file
+]
+
+# Shared embedding model
+# With GUNICORN_PRELOAD_MODEL on (default), the master loads the
+# sentence-transformers model once before forking, and every worker's
+# LocalEmbedding reuses it copy-on-write instead of loading its own copy.
+# Only the model is preloaded: ChromaDB, Neo4j and MongoDB clients hold
+# sockets / SQLite handles that are not fork-safe, so each worker still
+# opens its own when it imports flask_api.
+#
+# To compare per-worker private memory (USS) and total PSS with and without
+# preload, run scripts/measure_worker_memory.py --pid <master pid> against a
+# running server (or --simulate [--no-preload] without gunicorn).
+preload_model = os.getenv("GUNICORN_PRELOAD_MODEL", "true").lower() not in ("0", "false", "no", "off")
+
+
+def on_starting(server):
+    """Load the embedding model in the master process before workers fork."""
+    if not preload_model:
+        return
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    for path in (root, os.path.join(root, "vector_store", "src")):
+        if path not in sys.path:
+            sys.path.append(path)
+
+    try:
+        from vector_store.embeddings import preload_local_model
+        preload_local_model()
+        # Keep the cyclic GC from touching (and un-sharing) preloaded objects
+        gc.freeze()
+        server.log.info("Embedding model preloaded in master (shared copy-on-write)")
+    except Exception as e:
+        server.log.warning(f"Embedding model preload failed, workers will load their own: {e}")